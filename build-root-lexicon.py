@@ -10,16 +10,38 @@ Approach:
 2. Apply morphological analysis (heuristic-based)
 3. Generate hebrew-roots.json.gz with root mappings
 
+The lexicon is built in batch: words are normalized first and each
+distinct normalized form (inflected spellings repeat across the books) is
+analyzed once, optionally in chunks across processes (--jobs). The
+output is the same as analyzing every word with extract_root.
+
+Usage:
+    python3 build-root-lexicon.py
+    python3 build-root-lexicon.py --jobs 0    # one process per core
+
 Note: For better accuracy, integrate YAP or AlephBERT in future versions.
 """
 
+import argparse
 import json
 import gzip
+import multiprocessing as mp
 import sys
 from pathlib import Path
 from collections import defaultdict
 import re
 
+sys.path.insert(0, str(Path(__file__).parent / 'tools'))
+from hebrew_normalize import normalize_word
+
+
+def _group_by_length(affixes):
+    """[(length, affixes of that length)], longest first"""
+    groups = defaultdict(set)
+    for affix in affixes:
+        groups[len(affix)].add(affix)
+    return [(n, frozenset(groups[n])) for n in sorted(groups, reverse=True)]
+
 
 class HebrewRootExtractor:
     """Extract Hebrew roots using morphological heuristics"""
@@ -43,7 +65,16 @@ class HebrewRootExtractor:
         'hitpael': r'^(הת|ת)[א-ת]{2,3}'
     }
 
-    FINAL_LETTERS = {'ך': 'כ', 'ם': 'מ', 'ן': 'נ', 'ף': 'פ', 'ץ': 'צ'}
+    # Compiled once, tried in BINYAN_PATTERNS order
+    BINYAN_REGEXES = [(name, re.compile(pattern)) for name, pattern in BINYAN_PATTERNS.items()]
+
+    # Set lookups equivalent to the PREFIXES / SUFFIXES loops (all prefixes are
+    # one letter; suffixes are tried longest first)
+    PREFIX_SET = frozenset(PREFIXES)
+    SUFFIXES_BY_LENGTH = _group_by_length(SUFFIXES)
+
+    # Normalized forms per work unit in build_lexicon_batch with jobs > 1
+    CHUNK_SIZE = 5000
 
     def __init__(self):
         self.lexicon = {}
@@ -51,37 +82,28 @@ class HebrewRootExtractor:
 
     def normalize(self, word):
         """Remove niqqud and convert final letters"""
-        # Remove niqqud (Unicode combining marks U+0591 - U+05C7)
-        normalized = re.sub(r'[\u0591-\u05C7]', '', word)
-
-        # Convert final letters
-        for final, regular in self.FINAL_LETTERS.items():
-            normalized = normalized.replace(final, regular)
-
-        return normalized
+        return normalize_word(word)
 
     def strip_affixes(self, word):
         """Remove common prefixes and suffixes"""
-        original = word
-
         # Strip prefix (only one)
-        for prefix in self.PREFIXES:
-            if word.startswith(prefix) and len(word) > 2:
-                word = word[1:]
-                break
+        if len(word) > 2 and word[0] in self.PREFIX_SET:
+            word = word[1:]
 
         # Strip suffix (only one, longest match first)
-        for suffix in self.SUFFIXES:
-            if word.endswith(suffix) and len(word) > len(suffix) + 1:
-                word = word[:-len(suffix)]
+        for n, suffixes in self.SUFFIXES_BY_LENGTH:
+            if len(word) > n + 1 and word[-n:] in suffixes:
+                word = word[:-n]
                 break
 
         return word
 
     def extract_root(self, word):
         """Extract root using heuristics"""
-        # Normalize
-        normalized = self.normalize(word)
+        return self.analyze(self.normalize(word))
+
+    def analyze(self, normalized):
+        """Extract root from an already normalized word"""
         original_normalized = normalized
 
         # Try stripping affixes
@@ -145,8 +167,8 @@ class HebrewRootExtractor:
 
         # Detect binyan (simplified)
         binyan = None
-        for name, pattern in self.BINYAN_PATTERNS.items():
-            if re.match(pattern, original_normalized):
+        for name, regex in self.BINYAN_REGEXES:
+            if regex.match(original_normalized):
                 binyan = name
                 break
 
@@ -178,6 +200,46 @@ class HebrewRootExtractor:
 
         print(f"Lexicon complete: {len(self.lexicon)} entries")
 
+    def build_lexicon_batch(self, words, jobs=1):
+        """Build root lexicon from word list, analyzing each normalized form once.
+
+        Same lexicon as build_lexicon; words with the same normalized form
+        share one result dict. With jobs > 1 the forms are analyzed in
+        chunks across processes.
+        """
+        print(f"Processing {len(words)} unique words...")
+
+        word_forms = []
+        for word in words:
+            if not word or not word.strip():
+                continue
+            word_forms.append((word, self.normalize(word)))
+
+        forms = list(dict.fromkeys(form for _, form in word_forms))
+        print(f"  {len(forms)} distinct normalized forms")
+
+        if jobs <= 1:
+            results = {form: self.analyze(form) for form in forms}
+        else:
+            results = self._analyze_parallel(forms, jobs)
+
+        for word, form in word_forms:
+            self.lexicon[word] = results[form]
+        self.word_count += len(word_forms)
+
+        print(f"Lexicon complete: {len(self.lexicon)} entries")
+
+    def _analyze_parallel(self, forms, jobs):
+        """{ form: result } for normalized forms, analyzed in chunks across processes"""
+        chunks = [forms[i:i + self.CHUNK_SIZE] for i in range(0, len(forms), self.CHUNK_SIZE)]
+        results = {}
+        ctx = mp.get_context('fork') if 'fork' in mp.get_all_start_methods() else mp.get_context()
+        with ctx.Pool(min(jobs, len(chunks))) as pool:
+            for done, chunk_results in enumerate(pool.imap(_analyze_chunk, chunks), 1):
+                results.update(chunk_results)
+                print(f"  Analyzed {done}/{len(chunks)} chunks...")
+        return results
+
     def get_stats(self):
         """Get lexicon statistics"""
         roots = set(entry['root'] for entry in self.lexicon.values())
@@ -192,6 +254,12 @@ class HebrewRootExtractor:
         }
 
 
+def _analyze_chunk(forms):
+    """Pool worker: { normalized form: extract result } for a chunk of forms"""
+    extractor = HebrewRootExtractor()
+    return {form: extractor.analyze(form) for form in forms}
+
+
 def load_words_from_database(data_dir='data'):
     """Load all unique words from the database files"""
     data_path = Path(data_dir)
@@ -243,6 +311,13 @@ def save_lexicon(lexicon, output_file='data/embeddings/hebrew-roots.json.gz'):
 
 def main():
     """Main execution"""
+    parser = argparse.ArgumentParser(description='Build the Hebrew root lexicon')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Processes analyzing word forms (0 = one per core)')
+    parser.add_argument('--per-word', action='store_true',
+                        help='Analyze every word separately, without the batch mode')
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Hebrew Root Lexicon Builder")
     print("=" * 60)
@@ -254,7 +329,10 @@ def main():
 
     # Extract roots
     extractor = HebrewRootExtractor()
-    extractor.build_lexicon(words)
+    if args.per_word:
+        extractor.build_lexicon(words)
+    else:
+        extractor.build_lexicon_batch(words, args.jobs if args.jobs > 0 else mp.cpu_count())
 
     # Print statistics
     stats = extractor.get_stats()
@@ -7,6 +7,11 @@
  * @module engines/els-index
  */
 
+// Occurrence layouts written by tools/build-els-index.py (metadata.occurrence_fields)
+const OCCURRENCE_FIELDS = ['pos', 'skip'];
+const VERSE_OCCURRENCE_FIELDS = ['pos', 'skip', 'first_verse', 'last_verse'];
+const OCCURRENCE_LAYOUTS = [OCCURRENCE_FIELDS, VERSE_OCCURRENCE_FIELDS];
+
 /**
  * ELS Index Service
  * Manages loading and querying the precomputed ELS index
@@ -15,6 +20,7 @@ export class ElsIndexService {
   constructor() {
     this.index = null;
     this.metadata = null;
+    this.hasVerseSpans = false;
     this.loaded = false;
     this.loading = null;
   }
@@ -54,7 +60,14 @@ export class ElsIndexService {
       const text = await new Response(decompressedStream).text();
       const data = JSON.parse(text);
 
+      // Occurrences are [pos, skip] or, with verse spans, [pos, skip, firstVerse, lastVerse]
+      const fields = data.metadata.occurrence_fields || OCCURRENCE_FIELDS;
+      if (!OCCURRENCE_LAYOUTS.some(layout => layout.join() === fields.join())) {
+        throw new Error(`Unsupported occurrence layout: [${fields.join(', ')}]`);
+      }
+
       this.metadata = data.metadata;
+      this.hasVerseSpans = fields.length === VERSE_OCCURRENCE_FIELDS.length;
       this.index = data.index;
       this.loaded = true;
 
@@ -91,7 +104,8 @@ export class ElsIndexService {
   /**
    * Find all occurrences of a word
    * @param {string} word - Hebrew word to find
-   * @returns {Array<{pos: number, skip: number}>} Array of occurrences
+   * @returns {Array<{pos: number, skip: number, firstVerse?: number, lastVerse?: number}>}
+   *   Array of occurrences; firstVerse/lastVerse (verse table rows) when the index has verse spans
    */
   findWord(word) {
     if (!this.loaded) {
@@ -104,7 +118,10 @@ export class ElsIndexService {
       return [];
     }
 
-    // Convert from [[pos, skip], ...] to [{pos, skip}, ...]
+    // Convert from [[pos, skip(, first, last)], ...] to [{pos, skip(, firstVerse, lastVerse)}, ...]
+    if (this.hasVerseSpans) {
+      return occurrences.map(([pos, skip, firstVerse, lastVerse]) => ({ pos, skip, firstVerse, lastVerse }));
+    }
     return occurrences.map(([pos, skip]) => ({ pos, skip }));
   }
 
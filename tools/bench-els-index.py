@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Benchmark ELS Index Builders
+
+Runs each index builder over a fixed slice of torahNoSpaces.txt, a fixed
+dictionary sample and a fixed skip range, and reports throughput
+(letters x skips per second), peak RSS and output size. Each case runs in
+its own subprocess so peak RSS is measured per builder. Pool workers are
+not included in that figure; cases that start them also report the
+largest worker's peak RSS.
+
+Every case also records a SHA-256 digest of its canonical output (words
+sorted, occurrences sorted). Cases of the same family must agree with
+each other, and with a previous results file passed to --compare, so a
+faster engine that silently changes the index is caught.
+
+Usage:
+    python3 tools/bench-els-index.py
+    python3 tools/bench-els-index.py --slice 50000 --skip-range 20 --dict-sample 30000
+    python3 tools/bench-els-index.py --cases els-trie,els-numpy --compare bench/old.json
+
+Options:
+    --slice N         Torah letters to scan, from the start (default: 20000)
+    --skip-range N    ELS index skip range -N..+N (default: 10)
+    --max-skip N      Date index max skip (default: 50)
+    --dict-sample N   Dictionary words, every k-th of the sorted list (default: 20000)
+    --term-sample N   Date terms, every k-th of the sorted list (default: 60)
+    --workers N       Workers for the parallel case (default: 2)
+    --cases A,B       Cases to run (default: all)
+    --output PATH     Results JSON (default: bench/els-bench-<timestamp>.json)
+    --compare PATH    Earlier results JSON to compare speed and digests against
+"""
+
+import argparse
+import contextlib
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJ = Path(__file__).resolve().parent.parent
+TOOLS = PROJ / 'tools'
+TORAH_PATH = PROJ / 'data' / 'torahNoSpaces.txt'
+DICT_PATH = PROJ / 'data' / 'dictionaries' / 'unified' / 'hebrew-unified.json.gz'
+
+
+def load_tool(filename):
+    """Import a hyphenated tools/ script as a module"""
+    name = filename[:-len('.py')].replace('-', '_')
+    spec = importlib.util.spec_from_file_location(name, TOOLS / filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module  # lets pool workers unpickle module functions
+    sys.path.insert(0, str(TOOLS))
+    spec.loader.exec_module(module)
+    return module
+
+
+def digest(obj):
+    """SHA-256 of an object's compact JSON form"""
+    return hashlib.sha256(json.dumps(obj, ensure_ascii=False, separators=(',', ':'),
+                                     sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def canonical_els_index(index):
+    """Order-independent form of a word -> [(pos, skip), ...] index"""
+    return {word: sorted([list(occ) for occ in occs]) for word, occs in index.items()}
+
+
+def current_rss_mb():
+    """Resident set size of this process right now (Linux), else 0"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError):
+        return 0.0
+
+
+def _ru_maxrss_mb(who):
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def peak_rss_mb():
+    """High-water resident set size of this process"""
+    # VmHWM is reset by exec; ru_maxrss on Linux carries over the parent's peak
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return _ru_maxrss_mb(resource.RUSAGE_SELF)
+
+
+def peak_children_rss_mb():
+    """High-water resident set size of the largest finished child (pool worker) of this process"""
+    return _ru_maxrss_mb(resource.RUSAGE_CHILDREN)
+
+
+# --- Cases ---
+# Each case is a generator: it loads its inputs, yields once (so loading is
+# not timed), then yields the builder's output. Cases in the same family
+# must produce identical canonical output.
+
+def _els_inputs(config):
+    els = load_tool('build-els-index.py')
+    torah = els.load_torah_text(TORAH_PATH)[:config['slice']]
+    with open(config['dict_sample_path'], encoding='utf-8') as f:
+        words = set(f.read().split())
+    skip_range = (-config['skip_range'], config['skip_range'])
+    return els, torah, words, skip_range
+
+
+def case_els_trie(config):
+    els, torah, words, skip_range = _els_inputs(config)
+    trie = els.build_trie(words)
+    yield
+    yield els.build_index_optimized(torah, trie, skip_range, 10, 2)
+
+
+def case_els_sequential(config):
+    els, torah, words, skip_range = _els_inputs(config)
+    trie = els.build_trie(words)
+    yield
+    yield els.build_index_sequential(torah, trie, skip_range, 10)
+
+
+def case_els_flat(config):
+    els, torah, words, skip_range = _els_inputs(config)
+    trie = els.build_flat_trie(words)
+    yield
+    try:
+        yield els.build_index_optimized(torah, trie, skip_range, 10, 2)
+    finally:
+        trie.close(unlink=True)
+
+
+def case_els_numpy(config):
+    els, torah, words, skip_range = _els_inputs(config)
+    yield
+    yield els.build_index_numpy(torah, words, skip_range, 10, 2)
+
+
+def case_els_parallel(config):
+    els, torah, words, skip_range = _els_inputs(config)
+    trie = els.build_trie(words)
+    yield
+    yield els.build_index_parallel(torah, words, trie, skip_range, config['workers'], 'trie', 10, 2)
+
+
+def case_date_search_term(config):
+    dates = load_tool('build-date-els-index.py')
+    text_norm = dates.normalize_sofiot(TORAH_PATH.read_text(encoding='utf-8').strip())[:config['slice']]
+    terms = sorted(dates.generate_all_terms())[::config['term_step']]
+    yield
+    yield {term: dates.search_term(text_norm, term, config['max_skip'], 10) for term in terms}
+
+
+def case_date_automaton(config):
+    dates = load_tool('build-date-els-index.py')
+    text_norm = dates.normalize_sofiot(TORAH_PATH.read_text(encoding='utf-8').strip())[:config['slice']]
+    terms = sorted(dates.generate_all_terms())[::config['term_step']]
+    yield
+    yield dates.search_all_terms(text_norm, terms, config['max_skip'], 10)
+
+
+CASES = {
+    'els-trie':        ('els', case_els_trie),
+    'els-sequential':  ('els', case_els_sequential),
+    'els-flat':        ('els', case_els_flat),
+    'els-numpy':       ('els', case_els_numpy),
+    'els-parallel':    ('els', case_els_parallel),
+    'date-search-term': ('date', case_date_search_term),
+    'date-automaton':  ('date', case_date_automaton),
+}
+
+
+def run_case(name, config):
+    """Run one case in this process and return its metrics"""
+    family, func = CASES[name]
+    steps = func(config)
+
+    # Inputs are loaded before the first yield and are not timed
+    with contextlib.redirect_stdout(io.StringIO()):
+        next(steps)
+    rss_before = current_rss_mb()
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        output = next(steps)
+    elapsed = time.perf_counter() - start
+    steps.close()
+
+    if family == 'els':
+        canonical = canonical_els_index(output)
+        work = config['slice'] * 2 * config['skip_range']
+        occurrences = sum(len(v) for v in output.values())
+    else:
+        canonical = output
+        work = config['slice'] * config['max_skip'] * 2
+        occurrences = sum(r['n'] for r in output.values())
+
+    serialized = json.dumps(canonical, ensure_ascii=False, separators=(',', ':'),
+                            sort_keys=True).encode('utf-8')
+
+    return {
+        'case': name,
+        'family': family,
+        'seconds': round(elapsed, 3),
+        'letters_x_skips_per_sec': round(work / elapsed) if elapsed > 0 else None,
+        'rss_before_mb': round(rss_before, 1),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'peak_worker_rss_mb': round(peak_children_rss_mb(), 1),
+        'output_keys': len(output),
+        'output_occurrences': occurrences,
+        'output_json_bytes': len(serialized),
+        'output_sha256': hashlib.sha256(serialized).hexdigest(),
+    }
+
+
+def write_dict_sample(size, path):
+    """Write every k-th word of the sorted unified dictionary, one per line"""
+    els = load_tool('build-els-index.py')
+    with contextlib.redirect_stdout(io.StringIO()):
+        words = sorted(els.load_dictionary([DICT_PATH]))
+    step = max(1, len(words) // size) if size else 1
+    sample = words[::step][:size] if size else words
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(sample))
+    return len(sample), digest(sample)
+
+
+def compare_results(results, previous):
+    """Print speed ratios and digest mismatches against an earlier run"""
+    if previous['config'] != results['config']:
+        print("\nWARNING: --compare run used a different config; digests are not comparable")
+    before = {r['case']: r for r in previous['results']}
+    print(f"\nCompared with {previous['created']}:")
+    ok = True
+    for r in results['results']:
+        old = before.get(r['case'])
+        if not old:
+            continue
+        ratio = old['seconds'] / r['seconds'] if r['seconds'] else float('inf')
+        same = old['output_sha256'] == r['output_sha256']
+        ok = ok and (same or previous['config'] != results['config'])
+        print(f"  {r['case']:<18} {old['seconds']:>8.2f}s -> {r['seconds']:>8.2f}s  "
+              f"({ratio:.2f}x)  output {'same' if same else 'CHANGED'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ELS index builders')
+    parser.add_argument('--slice', type=int, default=20000,
+                        help='Torah letters to scan (default: 20000)')
+    parser.add_argument('--skip-range', type=int, default=10,
+                        help='ELS index skip range -N..+N (default: 10)')
+    parser.add_argument('--max-skip', type=int, default=50,
+                        help='Date index max skip (default: 50)')
+    parser.add_argument('--dict-sample', type=int, default=20000,
+                        help='Dictionary sample size (default: 20000)')
+    parser.add_argument('--term-sample', type=int, default=60,
+                        help='Date term sample size (default: 60)')
+    parser.add_argument('--workers', type=int, default=2,
+                        help='Workers for the parallel case (default: 2)')
+    parser.add_argument('--cases', type=str, default=','.join(CASES),
+                        help='Comma-separated cases to run (default: all)')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Results JSON path (default: bench/els-bench-<timestamp>.json)')
+    parser.add_argument('--compare', type=str, default=None,
+                        help='Earlier results JSON to compare against')
+    parser.add_argument('--run-case', type=str, default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--config', type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Child mode: run a single case and print its metrics as JSON
+    if args.run_case:
+        print(json.dumps(run_case(args.run_case, json.loads(args.config))))
+        return
+
+    cases = [c.strip() for c in args.cases.split(',') if c.strip()]
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        print(f"Unknown cases: {', '.join(unknown)} (available: {', '.join(CASES)})")
+        sys.exit(1)
+
+    print("=" * 70)
+    print("ELS Index Builder Benchmark")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory(prefix='els-bench-') as tmp:
+        sample_path = Path(tmp) / 'dict-sample.txt'
+        sample_size, sample_digest = write_dict_sample(args.dict_sample, sample_path)
+
+        dates_terms = 0
+        if any(CASES[c][0] == 'date' for c in cases):
+            dates = load_tool('build-date-els-index.py')
+            dates_terms = len(dates.generate_all_terms())
+        term_step = max(1, dates_terms // args.term_sample) if dates_terms and args.term_sample else 1
+
+        config = {
+            'slice': args.slice,
+            'skip_range': args.skip_range,
+            'max_skip': args.max_skip,
+            'dict_sample': sample_size,
+            'dict_sample_sha256': sample_digest,
+            'term_step': term_step,
+            'workers': args.workers,
+        }
+        child_config = dict(config, dict_sample_path=str(sample_path))
+
+        print(f"  Torah slice: {args.slice:,} letters, ELS skips ±{args.skip_range}, "
+              f"date max skip {args.max_skip}")
+        print(f"  Dictionary sample: {sample_size:,} words, date terms: every {term_step}th\n")
+
+        results = []
+        for name in cases:
+            proc = subprocess.run([sys.executable, __file__, '--run-case', name,
+                                   '--config', json.dumps(child_config)],
+                                  capture_output=True, text=True)
+            if proc.returncode != 0:
+                print(f"  {name:<18} FAILED\n{proc.stderr}")
+                continue
+            r = json.loads(proc.stdout.strip().splitlines()[-1])
+            results.append(r)
+            workers_rss = f"  (+ workers ≤ {r['peak_worker_rss_mb']:.1f} MB each)" if r['peak_worker_rss_mb'] else ""
+            print(f"  {name:<18} {r['seconds']:>8.2f}s  "
+                  f"{r['letters_x_skips_per_sec']:>12,} letters×skips/s  "
+                  f"peak RSS {r['peak_rss_mb']:>7.1f} MB  "
+                  f"{r['output_occurrences']:>10,} occs  {r['output_sha256'][:12]}{workers_rss}")
+
+    # Output-equivalence check within each family
+    equivalent = True
+    for family in sorted({r['family'] for r in results}):
+        digests = {r['output_sha256'] for r in results if r['family'] == family}
+        if len(digests) > 1:
+            equivalent = False
+            print(f"\nERROR: {family} builders disagree:")
+            for r in results:
+                if r['family'] == family:
+                    print(f"  {r['case']:<18} {r['output_sha256']}")
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'cpu_count': os.cpu_count(),
+        'config': config,
+        'results': results,
+        'equivalent': equivalent,
+    }
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            equivalent = compare_results(report, json.load(f)) and equivalent
+
+    output_path = Path(args.output) if args.output else (
+        PROJ / 'bench' / f"els-bench-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nResults saved to {output_path}")
+
+    if not equivalent:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
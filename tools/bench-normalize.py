@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark Hebrew Word Normalization
+
+Times the shared str.translate normalization (hebrew_normalize.py)
+against the per-builder code it replaced, on the words of the dictionary
+sources, and checks that both give the same result for every word.
+
+    normalize      re.sub niqqud + per-character final-letter generator
+                   (build-unified-dict.normalize_word)
+    normalize      re.sub niqqud + five str.replace calls
+                   (build-root-lexicon.HebrewRootExtractor.normalize)
+    letters_only   re.sub niqqud + per-character letter filter
+                   (build-els-index.load_dictionary, build-wikipedia-dict)
+    strip_niqqud   re.sub (build-strongs-dict.remove_niqqud)
+
+normalize_word (LRU-cached) is timed on a second pass over the same
+words, as the unified builder sees them again for the inflection map.
+
+Usage:
+    python3 tools/bench-normalize.py
+    python3 tools/bench-normalize.py --repeat 5
+"""
+
+import argparse
+import gzip
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+from hebrew_normalize import (FINAL_TO_REGULAR, HEBREW_LETTERS, letters_only, normalize,
+                              normalize_word, strip_niqqud)
+
+PROJ = Path(__file__).resolve().parent.parent
+SOURCES = [
+    PROJ / 'data' / 'dictionaries' / 'openscriptures-bdb.json.gz',
+    PROJ / 'data' / 'dictionaries' / 'strongs-hebrew.json.gz',
+    PROJ / 'data' / 'dictionaries' / 'hebrew-wiktionary.json.gz',
+    PROJ / 'data' / 'embeddings' / 'hebrew-roots.json.gz',
+    PROJ / 'data' / 'dictionaries' / 'wikipedia-hebrew.json.gz',
+]
+
+LETTER_SET = set(HEBREW_LETTERS)
+
+
+def regex_generator_normalize(word):
+    word = re.sub(r'[\u0591-\u05C7]', '', word)
+    return ''.join(FINAL_TO_REGULAR.get(c, c) for c in word)
+
+
+def regex_replace_normalize(word):
+    normalized = re.sub(r'[\u0591-\u05C7]', '', word)
+    for final, regular in FINAL_TO_REGULAR.items():
+        normalized = normalized.replace(final, regular)
+    return normalized
+
+
+def regex_filter_letters(word):
+    clean = re.sub(r'[\u0591-\u05C7]', '', word)
+    return ''.join(c for c in clean if c in LETTER_SET)
+
+
+def regex_strip_niqqud(word):
+    return re.sub(r'[\u0591-\u05C7]', '', word)
+
+
+CASES = [
+    ('normalize', regex_generator_normalize, normalize),
+    ('normalize (replace chain)', regex_replace_normalize, normalize),
+    ('letters_only', regex_filter_letters, letters_only),
+    ('strip_niqqud', regex_strip_niqqud, strip_niqqud),
+]
+
+
+def load_words():
+    """Dictionary keys of every source present, in source order (with repeats across sources)"""
+    words = []
+    for path in SOURCES:
+        if not path.exists():
+            print(f"  WARNING: {path} not found, skipping")
+            continue
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        words.extend(data.get('entries', data))
+    return words
+
+
+def time_per_word(func, words, repeat):
+    """Best-of-repeat time per word in nanoseconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for word in words:
+            func(word)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(words) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Hebrew word normalization')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing runs per case (best is kept)')
+    args = parser.parse_args()
+
+    words = load_words()
+    if not words:
+        print("Error: no dictionary sources found")
+        sys.exit(1)
+    print(f"Words: {len(words):,} ({len(set(words)):,} distinct)\n")
+
+    print(f"{'Operation':<28} {'Old ns/word':>12} {'New ns/word':>12} {'Speedup':>9}")
+    print("-" * 64)
+    for name, old, new in CASES:
+        mismatches = sum(1 for w in words if old(w) != new(w))
+        if mismatches:
+            print(f"Error: {name}: {mismatches:,} words differ from the old implementation")
+            sys.exit(1)
+        old_ns = time_per_word(old, words, args.repeat)
+        new_ns = time_per_word(new, words, args.repeat)
+        print(f"{name:<28} {old_ns:>12.0f} {new_ns:>12.0f} {old_ns / new_ns:>8.1f}x")
+
+    # Memoized entry point: first pass fills the cache, the second hits it
+    normalize_word.cache_clear()
+    old_ns = time_per_word(regex_generator_normalize, words, 1)
+    first_ns = time_per_word(normalize_word, words, 1)
+    cached_ns = time_per_word(normalize_word, words, args.repeat)
+    print(f"{'normalize_word (cold)':<28} {old_ns:>12.0f} {first_ns:>12.0f} {old_ns / first_ns:>8.1f}x")
+    print(f"{'normalize_word (warm)':<28} {old_ns:>12.0f} {cached_ns:>12.0f} {old_ns / cached_ns:>8.1f}x")
+    info = normalize_word.cache_info()
+    print(f"\nCache: {info.currsize:,} entries, {info.hits:,} hits, {info.misses:,} misses")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,7 +6,10 @@ Uses Koren transliterated files for verse/chapter/word structure,
 and torahNoSpaces.txt for the actual Hebrew characters.
 This ensures exact position alignment with the ELS search text.
 
-Output: per-book *-chars.json.gz files in data/ directory.
+Output: per-book *-chars.json.gz files in data/ directory, plus the same
+records as columnar *-chars.cols files (see char_columns.py), and
+torah-verses.cols, the verse offset table of torahNoSpaces.txt (see
+verse_offsets.py).
 
 Usage:
     python3 tools/build-chardb.py
@@ -17,6 +20,9 @@ import gzip
 import sys
 from pathlib import Path
 
+from char_columns import write_char_columns
+from verse_offsets import VerseOffsets, verse_rows
+
 # Transliteration mapping: Koren Latin → Hebrew
 TRANSLIT = {
     ')': 'א', 'B': 'ב', 'G': 'ג', 'D': 'ד', 'H': 'ה',
@@ -186,6 +192,7 @@ def main():
 
     global_offset = 0
     total_chars = 0
+    rows = []
 
     for book_num, koren_file, output_name in TORAH_BOOKS:
         print(f"\n{'='*50}")
@@ -247,6 +254,11 @@ def main():
         gz_size = gz_path.stat().st_size
         print(f"  Output: {gz_path.name} ({gz_size / 1024:.1f} KB)")
 
+        cols_path = data_dir / f'{output_name}-chars.cols'
+        cols_size = write_char_columns(chars, cols_path, {'book': output_name, 'source': 'koren'})
+        print(f"  Output: {cols_path.name} ({cols_size / 1024:.1f} KB)")
+
+        rows.extend(verse_rows((c['id'], c['book'], c['chapter'], c['verse']) for c in chars))
         global_offset = next_offset
         total_chars += actual_chars
 
@@ -254,6 +266,11 @@ def main():
     print(f"COMPLETE: {total_chars:,} total chars (expected {len(torah_text):,})")
     if total_chars == len(torah_text):
         print("Perfect alignment with torahNoSpaces.txt!")
+        verses_path = data_dir / 'torah-verses.cols'
+        table = VerseOffsets.from_text_rows(rows, torah_text, torah_path.name, source='koren',
+                                            books={n: name for n, _, name in TORAH_BOOKS})
+        size = table.save(verses_path)
+        print(f"Verse offsets: {verses_path.name} ({len(table):,} verses, {size / 1024:.1f} KB)")
     else:
         print(f"WARNING: off by {total_chars - len(torah_text):,} chars!")
     print('='*50)
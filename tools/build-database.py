@@ -6,23 +6,40 @@ Parses Hebrew biblical texts and generates character-level, word-level,
 and verse-level JSON databases for the Hebrew Bible Analysis Suite.
 
 Input: Leningrad Codex JSON files (torah-codes/texts/)
-Output: JSON and compressed .gz files for IndexedDB (data/)
+Output: compressed JSON (.json.gz by default) for IndexedDB (data/), plus the
+        characters as a columnar <book>-chars.cols file (see char_columns.py);
+        pretty-printed .json copies with --plain-json. A full 'all' build also
+        writes the whole Tanakh as one letter string, tanakhNoSpaces.txt, with
+        its verse offset table tanakh-verses.cols (see verse_offsets.py)
 
 Usage:
-    python build-database.py [book_name|all]
+    python build-database.py [book_name|all] [--jobs N] [--compression gzip|zstd|brotli]
+                             [--level N] [--plain-json]
 
     Examples:
         python build-database.py genesis
         python build-database.py exodus
         python build-database.py all
+        python build-database.py all --jobs 0    # one process per core
+        python build-database.py all --compression zstd --level 19
+
+    With --jobs, books are parsed and written in parallel (largest first);
+    each book's log is buffered and printed in book order.
 """
 
+import argparse
+import io
 import json
+import multiprocessing as mp
 import sys
 import gzip
 import unicodedata
+from contextlib import redirect_stdout
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from char_columns import write_char_columns
+from verse_offsets import VerseOffsets
 
 # Hebrew letter gematria values (standard method)
 GEMATRIA_STANDARD = {
@@ -350,16 +367,64 @@ def parse_book(json_file: Path, book_number: int) -> Tuple[List[Dict], List[Dict
     return chars, words, verses
 
 
+# Codec -> (file suffix, default level)
+COMPRESSORS = {
+    'gzip': ('.gz', 9),
+    'zstd': ('.zst', 19),
+    'brotli': ('.br', 11),
+}
+
+
+def get_compressor(codec: str = 'gzip', level: Optional[int] = None):
+    """
+    Return a bytes -> bytes compression function for a codec.
+
+    zstd and brotli are optional dependencies, imported on first use.
+    """
+    level = COMPRESSORS[codec][1] if level is None else level
+
+    if codec == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            print("Error: 'zstandard' package not installed. Run: pip install zstandard")
+            sys.exit(1)
+        return zstandard.ZstdCompressor(level=level).compress
+
+    if codec == 'brotli':
+        try:
+            import brotli
+        except ImportError:
+            print("Error: 'brotli' package not installed. Run: pip install brotli")
+            sys.exit(1)
+        return lambda data: brotli.compress(data, quality=level)
+
+    return lambda data: gzip.compress(data, compresslevel=level)
+
+
 def write_output_files(book_name: str, chars: List[Dict], words: List[Dict],
-                       verses: List[Dict], output_dir: Path, compress: bool = True):
+                       verses: List[Dict], output_dir: Path, compress: bool = True,
+                       codec: str = 'gzip', level: Optional[int] = None,
+                       plain_json: bool = False):
     """
-    Write output files (JSON and optionally compressed .gz).
+    Write output files (compressed JSON, and optionally plain indented JSON).
+
+    Each dataset is serialized once into a buffer, which is compressed and
+    written in one go; sizes come from the buffers, not from the files.
+    The indented plain-JSON copy needs a second serialization and is only
+    written with plain_json (or when compression is off).
 
     Args:
         book_name: Book name for filenames (e.g., 'genesis')
         chars, words, verses: Data to write
         output_dir: Output directory
-        compress: Whether to generate .gz files
+        compress: Whether to generate compressed files
+        codec: 'gzip' (.gz), 'zstd' (.zst) or 'brotli' (.br)
+        level: Compression level (default: the codec's maximum-ratio level)
+        plain_json: Also write pretty-printed .json files
+
+    Returns:
+        (uncompressed, compressed) total bytes
     """
     print("\n💾 Writing output files...")
 
@@ -368,46 +433,57 @@ def write_output_files(book_name: str, chars: List[Dict], words: List[Dict],
         'words': (f'{book_name}-words.json', words),
         'verses': (f'{book_name}-verses.json', verses)
     }
+    compressor = get_compressor(codec, level) if compress else None
+    suffix = COMPRESSORS[codec][0]
 
     total_uncompressed = 0
     total_compressed = 0
 
     for data_type, (filename, data) in files.items():
-        # Write uncompressed JSON
-        json_file = output_dir / filename
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        buffer = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        total_uncompressed += len(buffer)
 
-        uncompressed_size = json_file.stat().st_size
-        total_uncompressed += uncompressed_size
-        print(f"  ✅ {filename} ({uncompressed_size / 1024:.1f} KB)")
+        if plain_json or not compress:
+            pretty = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+            (output_dir / filename).write_bytes(pretty)
+            print(f"  ✅ {filename} ({len(pretty) / 1024:.1f} KB)")
 
-        # Write compressed .gz
         if compress:
-            gz_file = output_dir / f'{filename}.gz'
-            with gzip.open(gz_file, 'wt', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False)
-
-            compressed_size = gz_file.stat().st_size
-            total_compressed += compressed_size
-            compression_ratio = uncompressed_size / compressed_size if compressed_size > 0 else 0
-            print(f"     {filename}.gz ({compressed_size / 1024:.1f} KB, {compression_ratio:.1f}x compression)")
+            packed = compressor(buffer)
+            (output_dir / f'{filename}{suffix}').write_bytes(packed)
+            total_compressed += len(packed)
+            compression_ratio = len(buffer) / len(packed) if packed else 0
+            print(f"  ✅ {filename}{suffix} ({len(packed) / 1024:.1f} KB, "
+                  f"{compression_ratio:.1f}x compression of {len(buffer) / 1024:.1f} KB)")
+
+    # Columnar characters: one typed array per field, mmap-able
+    cols_file = output_dir / f'{book_name}-chars.cols'
+    cols_size = write_char_columns(chars, cols_file, {'book': book_name, 'source': 'leningrad'})
+    print(f"  ✅ {cols_file.name} ({cols_size / 1024:.1f} KB, columnar)")
 
     return total_uncompressed, total_compressed
 
 
-def process_book(book_number: int, texts_dir: Path, output_dir: Path, compress: bool = True):
-    """Process a single book."""
+def process_book(book_number: int, texts_dir: Path, output_dir: Path,
+                 compress: bool = True, codec: str = 'gzip', level: Optional[int] = None,
+                 plain_json: bool = False) -> Optional[Dict]:
+    """Process a single book (output options as in write_output_files).
+
+    Returns:
+        Dict with 'uncompressed' and 'compressed' bytes written, the book's
+        consonantal 'text' and its 'verses' as (chapter, verse, char_count),
+        or None on failure
+    """
     if book_number not in BOOK_FILES:
         print(f"❌ Error: Unknown book number {book_number}")
-        return False
+        return None
 
     filename, book_name = BOOK_FILES[book_number]
     json_file = texts_dir / filename
 
     if not json_file.exists():
         print(f"❌ Error: {json_file} not found")
-        return False
+        return None
 
     print(f"\n{'='*60}")
     print(f"Processing Book {book_number}: {book_name.title()}")
@@ -418,7 +494,7 @@ def process_book(book_number: int, texts_dir: Path, output_dir: Path, compress:
 
     # Write output files
     uncompressed, compressed = write_output_files(
-        book_name, chars, words, verses, output_dir, compress
+        book_name, chars, words, verses, output_dir, compress, codec, level, plain_json
     )
 
     # Summary
@@ -432,7 +508,86 @@ def process_book(book_number: int, texts_dir: Path, output_dir: Path, compress:
     print(f"  Compressed: {compressed / 1024:.1f} KB")
     print(f"  Ratio: {uncompressed / compressed if compressed > 0 else 0:.1f}x")
 
-    return True
+    return {
+        'uncompressed': uncompressed,
+        'compressed': compressed,
+        'text': ''.join(v['verse_text_consonantal'] for v in verses),
+        'verses': [(v['chapter'], v['verse'], v['char_count']) for v in verses],
+    }
+
+
+def write_tanakh_text(books: List[Tuple[int, Dict]], output_dir: Path):
+    """
+    Write the concatenated letters of all books and their verse offset table.
+
+    Args:
+        books: (book_number, process_book result) in canonical order
+        output_dir: Output directory
+
+    Outputs tanakhNoSpaces.txt (Leningrad consonantal text, finals kept) and
+    tanakh-verses.cols, which maps any position in it to book/chapter/verse.
+    """
+    rows = []
+    texts = []
+    pos = 0
+    for book_number, result in books:
+        for chapter, verse, char_count in result['verses']:
+            rows.append((pos, book_number, chapter, verse))
+            pos += char_count
+        texts.append(result['text'])
+    text = ''.join(texts)
+
+    text_file = output_dir / 'tanakhNoSpaces.txt'
+    text_file.write_text(text, encoding='utf-8')
+
+    offsets = VerseOffsets.from_text_rows(rows, text, text_file.name, source='leningrad',
+                                          books={n: BOOK_FILES[n][1] for n, _ in books})
+    offsets_file = output_dir / 'tanakh-verses.cols'
+    offsets_size = offsets.save(offsets_file)
+
+    print(f"\n📜 Whole-Tanakh text: {text_file.name} ({len(text):,} letters)")
+    print(f"   Verse offsets: {offsets_file.name} ({len(offsets):,} verses, {offsets_size / 1024:.1f} KB)")
+
+
+def _process_book_logged(task: Tuple) -> Tuple[Optional[Dict], str]:
+    """Pool task: process_book with its output captured -> (result, log)"""
+    log = io.StringIO()
+    with redirect_stdout(log):
+        result = process_book(*task)
+    return result, log.getvalue()
+
+
+def process_books(book_numbers: List[int], texts_dir: Path, output_dir: Path, jobs: int,
+                  **options):
+    """Yield process_book's result for each book, in book order.
+
+    options are passed to process_book (codec, level, plain_json).
+
+    With jobs > 1 the books run in a process pool, largest source file
+    first so the slowest book starts immediately; logs are printed as each
+    book's turn comes, so the output reads as in a serial run.
+    """
+    tasks = [(n, texts_dir, output_dir, True, options.get('codec', 'gzip'), options.get('level'),
+              options.get('plain_json', False)) for n in book_numbers]
+    if jobs <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield process_book(*task)
+        return
+
+    def source_size(task):
+        if task[0] not in BOOK_FILES:
+            return 0
+        path = texts_dir / BOOK_FILES[task[0]][0]
+        return path.stat().st_size if path.exists() else 0
+
+    ctx = mp.get_context('fork') if 'fork' in mp.get_all_start_methods() else mp.get_context()
+    with ctx.Pool(min(jobs, len(tasks))) as pool:
+        pending = {task[0]: pool.apply_async(_process_book_logged, (task,))
+                   for task in sorted(tasks, key=source_size, reverse=True)}
+        for book_number in book_numbers:
+            result, log = pending[book_number].get()
+            print(log, end='')
+            yield result
 
 
 def main():
@@ -445,18 +600,33 @@ def main():
     output_dir.mkdir(exist_ok=True)
 
     # Parse command-line arguments
-    if len(sys.argv) < 2:
-        print("Usage: python build-database.py [book_name|book_number|all]")
+    parser = argparse.ArgumentParser(description='Build the Hebrew Bible character/word/verse databases')
+    parser.add_argument('book', nargs='?', help='Book name, book number, or "all"')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Books to process in parallel (0 = all CPU cores)')
+    parser.add_argument('--compression', choices=sorted(COMPRESSORS), default='gzip',
+                        help='Codec for the compressed copies: gzip (.gz, default), zstd (.zst), brotli (.br)')
+    parser.add_argument('--level', type=int, default=None,
+                        help='Compression level (default: 9 for gzip, 19 for zstd, 11 for brotli)')
+    parser.add_argument('--plain-json', action='store_true',
+                        help='Also write pretty-printed uncompressed .json files')
+    args = parser.parse_args()
+
+    if args.book is None:
+        print("Usage: python build-database.py [book_name|book_number|all] [--jobs N] [--compression C] [--level N] [--plain-json]")
         print("\nExamples:")
         print("  python build-database.py genesis")
         print("  python build-database.py 1")
         print("  python build-database.py all")
+        print("  python build-database.py all --jobs 8")
         print("\nAvailable books:")
         for num, (_, name) in sorted(BOOK_FILES.items()):
             print(f"  {num:2d}. {name}")
         return 1
 
-    arg = sys.argv[1].lower()
+    arg = args.book.lower()
+    jobs = args.jobs if args.jobs > 0 else mp.cpu_count()
+    get_compressor(args.compression, args.level)  # fail early if the codec is not installed
 
     # Determine which books to process
     if arg == 'all':
@@ -475,19 +645,20 @@ def main():
     success_count = 0
     total_uncompressed = 0
     total_compressed = 0
+    processed = []
 
-    for book_number in book_numbers:
-        if process_book(book_number, texts_dir, output_dir, compress=True):
+    results = process_books(book_numbers, texts_dir, output_dir, jobs, codec=args.compression,
+                            level=args.level, plain_json=args.plain_json)
+    for book_number, result in zip(book_numbers, results):
+        if result is not None:
             success_count += 1
-            # Accumulate sizes
-            _, book_name = BOOK_FILES[book_number]
-            for suffix in ['chars', 'words', 'verses']:
-                json_file = output_dir / f'{book_name}-{suffix}.json'
-                gz_file = output_dir / f'{book_name}-{suffix}.json.gz'
-                if json_file.exists():
-                    total_uncompressed += json_file.stat().st_size
-                if gz_file.exists():
-                    total_compressed += gz_file.stat().st_size
+            total_uncompressed += result['uncompressed']
+            total_compressed += result['compressed']
+            processed.append((book_number, result))
+
+    # Whole-Tanakh text, only when every book was built
+    if arg == 'all' and success_count == len(book_numbers):
+        write_tanakh_text(processed, output_dir)
 
     # Final summary
     print(f"\n{'='*60}")
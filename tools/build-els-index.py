@@ -7,11 +7,31 @@ This transforms ELS searches from O(n*m*s) to O(1) lookups.
 
 Usage:
     python3 build-els-index.py [--skip-range 100] [--output els-index.json.gz]
+    python3 build-els-index.py --skip-range 100 --engine numpy --workers 32
+    python3 build-els-index.py --skip-range 100 --incremental
+    python3 build-els-index.py --skip-range 2000 --adaptive-skip
+    python3 build-els-index.py --text data/tanakhNoSpaces.txt --output data/els-index/tanakh-els-index.elsx \
+        --format binary --engine numpy --workers 0
 
 Features:
 - Trie-based efficient word matching
-- Parallel processing across CPU cores
-- Delta-encoded compression
+- Flat array trie in shared memory (--engine flat)
+- Vectorized NumPy engine (--engine numpy)
+- Parallel processing across CPU cores (--workers N)
+- Delta-encoded, varint-packed binary format (--format binary, see els_binary_index.py)
+- Incremental update when the dictionary changes (--incremental)
+- Bounded-memory spill-to-disk build for large skip ranges (--memory-budget MB)
+- Persistent per-word hit cache for reruns over the same text (els_hit_cache.py);
+  only words missing from data/els-cache are scanned (--no-cache to bypass)
+- Per-word adaptive skip bound D(w) from letter frequencies (--adaptive-skip, see
+  els_letter_stats.py): each word is indexed up to the skip where its expected ELS
+  count reaches --expected-hits, with --skip-range as the cap
+- Any flat letter text (--text), e.g. the whole Tanakh from build-database.py
+  (tanakhNoSpaces.txt, with tanakh-verses.cols to map positions to verses)
+- Verse spans: with a verse offset table for the text (torah-verses.cols, see
+  verse_offsets.py), every JSON occurrence is stored as [pos, skip, first, last],
+  the first and last verse-table rows the ELS touches (--verses, --no-verses).
+  The layout is recorded in metadata['occurrence_fields'], which readers check
 - Progress reporting
 """
 
@@ -19,13 +39,28 @@ import json
 import gzip
 import hashlib
 import argparse
-import re
 from pathlib import Path
 from collections import defaultdict
 from datetime import datetime
 import multiprocessing as mp
+from multiprocessing import shared_memory
 from functools import partial
+from array import array
+import mmap
+import struct
+import shutil
 import sys
+import tempfile
+import heapq
+from itertools import groupby, islice
+
+from dict_binary import DictionaryReader
+from els_binary_index import (BinaryIndexWriter, ElsIndexReader, encode_postings, iter_postings,
+                              write_binary_index)
+from els_hit_cache import ElsHitCache
+from els_letter_stats import LetterStats
+from hebrew_normalize import letters_only
+from verse_offsets import VerseOffsets
 
 
 # Hebrew letters (consonantal)
@@ -34,6 +69,16 @@ HEBREW_LETTERS = set('אבגדהוזחטיכלמנסעפצקרשתךםןףץ')
 # Final letter normalization
 FINAL_TO_REGULAR = {'ך': 'כ', 'ם': 'מ', 'ן': 'נ', 'ף': 'פ', 'ץ': 'צ'}
 
+# uint8 letter codes for the vectorized engine (0 is reserved for "no letter")
+LETTER_CODES = {c: i + 1 for i, c in enumerate(sorted(HEBREW_LETTERS))}
+CODE_BASE = len(LETTER_CODES) + 1
+
+# Longest prefix whose base-CODE_BASE key still fits in an int64
+MAX_PACKED_LENGTH = 13
+
+# Depth levels with at most this many possible keys use dense lookup arrays
+DENSE_TABLE_LIMIT = 1 << 20
+
 
 class TrieNode:
     """Trie node for efficient prefix matching"""
@@ -78,6 +123,172 @@ class Trie:
         return words_found
 
 
+class FlatTrie:
+    """Read-only array-backed trie over the letter-code alphabet.
+
+    Nodes are numbered breadth-first so each node's children are contiguous.
+    A node is three parallel uint32/int32 entries:
+      - bitmap:      bit c set if the node has a child for letter code c
+      - first_child: id of the node's first child
+      - node_word:   id of the word ending at this node, or -1
+    The child for code c is first_child + popcount(bitmap & ((1 << c) - 1)),
+    so a step is two array reads and a popcount instead of a dict hash.
+
+    All arrays plus the word strings live in one flat buffer (a
+    multiprocessing.shared_memory segment or an mmap), so worker processes
+    attach to the same pages instead of unpickling millions of TrieNodes.
+    """
+
+    MAGIC = b'ELTF'
+    HEADER = struct.Struct('<4sIII')  # magic, node count, word count, blob length
+
+    def __init__(self, buffer, shm=None):
+        self.shm = shm
+        self.buffer = memoryview(buffer)
+
+        magic, self.node_count, self.word_count, blob_len = self.HEADER.unpack_from(self.buffer, 0)
+        if magic != self.MAGIC:
+            raise ValueError("Not a flat trie buffer")
+
+        n = self.node_count
+        offset = self.HEADER.size
+        self.bitmap = self.buffer[offset:offset + 4 * n].cast('I')
+        offset += 4 * n
+        self.first_child = self.buffer[offset:offset + 4 * n].cast('I')
+        offset += 4 * n
+        self.node_word = self.buffer[offset:offset + 4 * n].cast('i')
+        offset += 4 * n
+        self.word_offsets = self.buffer[offset:offset + 4 * (self.word_count + 1)].cast('I')
+        offset += 4 * (self.word_count + 1)
+        self.blob = self.buffer[offset:offset + blob_len]
+
+    @classmethod
+    def encode(cls, words):
+        """Serialize a word set into the flat trie buffer layout"""
+        word_list = sorted(words)
+        word_ids = {word: i for i, word in enumerate(word_list)}
+
+        # Level-by-level prefixes; sorting each level keeps siblings contiguous
+        levels = [['']]
+        depth = 1
+        while True:
+            level = sorted({w[:depth] for w in word_list if len(w) >= depth})
+            if not level:
+                break
+            levels.append(level)
+            depth += 1
+
+        node_count = sum(len(level) for level in levels)
+        bitmap = array('I', bytes(4 * node_count))
+        first_child = array('I', bytes(4 * node_count))
+        node_word = array('i', [-1]) * node_count
+
+        level_base = 0
+        for depth, level in enumerate(levels):
+            child_base = level_base + len(level)
+            parent_ids = {prefix: level_base + i for i, prefix in enumerate(level)}
+
+            for i, prefix in enumerate(level):
+                node_word[level_base + i] = word_ids.get(prefix, -1) if prefix else -1
+
+            if depth + 1 < len(levels):
+                for i, child in enumerate(levels[depth + 1]):
+                    parent = parent_ids[child[:-1]]
+                    if bitmap[parent] == 0:
+                        first_child[parent] = child_base + i
+                    bitmap[parent] |= 1 << LETTER_CODES[child[-1]]
+
+            level_base = child_base
+
+        encoded = [w.encode('utf-8') for w in word_list]
+        word_offsets = array('I', [0])
+        for raw in encoded:
+            word_offsets.append(word_offsets[-1] + len(raw))
+        blob = b''.join(encoded)
+
+        header = cls.HEADER.pack(cls.MAGIC, node_count, len(word_list), len(blob))
+        return b''.join([header, bitmap.tobytes(), first_child.tobytes(),
+                         node_word.tobytes(), word_offsets.tobytes(), blob])
+
+    @classmethod
+    def from_words(cls, words, shared=True):
+        """Build a flat trie, placed in a new shared memory segment by default"""
+        data = cls.encode(words)
+        if not shared:
+            return cls(bytearray(data))
+
+        shm = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+        shm.buf[:len(data)] = data
+        return cls(shm.buf, shm)
+
+    @classmethod
+    def attach(cls, name):
+        """Attach to a flat trie another process placed in shared memory"""
+        try:
+            # Python 3.13+: the creating process alone owns the segment's lifetime
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            shm = shared_memory.SharedMemory(name=name)
+        return cls(shm.buf, shm)
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map a flat trie previously written with save()"""
+        with open(path, 'rb') as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def save(self, path):
+        """Write the flat trie buffer to a file (readable with load())"""
+        with open(path, 'wb') as f:
+            f.write(self.buffer)
+
+    def __reduce__(self):
+        # Pickle by shared memory name so spawned workers attach, not copy
+        if self.shm is None:
+            return (FlatTrie, (bytes(self.buffer),))
+        return (FlatTrie.attach, (self.shm.name,))
+
+    def close(self, unlink=False):
+        """Release the buffer views (and the shared memory segment if unlink)"""
+        for view in (self.bitmap, self.first_child, self.node_word, self.word_offsets,
+                     self.blob, self.buffer):
+            view.release()
+        if self.shm is not None:
+            self.shm.close()
+            if unlink:
+                self.shm.unlink()
+
+    def word(self, word_id):
+        """Return the word string for a word id"""
+        return bytes(self.blob[self.word_offsets[word_id]:self.word_offsets[word_id + 1]]).decode('utf-8')
+
+    def child(self, node, code):
+        """Return the child of node for a letter code, or -1"""
+        bits = self.bitmap[node]
+        bit = 1 << code
+        if not bits & bit:
+            return -1
+        return self.first_child[node] + (bits & (bit - 1)).bit_count()
+
+    def search_from_sequence(self, sequence):
+        """Find all dictionary words that are prefixes of the sequence"""
+        words_found = []
+        node = 0
+
+        for i, char in enumerate(sequence):
+            code = LETTER_CODES.get(char)
+            if code is None:
+                break
+            node = self.child(node, code)
+            if node < 0:
+                break
+            word_id = self.node_word[node]
+            if word_id >= 0:
+                words_found.append((self.word(word_id), i + 1))  # (word, length)
+
+        return words_found
+
+
 def load_torah_text(torah_path):
     """Load Torah text (consonantal only)"""
     print(f"Loading Torah text from {torah_path}...")
@@ -86,12 +297,20 @@ def load_torah_text(torah_path):
         text = f.read().strip()
 
     # Remove any non-Hebrew characters
-    text = ''.join(c for c in text if c in HEBREW_LETTERS)
+    text = letters_only(text)
 
     print(f"  Loaded {len(text):,} characters")
     return text
 
 
+def binary_dictionary_path(path):
+    """The .dictx written next to a dictionary JSON, if present and not older than it"""
+    binary_path = path.with_name(path.name.split('.')[0] + '.dictx')
+    if binary_path.exists() and (not path.exists() or binary_path.stat().st_mtime >= path.stat().st_mtime):
+        return binary_path
+    return None
+
+
 def load_dictionary(dict_paths):
     """Load dictionary words from multiple sources"""
     print("Loading dictionary...")
@@ -99,29 +318,21 @@ def load_dictionary(dict_paths):
     words = set()
 
     for path in dict_paths:
-        if not path.exists():
+        binary_path = binary_dictionary_path(path)
+        if binary_path:
+            # Binary dictionary: read only the front-coded word list, not the entries
+            print(f"  Loading words from {binary_path}...")
+            with DictionaryReader(binary_path) as reader:
+                entries = list(reader.words())
+        elif not path.exists():
             print(f"  WARNING: {path} not found, skipping")
             continue
-
-        print(f"  Loading {path}...")
-
-        if path.suffix == '.gz':
-            with gzip.open(path, 'rt', encoding='utf-8') as f:
-                data = json.load(f)
-        else:
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-        # Handle different formats
-        if 'entries' in data:
-            entries = data['entries']
         else:
-            entries = data
+            entries = load_dictionary_entries(path)
 
-        for word in entries.keys():
+        for word in entries:
             # Normalize: remove niqqud, keep only Hebrew letters
-            clean = re.sub(r'[\u0591-\u05C7]', '', word)
-            clean = ''.join(c for c in clean if c in HEBREW_LETTERS)
+            clean = letters_only(word)
 
             if len(clean) >= 2:  # Minimum 2 letters
                 words.add(clean)
@@ -130,6 +341,23 @@ def load_dictionary(dict_paths):
     return words
 
 
+def load_dictionary_entries(path):
+    """Entries (word -> entry) of a dictionary JSON file"""
+    print(f"  Loading {path}...")
+
+    if path.suffix == '.gz':
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+    # Handle different formats
+    if 'entries' in data:
+        return data['entries']
+    return data
+
+
 def build_trie(words):
     """Build trie from word set"""
     print("Building trie...")
@@ -142,6 +370,16 @@ def build_trie(words):
     return trie
 
 
+def build_flat_trie(words):
+    """Build a FlatTrie in shared memory from a word set"""
+    print("Building flat trie...")
+    trie = FlatTrie.from_words(words)
+
+    size_mb = len(trie.buffer) / (1024 * 1024)
+    print(f"  Flat trie contains {trie.word_count:,} words, {trie.node_count:,} nodes ({size_mb:.1f} MB)")
+    return trie
+
+
 def extract_sequence(torah, start, skip, max_length):
     """Extract letter sequence from Torah at given start and skip"""
     if skip == 0:
@@ -190,6 +428,84 @@ def find_words_at_skip(args):
     return skip, dict(results)
 
 
+def scan_skip_trie(torah, trie, skip, max_word_length=10, min_word_length=2):
+    """Find all dictionary words at one skip value by walking the trie.
+
+    Returns dict word -> [start, ...] with words in the order they are first
+    found (start ascending, then word length ascending).
+    """
+    if isinstance(trie, FlatTrie):
+        return scan_skip_flat(encode_letters(torah), trie, skip, max_word_length, min_word_length)
+
+    results = defaultdict(list)
+    torah_len = len(torah)
+
+    for start in range(torah_len):
+        # Walk trie while extracting letters
+        node = trie.root
+        pos = start
+        depth = 0
+
+        while node and 0 <= pos < torah_len and depth < max_word_length:
+            letter = torah[pos]
+            if letter not in node.children:
+                break
+            node = node.children[letter]
+
+            if node.is_word and len(node.word) >= min_word_length:
+                results[node.word].append(start)
+
+            pos += skip
+            depth += 1
+
+    return dict(results)
+
+
+def encode_letters(torah):
+    """Encode Torah text as a bytes object of letter codes"""
+    return torah.translate({ord(c): code for c, code in LETTER_CODES.items()}).encode('latin-1')
+
+
+def scan_skip_flat(codes, flat, skip, max_word_length=10, min_word_length=2):
+    """Find all dictionary words at one skip value by walking a FlatTrie.
+
+    Same results, in the same order, as scan_skip_trie; codes is the Torah
+    encoded with encode_letters.
+    """
+    results = defaultdict(list)
+    torah_len = len(codes)
+    bitmap = flat.bitmap
+    first_child = flat.first_child
+    node_word = flat.node_word
+
+    for start in range(torah_len):
+        node = 0
+        pos = start
+        depth = 0
+
+        while 0 <= pos < torah_len and depth < max_word_length:
+            bits = bitmap[node]
+            bit = 1 << codes[pos]
+            if not bits & bit:
+                break
+            node = first_child[node] + (bits & (bit - 1)).bit_count()
+            depth += 1
+
+            word_id = node_word[node]
+            if word_id >= 0 and depth >= min_word_length:
+                results[word_id].append(start)
+
+            pos += skip
+
+    return {flat.word(word_id): starts for word_id, starts in results.items()}
+
+
+def merge_skip_results(index, skip, results):
+    """Append one skip's word -> starts results to the index"""
+    for word, starts in results.items():
+        index[word].extend((start, skip) for start in starts)
+
+
 def build_index_optimized(torah, trie, skip_range, max_word_length=10, min_word_length=2):
     """Build ELS index with optimized single-process approach"""
     print(f"\nBuilding ELS index (skip range: {skip_range[0]} to {skip_range[1]}, min word len: {min_word_length})...")
@@ -206,25 +522,8 @@ def build_index_optimized(torah, trie, skip_range, max_word_length=10, min_word_
 
     for i, skip in enumerate(skips):
         # Process this skip value
-        torah_len = len(torah)
-
-        for start in range(torah_len):
-            # Walk trie while extracting letters
-            node = trie.root
-            pos = start
-            depth = 0
-
-            while node and 0 <= pos < torah_len and depth < max_word_length:
-                letter = torah[pos]
-                if letter not in node.children:
-                    break
-                node = node.children[letter]
-
-                if node.is_word and len(node.word) >= min_word_length:
-                    index[node.word].append((start, skip))
-
-                pos += skip
-                depth += 1
+        results = scan_skip_trie(torah, trie, skip, max_word_length, min_word_length)
+        merge_skip_results(index, skip, results)
 
         # Progress update every skip
         if (i + 1) % 5 == 0 or i + 1 == total_skips:
@@ -248,6 +547,530 @@ def build_index_optimized(torah, trie, skip_range, max_word_length=10, min_word_
     return dict(index)
 
 
+def encode_torah(torah):
+    """Encode Torah text as a uint8 array of letter codes"""
+    import numpy as np
+
+    table = np.zeros(max(ord(c) for c in HEBREW_LETTERS) + 1, dtype=np.uint8)
+    for char, code in LETTER_CODES.items():
+        table[ord(char)] = code
+
+    codepoints = np.frombuffer(torah.encode('utf-32-le'), dtype=np.uint32)
+    return table[codepoints]
+
+
+def _depth_table(entries, depth):
+    """Build a key -> id lookup table for one depth level.
+
+    Shallow levels (few possible keys) use a dense array indexed by key;
+    deeper levels fall back to a sorted key array searched with searchsorted.
+    """
+    import numpy as np
+
+    entries = sorted(entries)
+    keys = np.array([k for k, _ in entries], dtype=np.int64)
+    ids = np.array([i for _, i in entries], dtype=np.int64)
+
+    if CODE_BASE ** depth <= DENSE_TABLE_LIMIT:
+        dense = np.full(CODE_BASE ** depth, -1, dtype=np.int64)
+        dense[keys] = ids
+        return dense, None, None
+    return None, keys, ids
+
+
+def _lookup(table, keys):
+    """Return (mask, ids): which keys are present in a depth table, and their ids"""
+    import numpy as np
+
+    dense, sorted_keys, ids = table
+    if dense is not None:
+        found = dense[keys]
+        return found >= 0, found
+
+    if len(sorted_keys) == 0:
+        return np.zeros(len(keys), dtype=bool), np.zeros(len(keys), dtype=np.int64)
+
+    idx = np.searchsorted(sorted_keys, keys)
+    np.minimum(idx, len(sorted_keys) - 1, out=idx)
+    return sorted_keys[idx] == keys, ids[idx]
+
+
+def build_depth_tables(words, max_word_length, min_word_length):
+    """Build per-depth lookup tables for the vectorized engine.
+
+    Returns (word_list, prefixes, terminals) where prefixes[d] holds the
+    packed keys of every length-d dictionary prefix (the trie nodes at
+    depth d) and terminals[d] maps packed keys of the indexable words of
+    exactly length d to their index in word_list.
+    """
+    word_list = sorted(w for w in words if len(w) <= max_word_length)
+
+    prefix_sets = [set() for _ in range(max_word_length + 1)]
+    terminal_lists = [[] for _ in range(max_word_length + 1)]
+
+    for word_id, word in enumerate(word_list):
+        key = 0
+        for depth, char in enumerate(word, 1):
+            key = key * CODE_BASE + LETTER_CODES[char]
+            prefix_sets[depth].add(key)
+        if len(word) >= min_word_length:
+            terminal_lists[len(word)].append((key, word_id))
+
+    prefixes = [_depth_table([(k, 0) for k in keys], depth)
+                for depth, keys in enumerate(prefix_sets)]
+    terminals = [_depth_table(entries, depth)
+                 for depth, entries in enumerate(terminal_lists)]
+
+    return word_list, prefixes, terminals
+
+
+def scan_skip_numpy(codes, prefixes, terminals, skip, max_word_length):
+    """Find all dictionary words at one skip value, one depth level at a time.
+
+    Every start position is advanced in lock-step: at depth d the d-th letter
+    of each live sequence is appended to its packed key, and sequences whose
+    key is no longer a dictionary prefix are masked out.
+
+    Returns (starts, word_ids) ordered by (start, word length), i.e. the
+    order in which the trie walk in build_index_optimized emits them.
+    """
+    import numpy as np
+
+    torah_len = len(codes)
+    starts = np.arange(torah_len, dtype=np.int64)
+    keys = np.zeros(torah_len, dtype=np.int64)
+
+    hit_starts = []
+    hit_words = []
+    hit_depths = []
+
+    for depth in range(1, max_word_length + 1):
+        pos = starts + (depth - 1) * skip
+        in_bounds = (pos >= 0) & (pos < torah_len)
+        if not in_bounds.all():
+            starts, keys, pos = starts[in_bounds], keys[in_bounds], pos[in_bounds]
+
+        keys = keys * CODE_BASE + codes[pos]
+
+        alive, _ = _lookup(prefixes[depth], keys)
+        starts, keys = starts[alive], keys[alive]
+        if len(starts) == 0:
+            break
+
+        found, word_ids = _lookup(terminals[depth], keys)
+        if found.any():
+            hit_starts.append(starts[found])
+            hit_words.append(word_ids[found])
+            hit_depths.append(np.full(int(found.sum()), depth, dtype=np.int64))
+
+    if not hit_starts:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+
+    hit_starts = np.concatenate(hit_starts)
+    hit_words = np.concatenate(hit_words)
+    order = np.lexsort((np.concatenate(hit_depths), hit_starts))
+    return hit_starts[order], hit_words[order]
+
+
+def _require_numpy():
+    """Import numpy, or exit with an install hint"""
+    try:
+        import numpy as np
+    except ImportError:
+        print("Error: 'numpy' package not installed. Run: pip install numpy")
+        sys.exit(1)
+    return np
+
+
+def assemble_numpy_index(word_list, skip_hits):
+    """Assemble per-skip (skip, starts, word_ids) arrays into the final index.
+
+    skip_hits must be in skip order. Words are keyed in the order the
+    sequential trie walk would first discover them, and each word's
+    occurrences are sorted by (position, skip).
+    """
+    import numpy as np
+
+    if not skip_hits or sum(len(starts) for _, starts, _ in skip_hits) == 0:
+        return {}
+
+    print("  Sorting occurrences...")
+    all_starts = np.concatenate([starts for _, starts, _ in skip_hits])
+    all_words = np.concatenate([word_ids for _, _, word_ids in skip_hits])
+    all_skips = np.concatenate([np.full(len(starts), skip, dtype=np.int64)
+                                for skip, starts, _ in skip_hits])
+
+    # Words appear in the order the sequential walk first discovers them
+    unique_ids, first_seen = np.unique(all_words, return_index=True)
+    discovery_order = unique_ids[np.argsort(first_seen, kind='stable')]
+    rank = np.empty(len(word_list), dtype=np.int64)
+    rank[discovery_order] = np.arange(len(discovery_order))
+
+    order = np.lexsort((all_skips, all_starts, rank[all_words]))
+    counts = np.bincount(rank[all_words], minlength=len(discovery_order)).tolist()
+    all_starts = all_starts[order].tolist()
+    all_skips = all_skips[order].tolist()
+
+    index = {}
+    offset = 0
+    for word_id, count in zip(discovery_order.tolist(), counts):
+        end = offset + count
+        index[word_list[word_id]] = list(zip(all_starts[offset:end], all_skips[offset:end]))
+        offset = end
+
+    return index
+
+
+def build_index_numpy(torah, words, skip_range, max_word_length=10, min_word_length=2):
+    """Build ELS index with the vectorized NumPy engine.
+
+    Produces exactly the same index (word order and occurrence order) as
+    build_index_optimized, but replaces the per-letter trie walk with
+    array operations over all start positions of a skip at once.
+    """
+    _require_numpy()
+
+    if max_word_length > MAX_PACKED_LENGTH:
+        raise ValueError(f"--max-word-length must be <= {MAX_PACKED_LENGTH} for the numpy engine")
+
+    print(f"\nBuilding ELS index with numpy engine (skip range: {skip_range[0]} to {skip_range[1]}, "
+          f"min word len: {min_word_length})...")
+
+    codes = encode_torah(torah)
+    word_list, prefixes, terminals = build_depth_tables(words, max_word_length, min_word_length)
+
+    skips = [s for s in range(skip_range[0], skip_range[1] + 1) if s != 0]
+    total_skips = len(skips)
+
+    skip_hits = []
+    total_occs = 0
+
+    import time
+    start_time = time.time()
+
+    for i, skip in enumerate(skips):
+        starts, word_ids = scan_skip_numpy(codes, prefixes, terminals, skip, max_word_length)
+        skip_hits.append((skip, starts, word_ids))
+        total_occs += len(starts)
+
+        if (i + 1) % 5 == 0 or i + 1 == total_skips:
+            elapsed = time.time() - start_time
+            pct = (i + 1) / total_skips * 100
+            rate = (i + 1) / elapsed if elapsed > 0 else 0
+            eta = (total_skips - i - 1) / rate if rate > 0 else 0
+            print(f"  Progress: {i+1}/{total_skips} skips ({pct:.1f}%), "
+                  f"{total_occs:,} occs, ETA: {eta/60:.1f}min", end='\r')
+            sys.stdout.flush()
+
+    print()  # Newline after progress
+
+    return assemble_numpy_index(word_list, skip_hits)
+
+
+# Per-process state for pool workers, set once by _init_worker
+_WORKER_STATE = {}
+
+
+def _init_worker(state):
+    """Pool initializer: receive the Torah text and matcher once per worker"""
+    _WORKER_STATE.update(state)
+
+
+def _scan_skip_worker(skip):
+    """Pool task: scan one skip value using the worker's shared state"""
+    state = _WORKER_STATE
+    if state['engine'] == 'numpy':
+        starts, word_ids = scan_skip_numpy(state['codes'], state['prefixes'], state['terminals'],
+                                           skip, state['max_word_length'])
+        return skip, (starts, word_ids)
+
+    return skip, scan_skip_trie(state['torah'], state['trie'], skip,
+                                state['max_word_length'], state['min_word_length'])
+
+
+def _worker_state(torah, words, trie, engine, max_word_length, min_word_length):
+    """Build the per-worker scan state -> (state, word_list or None)"""
+    state = {
+        'engine': engine,
+        'max_word_length': max_word_length,
+        'min_word_length': min_word_length,
+    }
+    if engine == 'numpy':
+        _require_numpy()
+        if max_word_length > MAX_PACKED_LENGTH:
+            raise ValueError(f"--max-word-length must be <= {MAX_PACKED_LENGTH} for the numpy engine")
+        word_list, prefixes, terminals = build_depth_tables(words, max_word_length, min_word_length)
+        state.update(codes=encode_torah(torah), prefixes=prefixes, terminals=terminals)
+        return state, word_list
+
+    state.update(torah=torah, trie=trie)
+    return state, None
+
+
+def _pool_context():
+    """Prefer 'fork' so workers inherit the scan state without pickling"""
+    if 'fork' in mp.get_all_start_methods():
+        return mp.get_context('fork')
+    return mp.get_context()
+
+
+def build_index_parallel(torah, words, trie, skip_range, workers, engine='trie',
+                         max_word_length=10, min_word_length=2):
+    """Build ELS index with skip values sharded across a process pool.
+
+    The Torah text and matcher (trie or numpy depth tables) are handed to
+    each worker once through the pool initializer; with the 'fork' start
+    method they are inherited copy-on-write rather than pickled. Per-skip
+    results are merged in skip order, so the index is identical to the
+    single-process builders regardless of worker count.
+    """
+    print(f"\nBuilding ELS index with {workers} workers, {engine} engine "
+          f"(skip range: {skip_range[0]} to {skip_range[1]}, min word len: {min_word_length})...")
+
+    state, word_list = _worker_state(torah, words, trie, engine, max_word_length, min_word_length)
+
+    skips = [s for s in range(skip_range[0], skip_range[1] + 1) if s != 0]
+    total_skips = len(skips)
+
+    index = defaultdict(list)
+    skip_hits = []
+    total_occs = 0
+
+    ctx = _pool_context()
+
+    import time
+    start_time = time.time()
+
+    with ctx.Pool(workers, initializer=_init_worker, initargs=(state,)) as pool:
+        # imap yields in submission order, which makes the merge deterministic
+        for i, (skip, results) in enumerate(pool.imap(_scan_skip_worker, skips)):
+            if engine == 'numpy':
+                starts, word_ids = results
+                skip_hits.append((skip, starts, word_ids))
+                total_occs += len(starts)
+            else:
+                merge_skip_results(index, skip, results)
+                total_occs += sum(len(v) for v in results.values())
+
+            if (i + 1) % 5 == 0 or i + 1 == total_skips:
+                elapsed = time.time() - start_time
+                pct = (i + 1) / total_skips * 100
+                rate = (i + 1) / elapsed if elapsed > 0 else 0
+                eta = (total_skips - i - 1) / rate if rate > 0 else 0
+                print(f"  Progress: {i+1}/{total_skips} skips ({pct:.1f}%), "
+                      f"{total_occs:,} occs, ETA: {eta/60:.1f}min", end='\r')
+                sys.stdout.flush()
+
+    print()  # Newline after progress
+
+    if engine == 'numpy':
+        return assemble_numpy_index(word_list, skip_hits)
+
+    print("  Sorting occurrences...")
+    for word in index:
+        index[word].sort(key=lambda x: (x[0], x[1]))
+
+    return dict(index)
+
+
+# Rough in-memory cost of one buffered occurrence (tuple, two ints, list slot)
+BUFFERED_OCC_BYTES = 100
+
+# Run file record: word length, occurrence count, postings length
+RUN_RECORD = struct.Struct('<HII')
+
+# Occurrences per chunk when streaming a word's merged postings to the output
+MERGE_CHUNK = 65536
+
+
+def iter_skip_results(engine, torah, words, trie, skip_range, workers,
+                      max_word_length=10, min_word_length=2):
+    """Yield (skip, {word: [start, ...]}) for every skip, in skip order.
+
+    Only one skip's results are held at a time (per worker), whichever
+    engine and worker count is used.
+    """
+    state, word_list = _worker_state(torah, words, trie, engine, max_word_length, min_word_length)
+    skips = [s for s in range(skip_range[0], skip_range[1] + 1) if s != 0]
+
+    def as_dict(results):
+        if engine != 'numpy':
+            return results
+        starts, word_ids = results
+        by_word = defaultdict(list)
+        for start, word_id in zip(starts.tolist(), word_ids.tolist()):
+            by_word[word_list[word_id]].append(start)
+        return by_word
+
+    if workers > 1:
+        with _pool_context().Pool(workers, initializer=_init_worker, initargs=(state,)) as pool:
+            for skip, results in pool.imap(_scan_skip_worker, skips):
+                yield skip, as_dict(results)
+    else:
+        _init_worker(state)
+        for skip in skips:
+            yield skip, as_dict(_scan_skip_worker(skip)[1])
+
+
+def write_run(buffer, path):
+    """Write buffered word -> [(pos, skip), ...] postings as a sorted run file"""
+    with open(path, 'wb') as f:
+        for word in sorted(buffer):
+            occurrences = sorted(buffer[word])
+            raw = word.encode('utf-8')
+            encoded = encode_postings(occurrences)
+            f.write(RUN_RECORD.pack(len(raw), len(occurrences), len(encoded)))
+            f.write(raw)
+            f.write(encoded)
+
+
+def read_run(path):
+    """Yield (word, count, postings offset, postings length) from a run file, in sorted word order"""
+    with open(path, 'rb') as f:
+        while True:
+            record = f.read(RUN_RECORD.size)
+            if not record:
+                break
+            word_len, count, postings_len = RUN_RECORD.unpack(record)
+            word = f.read(word_len).decode('utf-8')
+            offset = f.tell()
+            f.seek(postings_len, 1)
+            yield word, count, offset, postings_len
+
+
+def merge_runs(run_paths):
+    """K-way merge run files -> (word, count, chunks), in sorted word order.
+
+    chunks yields the word's occurrences from all runs, merged and sorted,
+    in lists of up to MERGE_CHUNK; each run's postings are decoded from a
+    second handle on its file as the chunks are consumed, so a word's
+    postings are never all in memory. Consume each word's chunks before
+    moving on to the next word.
+    """
+    def headers(n, path):
+        for word, count, offset, length in read_run(path):
+            yield word, n, count, offset, length
+
+    def postings(n, count, offset, length):
+        handles[n].seek(offset)
+        yield from iter_postings(handles[n], length, count)
+
+    handles = [open(path, 'rb') for path in run_paths]
+    try:
+        runs = heapq.merge(*(headers(n, path) for n, path in enumerate(run_paths)))
+        for word, group in groupby(runs, key=lambda item: item[0]):
+            group = list(group)
+            merged = heapq.merge(*(postings(n, count, offset, length)
+                                   for _, n, count, offset, length in group))
+            chunks = iter(lambda: list(islice(merged, MERGE_CHUNK)), [])
+            yield word, sum(item[2] for item in group), chunks
+    finally:
+        for handle in handles:
+            handle.close()
+
+
+def build_index_spilled(engine, torah, words, trie, skip_range, workers, output_path, output_format,
+                        metadata, memory_budget_mb, spill_dir=None,
+                        max_word_length=10, min_word_length=2, verses=None):
+    """Build and save the index with bounded memory.
+
+    Per-skip postings are buffered until the memory budget is reached, then
+    sorted and flushed to a run file. The runs are k-way merged straight
+    into the output file, each word's postings streamed in chunks of
+    MERGE_CHUNK occurrences, so peak memory depends on the budget and the
+    dictionary size, not on the skip range. Words are written in sorted
+    order. Returns (word -> occurrence count, file size in MB).
+    """
+    print(f"\nBuilding ELS index with {memory_budget_mb} MB memory budget, {engine} engine "
+          f"(skip range: {skip_range[0]} to {skip_range[1]}, min word len: {min_word_length})...")
+
+    max_buffered = max(1, memory_budget_mb * 1024 * 1024 // BUFFERED_OCC_BYTES)
+    skips_total = sum(1 for s in range(skip_range[0], skip_range[1] + 1) if s != 0)
+
+    run_dir = Path(tempfile.mkdtemp(prefix='els-runs-', dir=spill_dir))
+    run_paths = []
+    buffer = defaultdict(list)
+    buffered = 0
+    total_occs = 0
+
+    import time
+    start_time = time.time()
+
+    def flush():
+        path = run_dir / f'run-{len(run_paths):05d}.bin'
+        write_run(buffer, path)
+        run_paths.append(path)
+        buffer.clear()
+
+    try:
+        results_iter = iter_skip_results(engine, torah, words, trie, skip_range, workers,
+                                         max_word_length, min_word_length)
+        for i, (skip, results) in enumerate(results_iter):
+            merge_skip_results(buffer, skip, results)
+            found = sum(len(v) for v in results.values())
+            buffered += found
+            total_occs += found
+
+            if buffered >= max_buffered:
+                flush()
+                buffered = 0
+
+            if (i + 1) % 5 == 0 or i + 1 == skips_total:
+                elapsed = time.time() - start_time
+                pct = (i + 1) / skips_total * 100
+                rate = (i + 1) / elapsed if elapsed > 0 else 0
+                eta = (skips_total - i - 1) / rate if rate > 0 else 0
+                print(f"  Progress: {i+1}/{skips_total} skips ({pct:.1f}%), "
+                      f"{total_occs:,} occs, {len(run_paths)} runs, ETA: {eta/60:.1f}min", end='\r')
+                sys.stdout.flush()
+
+        if buffer:
+            flush()
+        print()  # Newline after progress
+
+        print(f"  Merging {len(run_paths)} runs into {output_path}...")
+        counts = {}
+        merged = merge_runs(run_paths)
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if output_format == 'binary':
+            writer = BinaryIndexWriter(output_path)
+            for word, count, chunks in merged:
+                writer.add_chunks(word, chunks)
+                counts[word] = count
+            metadata = finalize_metadata(metadata, counts)
+            writer.finish(metadata)
+        else:
+            # Stream the index object first; metadata goes last once totals are known
+            with gzip.open(output_path, 'wt', encoding='utf-8') as f:
+                f.write('{"index":{')
+                for n, (word, count, chunks) in enumerate(merged):
+                    if n:
+                        f.write(',')
+                    f.write(json.dumps(word, ensure_ascii=False))
+                    f.write(':[')
+                    for i, occurrences in enumerate(chunks):
+                        if i:
+                            f.write(',')
+                        if verses:
+                            occurrences = annotate_occurrences(word, occurrences, verses)
+                        f.write(json.dumps(occurrences, separators=(',', ':'))[1:-1])
+                    f.write(']')
+                    counts[word] = count
+                metadata = finalize_metadata(metadata, counts)
+                f.write('},"metadata":')
+                f.write(json.dumps(metadata, ensure_ascii=False, separators=(',', ':')))
+                f.write('}')
+    finally:
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+    size_mb = output_path.stat().st_size / (1024 * 1024)
+    print(f"  Saved: {size_mb:.2f} MB")
+    return counts, size_mb
+
+
 def build_index_sequential(torah, trie, skip_range, max_word_length=10):
     """Build ELS index sequentially (for debugging or small ranges)"""
     print(f"\nBuilding ELS index sequentially (skip range: {skip_range[0]} to {skip_range[1]})...")
@@ -280,9 +1103,14 @@ def build_index_sequential(torah, trie, skip_range, max_word_length=10):
 
 def compute_statistics(index):
     """Compute index statistics"""
+    return compute_count_statistics({word: len(occs) for word, occs in index.items()})
+
+
+def compute_count_statistics(counts):
+    """Compute index statistics from word -> occurrence count"""
     stats = {
-        'total_words': len(index),
-        'total_occurrences': sum(len(occs) for occs in index.values()),
+        'total_words': len(counts),
+        'total_occurrences': sum(counts.values()),
         'words_by_occurrence_count': {},
         'top_words': [],
     }
@@ -291,8 +1119,7 @@ def compute_statistics(index):
     occ_counts = defaultdict(int)
     word_occ_list = []
 
-    for word, occs in index.items():
-        count = len(occs)
+    for word, count in counts.items():
         word_occ_list.append((word, count))
 
         if count <= 10:
@@ -313,8 +1140,20 @@ def compute_statistics(index):
     return stats
 
 
-def save_index(index, output_path, metadata):
-    """Save index as compressed JSON"""
+# JSON occurrence layouts, recorded as metadata['occurrence_fields']
+OCCURRENCE_FIELDS = ['pos', 'skip']
+VERSE_OCCURRENCE_FIELDS = ['pos', 'skip', 'first_verse', 'last_verse']
+
+
+def annotate_occurrences(word, occurrences, verses):
+    """[pos, skip, first, last] per occurrence: the verse-table rows its letters span"""
+    span = verses.span
+    length = len(word)
+    return [[pos, skip, *span(pos, skip, length)] for pos, skip in occurrences]
+
+
+def save_index(index, output_path, metadata, verses=None):
+    """Save index as compressed JSON (occurrences annotated with verse spans if verses is given)"""
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -324,7 +1163,10 @@ def save_index(index, output_path, metadata):
     # word -> [[pos1, skip1], [pos2, skip2], ...]
     compact_index = {}
     for word, occurrences in index.items():
-        compact_index[word] = occurrences  # Already list of tuples
+        if verses:
+            compact_index[word] = annotate_occurrences(word, occurrences, verses)
+        else:
+            compact_index[word] = occurrences  # Already list of tuples
 
     output = {
         'metadata': metadata,
@@ -340,14 +1182,344 @@ def save_index(index, output_path, metadata):
     return size_mb
 
 
+def save_index_binary(index, output_path, metadata):
+    """Save index in the memory-mappable .elsx binary format"""
+    print(f"\nSaving binary index to {output_path}...")
+
+    size_mb = write_binary_index(index, output_path, metadata) / (1024 * 1024)
+    print(f"  Saved: {size_mb:.2f} MB")
+
+    return size_mb
+
+
+def finalize_metadata(metadata, counts):
+    """Return metadata with the word and occurrence totals filled in"""
+    return dict(metadata, total_words=len(counts), total_occurrences=sum(counts.values()))
+
+
+def index_words_path(output_path):
+    """Path of the sidecar listing the dictionary words an index was built from"""
+    name = Path(output_path).name
+    for suffix in ('.json.gz', '.elsx'):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+            break
+    return Path(output_path).with_name(name + '.words.gz')
+
+
+def dictionary_hash(words):
+    """SHA-256 of a dictionary word set (order-independent)"""
+    return hashlib.sha256('\n'.join(sorted(words)).encode('utf-8')).hexdigest()
+
+
+def save_index_words(words, output_path):
+    """Record the dictionary words an index was built from, one per line"""
+    with gzip.open(index_words_path(output_path), 'wt', encoding='utf-8') as f:
+        f.write('\n'.join(sorted(words)))
+
+
+def load_index_words(output_path, metadata, index_words):
+    """Load the dictionary word set an existing index was built from.
+
+    Falls back to the indexed words (those with occurrences) if the sidecar
+    is missing or does not match the index's dictionary_hash; that is still
+    correct, it just rescans previously scanned words that had no hits.
+    """
+    path = index_words_path(output_path)
+    if path.exists():
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            words = set(f.read().split('\n')) - {''}
+        if dictionary_hash(words) == metadata.get('dictionary_hash'):
+            return words
+        print(f"  WARNING: {path} does not match the index, using indexed words only")
+    else:
+        print(f"  WARNING: {path} not found, using indexed words only")
+    return set(index_words)
+
+
+def incremental_mismatch(metadata, torah_hash, skip_range, max_word_length, min_word_length,
+                         expected_hits=None):
+    """Return why an existing index cannot be updated incrementally, or None"""
+    if metadata.get('torah_hash') != torah_hash:
+        return "Torah text hash differs"
+    if metadata.get('skip_range') != list(skip_range):
+        return f"skip range differs ({metadata.get('skip_range')} vs {list(skip_range)})"
+    if metadata.get('adaptive_expected_hits') != expected_hits:
+        return "adaptive skip setting differs"
+    if metadata.get('max_word_length') != max_word_length:
+        return "max word length differs"
+    if metadata.get('min_word_length') != min_word_length:
+        return "min word length differs (or not recorded)"
+    return None
+
+
+def load_existing_index(output_path, binary):
+    """Load an existing index for incremental update -> (metadata, index, reader)
+
+    For .elsx files the index maps words to their row in the (still open)
+    reader, so unchanged postings can be copied without decoding.
+    """
+    if binary:
+        reader = ElsIndexReader(output_path)
+        return reader.metadata, {word: i for i, word in enumerate(reader.words())}, reader
+
+    with gzip.open(output_path, 'rt', encoding='utf-8') as f:
+        data = json.load(f)
+    index = data['index']
+    fields = data['metadata'].get('occurrence_fields')
+    if fields is None and data['metadata'].get('verse_table'):
+        fields = VERSE_OCCURRENCE_FIELDS  # Written before the layout was recorded
+    if fields and len(fields) > len(OCCURRENCE_FIELDS):
+        # Verse spans are added again on save
+        index = {word: [occ[:2] for occ in occurrences] for word, occurrences in index.items()}
+    return data['metadata'], index, None
+
+
+def build_matcher(engine, words):
+    """Build the trie the chosen engine walks (None for numpy, which builds its own tables)"""
+    if engine == 'trie':
+        return build_trie(words)
+    if engine == 'flat':
+        return build_flat_trie(words)
+    return None
+
+
+def run_engine(engine, torah, words, skip_range, workers, max_word_length, min_word_length):
+    """Build the matcher for the chosen engine and scan all skips"""
+    trie = build_matcher(engine, words)
+
+    if workers > 1:
+        index = build_index_parallel(torah, words, trie, skip_range, workers, engine,
+                                     max_word_length, min_word_length)
+    elif engine == 'numpy':
+        index = build_index_numpy(torah, words, skip_range, max_word_length, min_word_length)
+    else:
+        # Use optimized single-process approach (more memory efficient)
+        index = build_index_optimized(torah, trie, skip_range, max_word_length, min_word_length)
+
+    if isinstance(trie, FlatTrie):
+        trie.close(unlink=True)
+
+    return index
+
+
+def cache_bounds(skip_range):
+    """Hit-cache (min |skip|, max |skip|) for a symmetric skip range, else None"""
+    if skip_range[0] != -skip_range[1] or skip_range[1] < 1:
+        return None
+    return 1, skip_range[1]
+
+
+def order_like_scan(occurrences):
+    """Key words in the order a full scan discovers them.
+
+    Skips are scanned in ascending order and starts within a skip in
+    ascending order; at the same (skip, start), shorter words (prefixes)
+    are found first. Each word's occurrences are sorted by (position, skip).
+    """
+    def discovery(word):
+        return min((skip, pos) for pos, skip in occurrences[word]), len(word)
+
+    return {word: sorted(occurrences[word]) for word in sorted(occurrences, key=discovery)}
+
+
+def skip_bands(max_skip):
+    """|skip| bands 1, 2-3, 4-7, ... covering 1..max_skip"""
+    bands = []
+    lo = 1
+    while lo <= max_skip:
+        bands.append((lo, min(2 * lo - 1, max_skip)))
+        lo *= 2
+    return bands
+
+
+def run_engine_adaptive(engine, torah, words, limits, workers, max_word_length, min_word_length):
+    """Scan each word only up to its own |skip| limit (limits: word -> D(w)).
+
+    Skips are scanned in doubling bands; each band's matcher holds only
+    the words whose limit reaches the band, so short, common words drop
+    out after the first few skips. Hits past a word's limit inside its
+    last band are discarded. Keys are ordered as by a full scan.
+    """
+    candidates = [w for w in words if min_word_length <= len(w) <= max_word_length]
+    occurrences = defaultdict(list)
+
+    for lo, hi in skip_bands(max((limits[w] for w in candidates), default=0)):
+        band_words = {w for w in candidates if limits[w] >= lo}
+        print(f"\nSkip band ±{lo}..{hi}: {len(band_words):,} words")
+        for side in ((-hi, -lo), (lo, hi)):
+            index = run_engine(engine, torah, band_words, side, workers, max_word_length, min_word_length)
+            for word, found in index.items():
+                if limits[word] < hi:
+                    found = [(p, s) for p, s in found if abs(s) <= limits[word]]
+                occurrences[word].extend(found)
+
+    return order_like_scan({word: occ for word, occ in occurrences.items() if occ})
+
+
+def run_engine_cached(engine, torah, words, skip_range, workers, max_word_length, min_word_length,
+                      hit_cache, limits=None):
+    """run_engine, taking words' occurrences from the hit cache and scanning only the misses.
+
+    Every scanned word is added to the cache, including words with no
+    occurrences. The index is identical to run_engine's. With limits
+    (word -> D(w)), words are scanned by run_engine_adaptive and cached
+    under their own bounds (1, D(w)).
+    """
+    def scan(scan_words):
+        if limits:
+            return run_engine_adaptive(engine, torah, scan_words, limits, workers,
+                                       max_word_length, min_word_length)
+        return run_engine(engine, torah, scan_words, skip_range, workers, max_word_length, min_word_length)
+
+    bounds = cache_bounds(skip_range)
+    if hit_cache is None or bounds is None:
+        return scan(words)
+
+    def word_bounds(word):
+        return (1, limits[word]) if limits else bounds
+
+    candidates = [w for w in words if min_word_length <= len(w) <= max_word_length]
+    occurrences = {}
+    missing = set()
+    for word in candidates:
+        found = hit_cache.get(word, *word_bounds(word))
+        if found is None:
+            missing.add(word)
+        elif found:
+            occurrences[word] = found
+    print(f"\nELS hit cache: {len(candidates) - len(missing):,}/{len(candidates):,} words cached "
+          f"({hit_cache.path})")
+
+    if not missing:
+        return order_like_scan(occurrences)
+
+    index = scan(missing)
+    for word in missing:
+        hit_cache.put(word, *word_bounds(word), index.get(word, []))
+    print(f"  Adding {len(missing):,} words to the ELS hit cache...")
+    hit_cache.flush()
+
+    if not occurrences:
+        return index
+    occurrences.update(index)
+    return order_like_scan(occurrences)
+
+
+def build_index_incremental(args, torah, words, torah_hash, skip_range, workers, hit_cache=None,
+                            limits=None):
+    """Update an existing index in place of a full rebuild.
+
+    Only words added to the dictionary are scanned; removed words are
+    dropped; every other word keeps its existing postings (copied verbatim
+    for .elsx). Returns the updated index, or None if a full rebuild is
+    required.
+    """
+    output_path = Path(args.output)
+    if not output_path.exists():
+        print(f"\nNo existing index at {output_path}, doing a full build")
+        return None
+
+    print(f"\nLoading existing index from {output_path}...")
+    metadata, old_index, reader = load_existing_index(output_path, args.format == 'binary')
+
+    reason = incremental_mismatch(metadata, torah_hash, skip_range,
+                                  args.max_word_length, args.min_word_length,
+                                  args.expected_hits if limits else None)
+    if reason:
+        print(f"  Cannot update incrementally: {reason}; doing a full build")
+        if reader:
+            reader.close()
+        return None
+
+    old_words = load_index_words(output_path, metadata, old_index)
+    added = words - old_words
+    removed = old_words - words
+    print(f"  Dictionary diff: +{len(added):,} words, -{len(removed):,} words")
+
+    index = {}
+    for word, value in old_index.items():
+        if word not in removed:
+            index[word] = reader.encoded_postings(value) if reader else value
+    if reader:
+        reader.close()
+
+    if added:
+        index.update(run_engine_cached(args.engine, torah, added, skip_range, workers,
+                                       args.max_word_length, args.min_word_length, hit_cache, limits))
+
+    return index
+
+
+def load_verse_table(path, text_path, text):
+    """The verse offset table for text, or None if there is none.
+
+    An explicit path must exist and match the text; the default
+    (<name>-verses.cols beside the text, torahNoSpaces.txt -> torah-verses.cols)
+    is optional.
+    """
+    explicit = path is not None
+    if not explicit:
+        path = text_path.with_name(text_path.stem.replace('NoSpaces', '') + '-verses.cols')
+    path = Path(path)
+    if not path.exists():
+        if explicit:
+            print(f"Error: verse table {path} not found")
+            sys.exit(1)
+        print(f"\n  WARNING: no verse table at {path}; occurrences are stored as [pos, skip] "
+              f"without verse spans (run tools/build-verse-index.py to create it)")
+        return None
+
+    try:
+        verses = VerseOffsets.load_for_text(path, text)
+    except ValueError as e:
+        if explicit:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"\n  WARNING: {e}; occurrences are stored as [pos, skip] without verse spans")
+        return None
+    print(f"\nVerse spans from {path} ({len(verses):,} verses)")
+    return verses
+
+
 def main():
     parser = argparse.ArgumentParser(description='Build Torah ELS Index')
     parser.add_argument('--skip-range', type=int, default=100,
                         help='Skip range (will use -N to +N)')
+    parser.add_argument('--text', type=str, default='data/torahNoSpaces.txt',
+                        help='Letter text to index (default: the Torah; data/tanakhNoSpaces.txt for the Tanakh)')
+    parser.add_argument('--verses', type=str, default=None,
+                        help='Verse offset table of --text for annotating hits '
+                             '(default: <text>-verses.cols next to it, e.g. data/torah-verses.cols)')
+    parser.add_argument('--no-verses', action='store_true',
+                        help='Store plain [pos, skip] occurrences without verse spans')
     parser.add_argument('--output', type=str, default='data/els-index/els-index.json.gz',
                         help='Output file path')
+    parser.add_argument('--format', choices=['json', 'binary'], default='json',
+                        help='Output format: gzipped JSON, or binary .elsx with mmap-able postings')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Update the existing --output index: scan only words added to the dictionary')
+    parser.add_argument('--memory-budget', type=int, default=0,
+                        help='Spill sorted postings runs to disk past this many MB and k-way merge '
+                             'them into the output (0 = keep everything in memory)')
+    parser.add_argument('--spill-dir', type=str, default=None,
+                        help='Directory for spill run files (default: system temp dir)')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                        help='ELS hit cache directory (default: data/els-cache)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not read or write the ELS hit cache (the --memory-budget build never uses it)')
+    parser.add_argument('--adaptive-skip', action='store_true',
+                        help='Index each word only up to its expected-count skip bound D(w), '
+                             'with --skip-range as the cap')
+    parser.add_argument('--expected-hits', type=float, default=10,
+                        help='Expected ELS count that sets D(w) with --adaptive-skip (default: 10)')
     parser.add_argument('--sequential', action='store_true',
                         help='Use sequential processing (slower, for debugging)')
+    parser.add_argument('--engine', choices=['trie', 'flat', 'numpy'], default='trie',
+                        help='Scan engine: per-letter trie walk, flat shared-memory trie walk, '
+                             'or vectorized numpy (requires numpy)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes; skip values are sharded across them (0 = all CPU cores)')
     parser.add_argument('--max-word-length', type=int, default=10,
                         help='Maximum word length to search')
     parser.add_argument('--min-word-length', type=int, default=2,
@@ -360,7 +1532,7 @@ def main():
     print("=" * 70)
 
     # Paths
-    torah_path = Path('data/torahNoSpaces.txt')
+    torah_path = Path(args.text)
     dict_paths = [
         Path('data/dictionaries/unified/hebrew-unified.json.gz'),
     ]
@@ -368,19 +1540,85 @@ def main():
     # Load data
     torah = load_torah_text(torah_path)
     words = load_dictionary(dict_paths)
-    trie = build_trie(words)
+    workers = args.workers if args.workers > 0 else mp.cpu_count()
 
     # Compute Torah hash for verification
     torah_hash = hashlib.sha256(torah.encode('utf-8')).hexdigest()
 
     # Build index
     skip_range = (-args.skip_range, args.skip_range)
+    if args.format == 'binary' and args.output.endswith('.json.gz'):
+        args.output = args.output[:-len('.json.gz')] + '.elsx'
 
-    # Use optimized single-process approach (more memory efficient)
-    index = build_index_optimized(torah, trie, skip_range, args.max_word_length, args.min_word_length)
+    metadata = {
+        'version': '1.0',
+        'created': datetime.now().isoformat(),
+        'text': torah_path.name,
+        'torah_length': len(torah),
+        'torah_hash': torah_hash,
+        'skip_range': list(skip_range),
+        'dictionary_size': len(words),
+        'dictionary_hash': dictionary_hash(words),
+        'max_word_length': args.max_word_length,
+        'min_word_length': args.min_word_length,
+    }
 
-    # Statistics
-    stats = compute_statistics(index)
+    # Per-word skip bounds D(w) from the text's letter frequencies
+    limits = None
+    if args.adaptive_skip:
+        if args.memory_budget > 0:
+            print("Error: --adaptive-skip cannot be combined with --memory-budget")
+            sys.exit(1)
+        limits = LetterStats.from_text(torah).adaptive_limits(words, args.expected_hits, args.skip_range)
+        metadata['adaptive_expected_hits'] = args.expected_hits
+        print(f"\nAdaptive skip: D(w) for {args.expected_hits:g} expected hits, capped at {args.skip_range}")
+        print(f"  Skips per word: {sum(limits.values()) / max(len(limits), 1):.1f} on average "
+              f"(vs {args.skip_range} fixed), {sum(1 for d in limits.values() if d == args.skip_range):,} "
+              f"words at the cap")
+
+    verses = None
+    if not args.no_verses and args.format == 'json':
+        verses = load_verse_table(args.verses, torah_path, torah)
+        if verses:
+            metadata['verse_table'] = Path(verses.path).name
+    elif args.verses and args.format == 'binary':
+        print("  Note: .elsx postings hold (position, skip) only; get verse spans with VerseOffsets.span")
+    if args.format == 'json':
+        metadata['occurrence_fields'] = VERSE_OCCURRENCE_FIELDS if verses else OCCURRENCE_FIELDS
+
+    hit_cache = None if args.no_cache else ElsHitCache(torah, args.cache_dir)
+
+    index = None
+    if args.incremental:
+        index = build_index_incremental(args, torah, words, torah_hash, skip_range, workers, hit_cache,
+                                        limits)
+
+    if index is None and args.memory_budget > 0:
+        # Spill-to-disk build writes the output file itself
+        trie = build_matcher(args.engine, words)
+        counts, size_mb = build_index_spilled(
+            args.engine, torah, words, trie, skip_range, workers, args.output, args.format,
+            metadata, args.memory_budget, args.spill_dir, args.max_word_length, args.min_word_length,
+            verses)
+        if isinstance(trie, FlatTrie):
+            trie.close(unlink=True)
+        stats = compute_count_statistics(counts)
+    else:
+        if index is None:
+            index = run_engine_cached(args.engine, torah, words, skip_range, workers,
+                                      args.max_word_length, args.min_word_length, hit_cache, limits)
+        stats = compute_statistics(index)
+        metadata = finalize_metadata(metadata, {w: len(o) for w, o in index.items()})
+
+        if args.format == 'binary':
+            size_mb = save_index_binary(index, args.output, metadata)
+        else:
+            size_mb = save_index(index, args.output, metadata, verses)
+    save_index_words(words, args.output)
+    if verses:
+        verses.close()
+    if hit_cache:
+        hit_cache.close()
 
     print(f"\n{'=' * 70}")
     print("Index Statistics:")
@@ -393,25 +1631,10 @@ def main():
     for word, count in stats['top_words'][:10]:
         print(f"    {word}: {count:,}")
 
-    # Metadata
-    metadata = {
-        'version': '1.0',
-        'created': datetime.now().isoformat(),
-        'torah_length': len(torah),
-        'torah_hash': torah_hash,
-        'skip_range': list(skip_range),
-        'dictionary_size': len(words),
-        'max_word_length': args.max_word_length,
-        'total_words': stats['total_words'],
-        'total_occurrences': stats['total_occurrences'],
-    }
-
-    # Save
-    size_mb = save_index(index, args.output, metadata)
-
     print(f"\n{'=' * 70}")
     print(f"Done! Index saved to {args.output}")
-    print(f"  Skip range: {skip_range[0]} to {skip_range[1]}")
+    print(f"  Skip range: {skip_range[0]} to {skip_range[1]}"
+          f"{' (per-word D(w))' if limits else ''}")
     print(f"  Words indexed: {stats['total_words']:,}")
     print(f"  Total occurrences: {stats['total_occurrences']:,}")
     print(f"  File size: {size_mb:.2f} MB")
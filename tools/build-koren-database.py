@@ -6,7 +6,8 @@ Converts the Rips/Koren Torah text from ASCII transliteration to Hebrew Unicode
 with proper final letter forms (ך ם ן ף ץ).
 
 Source: text_koren_*.txt files (exact text used by Rips et al., 1994)
-Output: Character database and Torah text for ELS search
+Output: Character database (JSON and columnar .cols), Torah text for ELS search
+        and its verse offset table (torah-verses.cols, see verse_offsets.py)
 
 Verification:
 - Total letters: 304,805 (matches Rips)
@@ -20,6 +21,9 @@ import re
 import os
 import hashlib
 
+from char_columns import write_char_columns
+from verse_offsets import VerseOffsets, verse_rows
+
 # ASCII to Hebrew transliteration mapping - Regular forms
 TRANS_TO_HEBREW = {
     ')': 'א', 'B': 'ב', 'G': 'ג', 'D': 'ד', 'H': 'ה',
@@ -177,6 +181,7 @@ def main():
     global_id = 0
     full_text = ''
     all_valid = True
+    rows = []
 
     for book_num, filename, book_name, expected_count in BOOKS:
         filepath = os.path.join(texts_dir, filename)
@@ -207,6 +212,11 @@ def main():
             json.dump(chars, f, ensure_ascii=False)
         print(f"  Saved: {output_path}")
 
+        cols_path = os.path.join(data_dir, f'{book_name}-chars.cols')
+        write_char_columns(chars, cols_path, {'book': book_name, 'source': 'koren'})
+        print(f"  Saved: {cols_path}")
+
+        rows.extend(verse_rows((c['id'], c['book'], c['chapter'], c['verse']) for c in chars))
         global_id = new_global_id
 
     # Save full Torah text (no spaces)
@@ -214,6 +224,11 @@ def main():
     with open(torah_path, 'w', encoding='utf-8') as f:
         f.write(full_text)
 
+    # Verse offsets for mapping ELS positions to references
+    verses_path = os.path.join(data_dir, 'torah-verses.cols')
+    VerseOffsets.from_text_rows(rows, full_text, 'torahNoSpaces.txt', source='koren',
+                                books={n: name for n, _, name, _ in BOOKS}).save(verses_path)
+
     # Calculate hash
     sha256 = hashlib.sha256(full_text.encode('utf-8')).hexdigest()
 
@@ -232,6 +247,7 @@ def main():
     print(f"Expected:       בראשיתבראאלהיםאתהשמיםואתהארץ")
     print(f"Match: {'✓' if full_text[:28] == 'בראשיתבראאלהיםאתהשמיםואתהארץ' else '✗'}")
     print(f"\nSaved: {torah_path}")
+    print(f"Saved: {verses_path}")
     print("=" * 60)
 
     return all_valid and len(full_text) == 304805
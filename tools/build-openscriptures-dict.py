@@ -14,9 +14,10 @@ import gzip
 import xml.etree.ElementTree as ET
 from pathlib import Path
 from collections import defaultdict
-import re
 import sys
 
+from hebrew_normalize import letters_only
+
 
 def parse_bdb_lexicon(xml_path):
     """Parse Brown-Driver-Briggs XML lexicon"""
@@ -121,19 +122,9 @@ def clean_hebrew(text):
     if not text:
         return ''
 
-    # Remove niqqud (combining marks U+0591-U+05C7)
-    text = re.sub(r'[\u0591-\u05C7]', '', text)
-
-    # Remove special BDB markers
-    text = text.replace('֫', '')  # meteg
-    text = text.replace('֑', '')  # etnahta
-    text = text.replace('׳', '')  # geresh
-    text = text.replace('׃', '')  # sof pasuq
-
-    # Keep only Hebrew letters
-    text = re.sub(r'[^\u05D0-\u05EA]', '', text)
-
-    return text.strip()
+    # Remove niqqud and special BDB markers (meteg, etnahta, geresh, sof
+    # pasuq), keep only Hebrew letters
+    return letters_only(text)
 
 
 def normalize_pos(pos):
@@ -20,6 +20,8 @@ import re
 from pathlib import Path
 from collections import defaultdict
 
+from hebrew_normalize import strip_niqqud
+
 
 # Hebrew letters for validation
 HEBREW_LETTERS = set('אבגדהוזחטיכלמנסעפצקרשתךםןףץ')
@@ -30,7 +32,7 @@ def is_hebrew_word(word):
     if not word:
         return False
     # Remove niqqud and other marks
-    clean = re.sub(r'[\u0591-\u05C7]', '', word)
+    clean = strip_niqqud(word)
     hebrew_count = sum(1 for c in clean if c in HEBREW_LETTERS)
     return hebrew_count > 0 and hebrew_count >= len(clean) * 0.5
 
@@ -59,7 +61,7 @@ def remove_niqqud(word):
     """Remove niqqud from Hebrew word"""
     if not word:
         return ''
-    return re.sub(r'[\u0591-\u05C7]', '', word)
+    return strip_niqqud(word)
 
 
 def classify_pos(entry):
@@ -13,14 +13,48 @@ Features:
 - Era classification
 - Inflection mapping
 
+Sources are decoded in worker processes (--jobs) and streamed into the
+merge in batches; the merge still applies them in priority order, so the
+output is the same as a serial run. Each raw source is released as soon
+as it has been streamed, instead of all of them being held until the
+merge ends.
+
+The inflection map is built from a root index (each root's words, and the
+same words pre-sorted by length as lemma candidates), normalizing each
+word and root once. Only roots whose ordered word lists differ from the
+previously saved dictionary are recomputed; the rest keep their saved
+mappings (the map records a digest of the root index it was built from,
+and a mismatch falls back to recomputing every root, as does --full).
+--inflections-only rebuilds just the map from the saved unified
+dictionary without re-merging the sources.
+
+Alongside the JSON, the dictionary is written as hebrew-unified.dictx
+(see dict_binary.py): front-coded sorted words, a string pool and
+fixed-width records, memory-mapped and binary-searched by readers that
+need one entry or only the word list.
+
+Usage:
+    python3 tools/build-unified-dict.py
+    python3 tools/build-unified-dict.py --jobs 0
+    python3 tools/build-unified-dict.py --inflections-only
+    python3 tools/build-unified-dict.py --inflections-only --previous-dict old/hebrew-unified.json.gz
+    python3 tools/build-unified-dict.py --full
+
 Output: Unified dictionary for offline PWA use
 """
 
+import argparse
 import json
 import gzip
+import hashlib
+import multiprocessing as mp
+from queue import Empty
+import sys
 from pathlib import Path
 from collections import defaultdict
-import re
+
+from dict_binary import write_binary_dictionary
+from hebrew_normalize import normalize_word
 
 
 # Source priorities (lower = better)
@@ -35,22 +69,11 @@ SOURCE_PRIORITY = {
 # Hebrew letters for validation
 HEBREW_LETTERS = set('אבגדהוזחטיכלמנסעפצקרשתךםןףץ')
 
-# Final letter mapping
-FINAL_TO_REGULAR = {'ך': 'כ', 'ם': 'מ', 'ן': 'נ', 'ף': 'פ', 'ץ': 'צ'}
-
-
-def normalize_word(word):
-    """Normalize Hebrew word for deduplication"""
-    if not word:
-        return ''
-
-    # Remove niqqud
-    word = re.sub(r'[\u0591-\u05C7]', '', word)
+# Source entry fields read by update_entry; only these are streamed to the merge
+MERGE_FIELDS = ('root', 'pos', 'binyan', 'definitions', 'era', 'refs', 'related')
 
-    # Convert final letters
-    normalized = ''.join(FINAL_TO_REGULAR.get(c, c) for c in word)
-
-    return normalized
+# Entries per batch streamed from a source to the merge
+BATCH_SIZE = 5000
 
 
 def load_source(source_name, file_path):
@@ -70,8 +93,100 @@ def load_source(source_name, file_path):
     return entries
 
 
+def iter_source_batches(source_name, file_path, batch_size=BATCH_SIZE):
+    """Decode a source and yield it as batches of (word, normalized, fields).
+
+    Words that normalize to nothing are dropped and only MERGE_FIELDS are
+    kept, so batches are small to pass between processes. The raw source
+    is released once the last batch has been taken.
+    """
+    entries = load_source(source_name, file_path)
+    batch = []
+    for word, entry in entries.items():
+        # Normalize for deduplication
+        normalized = normalize_word(word)
+        if not normalized:
+            continue
+        batch.append((word, normalized, {k: entry[k] for k in MERGE_FIELDS if k in entry}))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    del entries
+    if batch:
+        yield batch
+
+
+def _stream_source(source_name, file_path, queue):
+    """Worker: put a source's batches on queue, then None (or an error message if decoding fails)"""
+    end = None
+    try:
+        for batch in iter_source_batches(source_name, file_path):
+            queue.put(batch)
+    except BaseException as e:
+        end = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        # Always end the stream, or the merge would wait on it forever
+        queue.put(end)
+
+
+def stream_sources(source_files, jobs):
+    """{ source: iterator of batches } for the sources present, decoded by up to jobs processes.
+
+    With jobs > 1 each source is decoded in its own process, up to jobs at
+    a time in priority order; the merge drains them in that order, so
+    lower-priority sources decode while higher-priority ones are merged.
+    """
+    present = {}
+    for name, path in source_files.items():
+        if path.exists():
+            present[name] = path
+        else:
+            print(f"  WARNING: {path} not found, skipping")
+
+    if jobs <= 1 or len(present) <= 1:
+        return {name: iter_source_batches(name, path) for name, path in present.items()}
+
+    ctx = mp.get_context('fork') if 'fork' in mp.get_all_start_methods() else mp.get_context()
+    order = sorted(present, key=lambda name: SOURCE_PRIORITY.get(name, 999))
+    queues = {name: ctx.Queue() for name in order}
+    workers = {name: ctx.Process(target=_stream_source, args=(name, present[name], queues[name]), daemon=True)
+               for name in order}
+
+    def drain(name):
+        # Keep jobs workers running: start the next waiting one when one finishes
+        for waiting in order[order.index(name):][:jobs]:
+            if workers[waiting].pid is None:
+                workers[waiting].start()
+        while True:
+            try:
+                batch = queues[name].get(timeout=1)
+            except Empty:
+                # A worker killed outright (e.g. by a signal) never ends its stream
+                if not workers[name].is_alive():
+                    raise RuntimeError(f"Decoding {name} failed (exit code {workers[name].exitcode})")
+                continue
+            if batch is None:
+                break
+            if isinstance(batch, str):
+                workers[name].join()
+                raise RuntimeError(f"Decoding {name} failed: {batch}")
+            yield batch
+        workers[name].join()
+        if workers[name].exitcode:
+            raise RuntimeError(f"Decoding {name} failed (exit code {workers[name].exitcode})")
+
+    for name in order[:jobs]:
+        workers[name].start()
+    return {name: drain(name) for name in order}
+
+
 def merge_entries(sources):
-    """Merge entries from all sources"""
+    """Merge entries from all sources.
+
+    sources maps a source name to an iterable of (word, normalized, fields)
+    batches (see iter_source_batches); they are merged in priority order.
+    """
     unified = {}
     stats = defaultdict(int)
 
@@ -80,44 +195,45 @@ def merge_entries(sources):
         if source_name not in sources:
             continue
 
-        entries = sources[source_name]
-        print(f"  Merging {source_name} ({len(entries)} entries)...")
+        merged = 0
+        for batch in sources[source_name]:
+            merged += len(batch)
+            merge_batch(unified, stats, source_name, batch)
+        print(f"  Merged {source_name} ({merged} entries)")
 
-        for word, entry in entries.items():
-            # Normalize for deduplication
-            normalized = normalize_word(word)
-            if not normalized:
-                continue
+    return unified, stats
 
-            # Use original word as key (preserves finals)
-            key = word
-
-            if key not in unified:
-                # New entry
-                unified[key] = {
-                    'word': word,
-                    'normalized': normalized,
-                    'sources': [source_name],
-                    'root': None,
-                    'rootSource': None,
-                    'pos': None,
-                    'binyan': None,
-                    'definitions': [],
-                    'era': None,
-                    'refs': [],
-                    'related': [],
-                    'variants': [],
-                }
-                stats['new_entries'] += 1
-            else:
-                # Merge with existing
-                unified[key]['sources'].append(source_name)
-                stats['merged_entries'] += 1
-
-            # Update fields from this source
-            update_entry(unified[key], entry, source_name)
 
-    return unified, stats
+def merge_batch(unified, stats, source_name, batch):
+    """Merge one batch of a source's (word, normalized, fields) into unified"""
+    for word, normalized, entry in batch:
+        # Use original word as key (preserves finals)
+        key = word
+
+        if key not in unified:
+            # New entry
+            unified[key] = {
+                'word': word,
+                'normalized': normalized,
+                'sources': [source_name],
+                'root': None,
+                'rootSource': None,
+                'pos': None,
+                'binyan': None,
+                'definitions': [],
+                'era': None,
+                'refs': [],
+                'related': [],
+                'variants': [],
+            }
+            stats['new_entries'] += 1
+        else:
+            # Merge with existing
+            unified[key]['sources'].append(source_name)
+            stats['merged_entries'] += 1
+
+        # Update fields from this source
+        update_entry(unified[key], entry, source_name)
 
 
 def update_entry(unified_entry, source_entry, source_name):
@@ -201,44 +317,100 @@ def is_foreign_word(word):
     return hebrew_count < len(word) * 0.5
 
 
-def build_inflection_map(unified):
-    """Build mapping from inflected forms to lemmas"""
-    print("  Building inflection map...")
+def index_roots(entries):
+    """Group dictionary words by root: { root: (words, words_by_length) }.
 
-    inflection_map = {}
+    Only roots with two or more words (the ones that have inflections) are
+    kept. words are in dictionary order and roots in order of their first
+    word; words_by_length is the same list stably sorted by length, the
+    order in which lemma candidates are tried.
+    """
     roots_to_words = defaultdict(list)
-
-    # Group words by root
-    for word, entry in unified.items():
+    for word, entry in entries.items():
         root = entry.get('root')
         if root:
             roots_to_words[root].append(word)
+    return {root: (words, sorted(words, key=len))
+            for root, words in roots_to_words.items() if len(words) > 1}
 
-    # For each root, identify potential lemma and inflections
-    for root, words in roots_to_words.items():
-        if len(words) < 2:
-            continue
 
-        # Simple heuristic: shortest word with same letters as root is likely lemma
-        lemma = None
-        for word in sorted(words, key=len):
-            normalized = normalize_word(word)
-            if normalized == normalize_word(root) or len(normalized) == 3:
-                lemma = word
-                break
+def root_inflections(root, words, words_by_length):
+    """{ inflected word: { 'lemma', 'root' } } for the words of one root.
+
+    Heuristic: the lemma is the shortest word with the same letters as the
+    root, or with three letters; failing that, the root's first word.
+    Candidates are normalized only until the lemma is found.
+    """
+    root_normalized = normalize_word(root)
+    lemma = words[0]
+    for word in words_by_length:
+        word_normalized = normalize_word(word)
+        if word_normalized == root_normalized or len(word_normalized) == 3:
+            lemma = word
+            break
+
+    return {word: {'lemma': lemma, 'root': root} for word in words if word != lemma}
+
+
+def roots_digest(index):
+    """SHA-256 of a root index's roots and their ordered words (what the map is computed from)"""
+    data = json.dumps([[root, words] for root, (words, _) in index.items()], ensure_ascii=False)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
 
-        if not lemma:
-            lemma = words[0]
 
-        # Map inflections to lemma
-        for word in words:
-            if word != lemma:
-                inflection_map[word] = {
-                    'lemma': lemma,
-                    'root': root,
-                }
+def group_inflections(inflection_map):
+    """{ root: { word: mapping } } from an existing inflection map"""
+    groups = defaultdict(dict)
+    for word, mapping in inflection_map.items():
+        groups[mapping['root']][word] = mapping
+    return groups
 
-    return inflection_map
+
+def build_inflection_map(entries, previous=None):
+    """Build mapping from inflected forms to lemmas.
+
+    Returns (inflection map, roots digest). Each word belongs to one root
+    and each root is processed once, so every word and root is normalized
+    at most once here; normalizations from the merge are not relied on
+    (the LRU cache is smaller than the sources, and with --jobs the merge
+    normalizes in worker processes).
+
+    previous is (old entries, old map, old roots digest): the dictionary an
+    existing map was built from. A root's mappings depend only on the root
+    and its ordered word list, so roots whose list is unchanged keep their
+    old mappings and only the others are recomputed. If the old map was not
+    built from the old entries (digest mismatch), every root is recomputed.
+    """
+    print("  Building inflection map...")
+
+    index = index_roots(entries)
+    digest = roots_digest(index)
+
+    old_index = {}
+    old_groups = {}
+    if previous is not None:
+        old_entries, old_map, old_digest = previous
+        old_index = index_roots(old_entries)
+        if roots_digest(old_index) == old_digest:
+            old_groups = group_inflections(old_map)
+        else:
+            print("    Existing map does not match the saved dictionary; rebuilding every root")
+            old_index = {}
+
+    inflection_map = {}
+    rebuilt = 0
+    for root, (words, words_by_length) in index.items():
+        old = old_index.get(root)
+        if old is not None and old[0] == words:
+            inflection_map.update(old_groups.get(root, {}))
+        else:
+            inflection_map.update(root_inflections(root, words, words_by_length))
+            rebuilt += 1
+
+    if old_index:
+        print(f"    Rebuilt {rebuilt} roots, kept {len(index) - rebuilt} unchanged")
+
+    return inflection_map, digest
 
 
 def clean_for_output(unified):
@@ -273,7 +445,7 @@ def clean_for_output(unified):
     return output
 
 
-def save_dictionary(dictionary, inflection_map, output_dir):
+def save_dictionary(dictionary, inflection_map, roots_sha256, output_dir):
     """Save unified dictionary and inflection map"""
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -300,13 +472,29 @@ def save_dictionary(dictionary, inflection_map, output_dir):
     dict_size = dict_path.stat().st_size / 1024
     print(f"    Saved {len(dictionary)} entries ({dict_size:.1f} KB)")
 
-    # Save inflection map
+    # Binary copy for consumers that look up words without parsing the JSON
+    binary_path = output_dir / 'hebrew-unified.dictx'
+    print(f"  Saving binary dictionary to {binary_path}...")
+    binary_size = write_binary_dictionary(
+        dictionary, binary_path, {'source': dict_output['source'], 'version': dict_output['version']},
+        source_names=sorted(SOURCE_PRIORITY, key=SOURCE_PRIORITY.get)) / 1024
+    print(f"    Saved {len(dictionary)} entries ({binary_size:.1f} KB)")
+
+    return dict_size, save_inflection_map(inflection_map, roots_sha256, output_dir)
+
+
+def save_inflection_map(inflection_map, roots_sha256, output_dir):
+    """Save inflection map, with the digest of the root index it was built from"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
     inflect_path = output_dir / 'inflection-map.json.gz'
     print(f"  Saving inflection map to {inflect_path}...")
 
     inflect_output = {
         'source': 'unified-dictionary',
         'version': '1.0',
+        'rootsSha256': roots_sha256,
         'mappings': inflection_map,
     }
 
@@ -316,7 +504,55 @@ def save_dictionary(dictionary, inflection_map, output_dir):
     inflect_size = inflect_path.stat().st_size / 1024
     print(f"    Saved {len(inflection_map)} mappings ({inflect_size:.1f} KB)")
 
-    return dict_size, inflect_size
+    return inflect_size
+
+
+def load_saved(output_dir):
+    """(entries, mappings, roots digest) of the saved dictionary and map; missing parts are None"""
+    output_dir = Path(output_dir)
+    dict_path = output_dir / 'hebrew-unified.json.gz'
+    inflect_path = output_dir / 'inflection-map.json.gz'
+
+    entries = None
+    if dict_path.exists():
+        print(f"  Loading {dict_path}...")
+        with gzip.open(dict_path, 'rt', encoding='utf-8') as f:
+            entries = json.load(f)['entries']
+
+    mappings = digest = None
+    if inflect_path.exists():
+        with gzip.open(inflect_path, 'rt', encoding='utf-8') as f:
+            saved = json.load(f)
+        mappings, digest = saved['mappings'], saved.get('rootsSha256')
+        print(f"  Loaded {len(mappings)} existing mappings from {inflect_path}")
+
+    return entries, mappings, digest
+
+
+def rebuild_inflections(output_dir, previous_dict=None, full=False):
+    """Rebuild only the inflection map from the saved unified dictionary.
+
+    The saved map is kept as is if it was built from the saved dictionary.
+    With previous_dict, the dictionary the saved map was built from (e.g.
+    a copy from before a manual edit), only roots that differ are
+    recomputed; otherwise every root is. full recomputes every root.
+    """
+    entries, mappings, digest = load_saved(output_dir)
+    if entries is None:
+        print(f"Error: {Path(output_dir) / 'hebrew-unified.json.gz'} not found; run a full build first")
+        sys.exit(1)
+
+    previous = None
+    if mappings is not None and not full:
+        old_entries = entries
+        if previous_dict:
+            print(f"  Loading previous dictionary {previous_dict}...")
+            with gzip.open(previous_dict, 'rt', encoding='utf-8') as f:
+                old_entries = json.load(f)['entries']
+        previous = (old_entries, mappings, digest)
+
+    inflection_map, roots_sha256 = build_inflection_map(entries, previous)
+    save_inflection_map(inflection_map, roots_sha256, output_dir)
 
 
 def print_stats(unified, inflection_map, stats):
@@ -367,10 +603,30 @@ def print_stats(unified, inflection_map, stats):
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Build the unified Hebrew dictionary')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Processes decoding sources concurrently (0 = one per source)')
+    parser.add_argument('--inflections-only', action='store_true',
+                        help='Rebuild only the inflection map from the saved unified dictionary')
+    parser.add_argument('--previous-dict', type=str, default=None,
+                        help='With --inflections-only, the hebrew-unified.json.gz the saved map was built '
+                             'from; only roots that differ from it are recomputed')
+    parser.add_argument('--full', action='store_true',
+                        help='Recompute every root of the inflection map instead of reusing the saved one')
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Unified Hebrew Dictionary Builder")
     print("=" * 60)
 
+    output_dir = Path('data/dictionaries/unified')
+
+    if args.inflections_only:
+        print("\nRebuilding inflection map:")
+        rebuild_inflections(output_dir, args.previous_dict, full=args.full)
+        print("Done!")
+        return
+
     # Source files
     source_files = {
         'bdb': Path('data/dictionaries/openscriptures-bdb.json.gz'),
@@ -380,32 +636,30 @@ def main():
         'wikipedia': Path('data/dictionaries/wikipedia-hebrew.json.gz'),
     }
 
-    # Load sources
-    print("\nLoading sources:")
-    sources = {}
-    for name, path in source_files.items():
-        if path.exists():
-            sources[name] = load_source(name, path)
-        else:
-            print(f"  WARNING: {path} not found, skipping")
-
-    # Merge entries
-    print("\nMerging entries:")
+    # Decode sources and stream them into the merge
+    print("\nLoading and merging sources:")
+    jobs = args.jobs if args.jobs > 0 else len(source_files)
+    sources = stream_sources(source_files, jobs)
     unified, stats = merge_entries(sources)
 
     # Classify
     classify_entries(unified)
 
-    # Build inflection map
-    inflection_map = build_inflection_map(unified)
+    # Build inflection map, reusing the saved map for roots whose words are unchanged
+    previous = None
+    if not args.full:
+        old_entries, old_map, old_digest = load_saved(output_dir)
+        if old_entries is not None and old_map is not None:
+            previous = (old_entries, old_map, old_digest)
+    inflection_map, roots_sha256 = build_inflection_map(unified, previous)
+    previous = None  # Release the saved dictionary before the output is built
 
     # Clean for output
     print("\nPreparing output:")
     clean_unified = clean_for_output(unified)
 
     # Save
-    output_dir = Path('data/dictionaries/unified')
-    dict_size, inflect_size = save_dictionary(clean_unified, inflection_map, output_dir)
+    dict_size, inflect_size = save_dictionary(clean_unified, inflection_map, roots_sha256, output_dir)
 
     # Print stats
     print_stats(unified, inflection_map, stats)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Build Verse Offset Table from Character Databases
+
+Writes the position -> book/chapter/verse table of a flat letter text
+(see verse_offsets.py) from the existing per-book character databases,
+without the original source texts. build-chardb.py and
+build-koren-database.py write the same table for the Torah as they build;
+this rebuilds it from data/<book>-chars.cols (or .json.gz) alone.
+
+The books' letters must concatenate to exactly the text, so positions in
+the table are positions in the text the ELS builders scan.
+
+Usage:
+    python3 tools/build-verse-index.py
+    python3 tools/build-verse-index.py --text data/torahNoSpaces.txt --output data/torah-verses.cols
+"""
+
+import argparse
+import gzip
+import json
+import sys
+from itertools import count
+from pathlib import Path
+
+from char_columns import CharColumnsReader
+from verse_offsets import VerseOffsets, verse_rows
+
+
+TORAH_BOOKS = ['genesis', 'exodus', 'leviticus', 'numbers', 'deuteronomy']
+
+
+def load_book_letters(data_dir, book):
+    """(text, books, chapters, verses) of a book: from <book>-chars.cols if present, else the JSON database"""
+    cols_path = data_dir / f'{book}-chars.cols'
+    if cols_path.exists():
+        with CharColumnsReader(cols_path) as db:
+            return (db.text(), db.column('book').tolist(), db.column('chapter').tolist(),
+                    db.column('verse').tolist())
+
+    with gzip.open(data_dir / f'{book}-chars.json.gz', 'rt', encoding='utf-8') as f:
+        chars = json.load(f)
+    return (''.join(c['base_char'] for c in chars), [c['book'] for c in chars],
+            [c['chapter'] for c in chars], [c['verse'] for c in chars])
+
+
+def main():
+    project_root = Path(__file__).parent.parent
+    parser = argparse.ArgumentParser(description='Build a verse offset table from character databases')
+    parser.add_argument('--books', type=str, default=','.join(TORAH_BOOKS),
+                        help='Comma-separated books, in text order (default: the five Torah books)')
+    parser.add_argument('--text', type=str, default=str(project_root / 'data' / 'torahNoSpaces.txt'),
+                        help='Flat letter text the table indexes (default: data/torahNoSpaces.txt)')
+    parser.add_argument('--output', type=str, default=str(project_root / 'data' / 'torah-verses.cols'),
+                        help='Output table (default: data/torah-verses.cols)')
+    parser.add_argument('--data-dir', type=str, default=str(project_root / 'data'),
+                        help='Directory with the <book>-chars databases')
+    args = parser.parse_args()
+
+    data_dir = Path(args.data_dir)
+    text_path = Path(args.text)
+    text = text_path.read_text(encoding='utf-8').strip()
+    print(f"Text: {text_path.name} ({len(text):,} letters)")
+
+    rows = []
+    books = {}
+    pos = 0
+    for book in args.books.split(','):
+        letters, book_numbers, chapters, verses = load_book_letters(data_dir, book)
+        if text[pos:pos + len(letters)] != letters:
+            print(f"Error: {book} does not match {text_path.name} at position {pos:,}")
+            sys.exit(1)
+        rows.extend(verse_rows(zip(count(pos), book_numbers, chapters, verses)))
+        if book_numbers:
+            books[book_numbers[0]] = book
+        print(f"  {book}: {len(letters):,} letters from position {pos:,}")
+        pos += len(letters)
+
+    if pos != len(text):
+        print(f"Error: books cover {pos:,} of {len(text):,} letters")
+        sys.exit(1)
+
+    table = VerseOffsets.from_text_rows(rows, text, text_path.name, books=books)
+    size = table.save(args.output)
+    print(f"Saved: {args.output} ({len(table):,} verses, {size / 1024:.1f} KB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -26,8 +26,9 @@ from pathlib import Path
 from collections import defaultdict
 import sys
 
+from hebrew_normalize import letters_only
+
 # Hebrew character sets
-HEBREW_LETTERS = set('אבגדהוזחטיכלמנסעפצקרשתךםןףץ')
 HEBREW_PATTERN = re.compile(r'[\u0590-\u05FF]+')
 
 # Final letter normalization
@@ -67,11 +68,8 @@ def extract_hebrew_words(text):
     matches = HEBREW_PATTERN.findall(text)
 
     for match in matches:
-        # Remove niqqud and other diacritics
-        clean = re.sub(r'[\u0591-\u05C7]', '', match)
-
-        # Keep only Hebrew letters
-        clean = ''.join(c for c in clean if c in HEBREW_LETTERS)
+        # Remove niqqud and other diacritics, keep only Hebrew letters
+        clean = letters_only(match)
 
         if len(clean) >= 2:  # Minimum 2 letters
             words.add(clean)
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Columnar Character Database Format (.cols)
+
+Binary, memory-mappable alternative to the per-letter JSON character
+database (<book>-chars.json.gz). Each field is stored once as a typed
+array, so a reader can map one column (e.g. the letters, to rebuild the
+text) without parsing or even touching the others.
+
+Layout (all integers little-endian):
+
+    Header (24 bytes)
+      magic            4s   b'CHRC'
+      version          u16
+      column_count     u16
+      row_count        u32
+      metadata_length  u32
+      metadata_at      u64  -> UTF-8 JSON metadata
+
+    Column directory (column_count × 40 bytes)
+      name             24s  ASCII field name, NUL-padded
+      typecode         c    array typecode: B (u8), H (u16), I (u32)
+      padding          7x
+      offset           u64  -> typecode[row_count], 8-byte aligned
+
+Fields are those of the JSON records (see CHAR_COLUMNS); base_char is
+stored as a letter code (LETTERS index + 1) and final_form as 0/1. The
+container itself is generic: write_columns stores any named arrays of
+equal length (verse_offsets.py uses it for verse tables).
+
+Usage:
+    from char_columns import write_char_columns, CharColumnsReader
+
+    write_char_columns(chars, 'data/genesis-chars.cols', {'book': 'genesis'})
+
+    with CharColumnsReader('data/genesis-chars.cols') as db:
+        text = db.text()                # base_char column only
+        chapters = db.column('chapter')  # memoryview of uint16, zero-copy
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+
+
+MAGIC = b'CHRC'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIIQ')
+COLUMN_ENTRY = struct.Struct('<24sc7xQ')
+
+# Letter codes for base_char (0 is reserved for "no letter")
+LETTERS = 'אבגדהוזחטיכךלמםנןסעפףצץקרשת'
+LETTER_CODES = {c: i + 1 for i, c in enumerate(LETTERS)}
+LETTER_DECODE = {i + 1: c for i, c in enumerate(LETTERS)}
+
+# (field, array typecode) for every numeric field of a character record
+CHAR_COLUMNS = [
+    ('id', 'I'),
+    ('book', 'B'),
+    ('chapter', 'H'),
+    ('verse', 'H'),
+    ('verse_char_index', 'H'),
+    ('word_index', 'H'),
+    ('char_index_in_word', 'B'),
+    ('base_char', 'B'),
+    ('final_form', 'B'),
+    ('gematria_standard', 'H'),
+    ('gematria_reduced', 'B'),
+    ('gematria_ordinal', 'B'),
+    ('word_id', 'I'),
+    ('verse_id', 'I'),
+]
+
+
+def _to_little_endian(column):
+    if sys.byteorder != 'little':
+        column.byteswap()
+    return column
+
+
+def write_columns(columns, output_path, metadata=None):
+    """Write (name, array) columns of equal length as a .cols file. Returns the file size."""
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    row_count = len(columns[0][1]) if columns else 0
+    if any(len(column) != row_count for _, column in columns):
+        raise ValueError("All columns must have the same length")
+
+    columns = [(name, _to_little_endian(array(column.typecode, column))) for name, column in columns]
+    meta_bytes = json.dumps(metadata or {}, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    offset = HEADER.size + COLUMN_ENTRY.size * len(columns)
+    directory = []
+    for name, column in columns:
+        offset += -offset % 8
+        directory.append(COLUMN_ENTRY.pack(name.encode('ascii'), column.typecode.encode('ascii'), offset))
+        offset += len(column) * column.itemsize
+    metadata_at = offset
+
+    with open(output_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(columns), row_count, len(meta_bytes), metadata_at))
+        f.write(b''.join(directory))
+        for entry, (_, column) in zip(directory, columns):
+            f.write(bytes(COLUMN_ENTRY.unpack(entry)[2] - f.tell()))
+            f.write(column.tobytes())
+        f.write(meta_bytes)
+
+    return output_path.stat().st_size
+
+
+def write_char_columns(chars, output_path, metadata=None):
+    """Write character records (list of dicts) as a .cols file.
+
+    Every CHAR_COLUMNS field present in the records becomes a column;
+    string fields other than base_char are not stored. Returns the file
+    size in bytes.
+    """
+    fields = [(name, code) for name, code in CHAR_COLUMNS if chars and name in chars[0]]
+
+    columns = []
+    for name, code in fields:
+        if name == 'base_char':
+            try:
+                values = [LETTER_CODES[c[name]] for c in chars]
+            except KeyError as e:
+                raise ValueError(f"Unsupported base_char {e.args[0]!r}") from None
+        else:
+            values = [int(c[name]) for c in chars]
+        columns.append((name, array(code, values)))
+
+    return write_columns(columns, output_path, metadata)
+
+
+class CharColumnsReader:
+    """Memory-mapped reader for .cols files (character databases and other column sets)"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buf = memoryview(self._mmap)
+
+        magic, version, column_count, self.row_count, meta_len, metadata_at = HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a .cols file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported .cols version {version} in {self.path}")
+
+        self._columns = {}
+        for i in range(column_count):
+            raw_name, typecode, offset = COLUMN_ENTRY.unpack_from(self._buf, HEADER.size + i * COLUMN_ENTRY.size)
+            self._columns[raw_name.rstrip(b'\0').decode('ascii')] = (typecode.decode('ascii'), offset)
+        self._metadata_raw = self._buf[metadata_at:metadata_at + meta_len]
+        self._metadata = None
+        self._views = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Release the memory map"""
+        for view in self._views.values():
+            view.release()
+        self._metadata_raw.release()
+        self._buf.release()
+        self._mmap.close()
+        self._file.close()
+
+    def __len__(self):
+        return self.row_count
+
+    @property
+    def columns(self):
+        """Names of the stored fields, in file order"""
+        return list(self._columns)
+
+    @property
+    def metadata(self):
+        """Metadata written with the file, decoded on first access"""
+        if self._metadata is None:
+            self._metadata = json.loads(bytes(self._metadata_raw).decode('utf-8'))
+        return self._metadata
+
+    def column(self, name):
+        """One field as a memoryview over the mapped file (no copy, no decoding)"""
+        if name not in self._views:
+            typecode, offset = self._columns[name]
+            raw = self._buf[offset:offset + array(typecode).itemsize * self.row_count]
+            if sys.byteorder == 'little':
+                self._views[name] = raw.cast(typecode)
+            else:
+                column = array(typecode, raw.tobytes())
+                column.byteswap()
+                raw.release()
+                self._views[name] = memoryview(column)
+        return self._views[name]
+
+    def text(self):
+        """The letters as one string, decoded from the base_char column only"""
+        codes = self.column('base_char')
+        return bytes(codes).decode('latin-1').translate(LETTER_DECODE)
+
+    def row(self, i):
+        """Record i as a dict with the stored fields (as in the JSON database)"""
+        record = {}
+        for name in self._columns:
+            value = self.column(name)[i]
+            if name == 'base_char':
+                value = LETTER_DECODE[value]
+            elif name == 'final_form':
+                value = bool(value)
+            record[name] = value
+        return record
+
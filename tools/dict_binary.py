@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Binary Dictionary Format (.dictx)
+
+Compact, memory-mappable alternative to the unified dictionary JSON
+(hebrew-unified.json.gz). Words are front-coded in sorted order, every
+string (roots, definitions, refs, related words) is stored once in a
+string pool, and each entry is a fixed-width record. A reader can
+binary-search a word and decode only that entry, or list the words
+without touching records or definitions.
+
+Layout (all integers little-endian):
+
+    Header (80 bytes)
+      magic              4s   b'DCTX'
+      version            u16
+      reserved           u16
+      entry_count        u32
+      metadata_length    u32
+      block_count        u32
+      string_count       u32
+      block_offsets_at   u64  -> u32[block_count + 1]  offsets into the word blob
+      words_at           u64  -> front-coded word blocks
+      records_at         u64  -> RECORD[entry_count], in word order
+      lists_at           u64  -> u32 string ids (definitions, refs, related)
+      string_offsets_at  u64  -> u32[string_count + 1]  offsets into the string blob
+      strings_at         u64  -> UTF-8 strings, concatenated
+      metadata_at        u64  -> UTF-8 JSON metadata (source, version, code tables)
+
+Words:
+    Sorted by UTF-8 bytes (Python string order) in blocks of BLOCK_SIZE.
+    The first word of a block is stored whole (varint length + bytes);
+    each following word as varints (bytes shared with the previous word,
+    suffix length) + suffix bytes. Unsigned LEB128 varints, as in .elsx.
+
+Records (20 bytes):
+    root         u32  string id, NO_STRING if the entry has none
+    lists_start  u32  index into the list array: definitions, refs, related
+    sources      u16  bitmask over metadata codes.sources
+    pos, era, binyan, type          u8  1 + index into metadata codes.<field>, 0 = absent
+    definitions, refs, related      u8  list lengths
+    padding      3x
+
+Usage:
+    from dict_binary import write_binary_dictionary, DictionaryReader
+
+    write_binary_dictionary(entries, 'data/dictionaries/unified/hebrew-unified.dictx',
+                            {'version': '1.0'}, source_names=['bdb', 'strongs'])
+
+    with DictionaryReader('data/dictionaries/unified/hebrew-unified.dictx') as reader:
+        words = set(reader.words())   # word blocks only
+        entry = reader.get('שלום')     # same dict as the JSON entry
+"""
+
+import json
+import mmap
+import struct
+from array import array
+from pathlib import Path
+
+
+MAGIC = b'DCTX'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIIII7Q')
+RECORD = struct.Struct('<IIHBBBBBBB3x')
+BLOCK_SIZE = 16
+NO_STRING = 0xFFFFFFFF
+
+# Coded fields of an entry (each stored as one byte) and list fields (string ids)
+CODED_FIELDS = ['pos', 'era', 'binyan', 'type']
+LIST_FIELDS = ['definitions', 'refs', 'related']
+
+
+def encode_varint(value, out):
+    """Append value as an unsigned LEB128 varint to a bytearray"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data, i):
+    """Decode the varint at data[i]; return (value, next index)"""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[i]
+        i += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, i
+        shift += 7
+
+
+def front_code(words):
+    """Front-code sorted UTF-8 words; return (block offsets, word blob)"""
+    blob = bytearray()
+    offsets = array('I')
+    prev = b''
+    for i, raw in enumerate(words):
+        if i % BLOCK_SIZE == 0:
+            offsets.append(len(blob))
+            encode_varint(len(raw), blob)
+            blob += raw
+        else:
+            shared = 0
+            limit = min(len(prev), len(raw))
+            while shared < limit and prev[shared] == raw[shared]:
+                shared += 1
+            encode_varint(shared, blob)
+            encode_varint(len(raw) - shared, blob)
+            blob += raw[shared:]
+        prev = raw
+    offsets.append(len(blob))
+    return offsets, bytes(blob)
+
+
+class _CodeTable:
+    """Value <-> small integer code, in first-seen order"""
+
+    def __init__(self, values=(), limit=255):
+        self.values = []
+        self.codes = {}
+        self.limit = limit
+        for value in values:
+            self.code(value)
+
+    def code(self, value):
+        if value not in self.codes:
+            if len(self.values) == self.limit:
+                raise ValueError(f"More than {self.limit} distinct values ({value!r})")
+            self.codes[value] = len(self.values)
+            self.values.append(value)
+        return self.codes[value]
+
+
+def write_binary_dictionary(entries, output_path, metadata=None, source_names=()):
+    """Write { word: entry } (entries as in hebrew-unified.json.gz) as a .dictx file.
+
+    source_names fixes the bit order of the sources mask, which is also
+    the order sources are listed in on read; names not in it are added as
+    they are seen. Every entry's sources must already be in that order.
+    Returns the file size in bytes.
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    words = sorted(entries, key=lambda w: w.encode('utf-8'))
+    sources = _CodeTable(source_names, limit=16)
+    codes = {field: _CodeTable() for field in CODED_FIELDS}
+    strings = _CodeTable(limit=NO_STRING)
+    lists = array('I')
+    records = bytearray()
+
+    for word in words:
+        entry = entries[word]
+        if entry.get('word', word) != word:
+            raise ValueError(f"Entry for {word!r} has word {entry['word']!r}")
+
+        mask = 0
+        for name in entry['sources']:
+            mask |= 1 << sources.code(name)
+        if [name for name in sources.values if mask >> sources.codes[name] & 1] != entry['sources']:
+            raise ValueError(f"Sources of {word!r} are not in source table order: {entry['sources']}")
+
+        root = strings.code(entry['root']) if 'root' in entry else NO_STRING
+        field_codes = [codes[f].code(entry[f]) + 1 if f in entry else 0 for f in CODED_FIELDS]
+
+        lists_start = len(lists)
+        counts = []
+        for field in LIST_FIELDS:
+            values = entry.get(field, [])
+            if len(values) > 255:
+                raise ValueError(f"{word!r} has more than 255 {field}")
+            lists.extend(strings.code(value) for value in values)
+            counts.append(len(values))
+
+        records += RECORD.pack(root, lists_start, mask, *field_codes, *counts)
+
+    block_offsets, word_blob = front_code([w.encode('utf-8') for w in words])
+
+    string_offsets = array('I', [0])
+    string_blob = bytearray()
+    for value in strings.values:
+        string_blob += value.encode('utf-8')
+        string_offsets.append(len(string_blob))
+
+    meta = dict(metadata or {})
+    meta['codes'] = {'sources': sources.values, **{f: codes[f].values for f in CODED_FIELDS}}
+    meta_bytes = json.dumps(meta, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    # Sections in file order; each starts 8-byte aligned
+    sections = [block_offsets.tobytes(), word_blob, bytes(records), lists.tobytes(),
+                string_offsets.tobytes(), bytes(string_blob), meta_bytes]
+    offsets = []
+    offset = HEADER.size
+    for section in sections:
+        offset += -offset % 8
+        offsets.append(offset)
+        offset += len(section)
+
+    with open(output_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(words), len(meta_bytes),
+                            len(block_offsets) - 1, len(strings.values), *offsets))
+        for section_at, section in zip(offsets, sections):
+            f.write(bytes(section_at - f.tell()))
+            f.write(section)
+
+    return output_path.stat().st_size
+
+
+class DictionaryReader:
+    """Memory-mapped reader for .dictx dictionary files"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buf = memoryview(self._mmap)
+
+        (magic, version, _, self.entry_count, meta_len, self.block_count, string_count,
+         block_offsets_at, words_at, records_at, lists_at,
+         string_offsets_at, strings_at, metadata_at) = HEADER.unpack_from(self._buf, 0)
+
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a DCTX dictionary")
+        if version != VERSION:
+            raise ValueError(f"Unsupported DCTX version {version} in {self.path}")
+
+        n = self.entry_count
+        self._block_offsets = self._buf[block_offsets_at:block_offsets_at + 4 * (self.block_count + 1)].cast('I')
+        self._words = self._buf[words_at:words_at + self._block_offsets[self.block_count]]
+        self._records = self._buf[records_at:records_at + RECORD.size * n]
+        self._lists = self._buf[lists_at:string_offsets_at].cast('I')
+        self._string_offsets = self._buf[string_offsets_at:string_offsets_at + 4 * (string_count + 1)].cast('I')
+        self._strings = self._buf[strings_at:metadata_at]
+        self._metadata_raw = self._buf[metadata_at:metadata_at + meta_len]
+        self._metadata = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Release the memory map"""
+        for view in (self._block_offsets, self._words, self._records, self._lists,
+                     self._string_offsets, self._strings, self._metadata_raw, self._buf):
+            view.release()
+        self._mmap.close()
+        self._file.close()
+
+    def __len__(self):
+        return self.entry_count
+
+    def __contains__(self, word):
+        return self.find(word) >= 0
+
+    @property
+    def metadata(self):
+        """Dictionary metadata (source, version, code tables), decoded on first access"""
+        if self._metadata is None:
+            self._metadata = json.loads(bytes(self._metadata_raw).decode('utf-8'))
+        return self._metadata
+
+    def _block(self, b):
+        """The UTF-8 words of block b"""
+        data = self._words
+        i = self._block_offsets[b]
+        end = self._block_offsets[b + 1]
+        length, i = decode_varint(data, i)
+        prev = bytes(data[i:i + length])
+        i += length
+        words = [prev]
+        while i < end:
+            shared, i = decode_varint(data, i)
+            length, i = decode_varint(data, i)
+            prev = prev[:shared] + bytes(data[i:i + length])
+            i += length
+            words.append(prev)
+        return words
+
+    def _block_head(self, b):
+        length, i = decode_varint(self._words, self._block_offsets[b])
+        return bytes(self._words[i:i + length])
+
+    def word(self, i):
+        """Return the i-th word in sorted order"""
+        return self._block(i // BLOCK_SIZE)[i % BLOCK_SIZE].decode('utf-8')
+
+    def words(self):
+        """Iterate over all words in sorted order (reads only the word blocks)"""
+        for b in range(self.block_count):
+            for raw in self._block(b):
+                yield raw.decode('utf-8')
+
+    def find(self, word):
+        """Binary-search the block heads, then scan one block; return the word's row, or -1"""
+        target = word.encode('utf-8')
+        lo, hi = 0, self.block_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._block_head(mid) <= target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == 0:
+            return -1
+        block = lo - 1
+        for j, raw in enumerate(self._block(block)):
+            if raw == target:
+                return block * BLOCK_SIZE + j
+        return -1
+
+    def _string(self, k):
+        return bytes(self._strings[self._string_offsets[k]:self._string_offsets[k + 1]]).decode('utf-8')
+
+    def entry(self, i, word=None):
+        """Decode the i-th entry as a dict (fields as in hebrew-unified.json.gz)"""
+        root, lists_start, mask, *rest = RECORD.unpack_from(self._records, i * RECORD.size)
+        field_codes = dict(zip(CODED_FIELDS, rest[:len(CODED_FIELDS)]))
+        counts = rest[len(CODED_FIELDS):]
+        codes = self.metadata['codes']
+
+        lists = {}
+        k = lists_start
+        for field, count in zip(LIST_FIELDS, counts):
+            if count:
+                lists[field] = [self._string(s) for s in self._lists[k:k + count]]
+            k += count
+
+        # Key order of build-unified-dict.clean_for_output
+        entry = {'word': self.word(i) if word is None else word}
+        if root != NO_STRING:
+            entry['root'] = self._string(root)
+        if field_codes['pos']:
+            entry['pos'] = codes['pos'][field_codes['pos'] - 1]
+        entry['sources'] = [name for bit, name in enumerate(codes['sources']) if mask >> bit & 1]
+        if field_codes['binyan']:
+            entry['binyan'] = codes['binyan'][field_codes['binyan'] - 1]
+        if 'definitions' in lists:
+            entry['definitions'] = lists['definitions']
+        if field_codes['era']:
+            entry['era'] = codes['era'][field_codes['era'] - 1]
+        if field_codes['type']:
+            entry['type'] = codes['type'][field_codes['type'] - 1]
+        for field in ('refs', 'related'):
+            if field in lists:
+                entry[field] = lists[field]
+        return entry
+
+    def get(self, word, default=None):
+        """Return a word's entry, or default if it is not in the dictionary"""
+        i = self.find(word)
+        if i < 0:
+            return default
+        return self.entry(i, word)
+
+    def items(self):
+        """Iterate over (word, entry) for every entry, in sorted order"""
+        for i, word in enumerate(self.words()):
+            yield word, self.entry(i, word)
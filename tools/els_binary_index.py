@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Binary ELS Index Format (.elsx)
+
+Columnar, memory-mappable alternative to the gzipped JSON ELS index.
+A reader can look up one word's occurrences with a binary search over the
+word table and decode only that word's postings, without parsing the rest.
+
+Layout (all integers little-endian):
+
+    Header (72 bytes)
+      magic              4s   b'ELSX'
+      version            u16
+      reserved           u16
+      word_count         u32
+      metadata_length    u32
+      total_occurrences  u64
+      word_offsets_at    u64  -> u32[word_count + 1]  offsets into the word blob
+      posting_offsets_at u64  -> u64[word_count + 1]  offsets into the postings blob
+      counts_at          u64  -> u32[word_count]      occurrences per word
+      words_at           u64  -> UTF-8 words, sorted, concatenated
+      metadata_at        u64  -> UTF-8 JSON metadata (same fields as the JSON index)
+      postings_at        u64  -> varint postings
+
+Postings:
+    Each word's occurrences are sorted by (position, skip). Each occurrence
+    is two unsigned LEB128 varints: the position delta from the previous
+    occurrence of the same word (the first is absolute), and the skip
+    zigzag-encoded (0, -1, 1, -2, 2, ... -> 0, 1, 2, 3, 4, ...).
+
+Words are sorted by UTF-8 bytes, which matches Python string order.
+
+Usage:
+    from els_binary_index import write_binary_index, ElsIndexReader
+
+    write_binary_index(index, 'data/els-index/els-index.elsx', metadata)
+
+    with ElsIndexReader('data/els-index/els-index.elsx') as reader:
+        occurrences = reader.get('משה')   # [(position, skip), ...]
+"""
+
+import json
+import mmap
+import shutil
+import struct
+from array import array
+from pathlib import Path
+
+
+MAGIC = b'ELSX'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIIQQQQQQQ')
+
+
+def zigzag(n):
+    """Map a signed integer to an unsigned one (0, -1, 1, -2, ... -> 0, 1, 2, 3, ...)"""
+    return (n << 1) if n >= 0 else ((-n << 1) - 1)
+
+
+def unzigzag(n):
+    """Inverse of zigzag()"""
+    return (n >> 1) if not n & 1 else -((n + 1) >> 1)
+
+
+def encode_postings(occurrences, prev=0):
+    """Delta/varint-encode a (position, skip) list already sorted by (position, skip).
+
+    prev is the position before the first occurrence, for encoding one
+    word's postings in consecutive chunks.
+    """
+    out = bytearray()
+    for pos, skip in occurrences:
+        for value in (pos - prev, zigzag(skip)):
+            while value >= 0x80:
+                out.append((value & 0x7F) | 0x80)
+                value >>= 7
+            out.append(value)
+        prev = pos
+    return bytes(out)
+
+
+def decode_postings(data, count):
+    """Decode count (position, skip) pairs from a postings byte slice"""
+    occurrences = []
+    i = 0
+    pos = 0
+    for _ in range(count):
+        values = []
+        for _ in range(2):
+            value = 0
+            shift = 0
+            while True:
+                byte = data[i]
+                i += 1
+                value |= (byte & 0x7F) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+            values.append(value)
+        pos += values[0]
+        occurrences.append((pos, unzigzag(values[1])))
+    return occurrences
+
+
+def iter_postings(f, length, count, chunk_size=1 << 16):
+    """Yield count (position, skip) pairs from the next length bytes of file f.
+
+    The postings are read chunk_size bytes at a time, so a word with many
+    occurrences is decoded without holding its whole postings in memory.
+    """
+    buf = b''
+    i = 0
+    remaining = length
+    pos = 0
+    for _ in range(count):
+        # Two varints take at most 20 bytes; top up the buffer before each pair
+        if len(buf) - i < 20 and remaining:
+            buf = buf[i:]
+            i = 0
+            while len(buf) < 20 and remaining:
+                data = f.read(min(max(chunk_size, 20), remaining))
+                remaining -= len(data)
+                buf += data
+        values = []
+        for _ in range(2):
+            value = 0
+            shift = 0
+            while True:
+                byte = buf[i]
+                i += 1
+                value |= (byte & 0x7F) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+            values.append(value)
+        pos += values[0]
+        yield pos, unzigzag(values[1])
+
+
+class EncodedPostings:
+    """Already-encoded postings for one word, copied verbatim by the writer.
+
+    Lets an updated index reuse unchanged words' postings from an existing
+    file without decoding and re-encoding them.
+    """
+    __slots__ = ['count', 'data']
+
+    def __init__(self, count, data):
+        self.count = count
+        self.data = data
+
+    def __len__(self):
+        return self.count
+
+
+class BinaryIndexWriter:
+    """Streaming .elsx writer.
+
+    Words must be added in sorted order. Postings are streamed to a
+    temporary file next to the output, so memory use is proportional to
+    the number of words, not occurrences; finish() assembles the final file.
+    """
+
+    def __init__(self, output_path):
+        self.output_path = Path(output_path)
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._postings_path = self.output_path.with_name(self.output_path.name + '.postings.tmp')
+        self._postings = open(self._postings_path, 'wb')
+        self._words = []
+        self._word_offsets = array('I', [0])
+        self._counts = array('I')
+        self._posting_offsets = array('Q', [0])
+
+    def add(self, word, occurrences):
+        """Append one word's occurrences (sorted (position, skip) list, or EncodedPostings)"""
+        raw = word.encode('utf-8')
+        if self._words and raw <= self._words[-1]:
+            raise ValueError(f"Words must be added in sorted order: {word!r}")
+
+        if isinstance(occurrences, EncodedPostings):
+            count, encoded = occurrences.count, occurrences.data
+        else:
+            count, encoded = len(occurrences), encode_postings(occurrences)
+
+        self._postings.write(encoded)
+        self._words.append(raw)
+        self._word_offsets.append(self._word_offsets[-1] + len(raw))
+        self._counts.append(count)
+        self._posting_offsets.append(self._posting_offsets[-1] + len(encoded))
+
+    def add_chunks(self, word, chunks):
+        """Append one word's occurrences given as consecutive sorted (position, skip) chunks.
+
+        Each chunk is encoded and written as it arrives, so only one chunk
+        of the word's postings is in memory at a time.
+        """
+        raw = word.encode('utf-8')
+        if self._words and raw <= self._words[-1]:
+            raise ValueError(f"Words must be added in sorted order: {word!r}")
+
+        count = 0
+        length = 0
+        prev = 0
+        for chunk in chunks:
+            encoded = encode_postings(chunk, prev)
+            self._postings.write(encoded)
+            count += len(chunk)
+            length += len(encoded)
+            prev = chunk[-1][0]
+
+        self._words.append(raw)
+        self._word_offsets.append(self._word_offsets[-1] + len(raw))
+        self._counts.append(count)
+        self._posting_offsets.append(self._posting_offsets[-1] + length)
+
+    def finish(self, metadata):
+        """Write the header, word table and metadata, then the postings. Returns file size."""
+        self._postings.close()
+
+        word_offsets, posting_offsets, counts = self._word_offsets, self._posting_offsets, self._counts
+        meta_bytes = json.dumps(metadata, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+        # Fixed-width columns first (naturally aligned), variable-length blobs after
+        word_offsets_at = HEADER.size + (-HEADER.size % 8)
+        posting_offsets_at = word_offsets_at + len(word_offsets) * 4
+        posting_offsets_at += -posting_offsets_at % 8
+        counts_at = posting_offsets_at + len(posting_offsets) * 8
+        words_at = counts_at + len(counts) * 4
+        metadata_at = words_at + word_offsets[-1]
+        postings_at = metadata_at + len(meta_bytes)
+
+        header = HEADER.pack(MAGIC, VERSION, 0, len(self._words), len(meta_bytes), sum(counts),
+                             word_offsets_at, posting_offsets_at, counts_at,
+                             words_at, metadata_at, postings_at)
+
+        with open(self.output_path, 'wb') as f:
+            f.write(header)
+            f.write(bytes(word_offsets_at - HEADER.size))
+            f.write(word_offsets.tobytes())
+            f.write(bytes(posting_offsets_at - (word_offsets_at + len(word_offsets) * 4)))
+            f.write(posting_offsets.tobytes())
+            f.write(counts.tobytes())
+            f.write(b''.join(self._words))
+            f.write(meta_bytes)
+            with open(self._postings_path, 'rb') as postings:
+                shutil.copyfileobj(postings, f)
+
+        self._postings_path.unlink()
+        return self.output_path.stat().st_size
+
+
+def write_binary_index(index, output_path, metadata):
+    """Write a word -> [(position, skip), ...] index as a .elsx file.
+
+    Values may also be EncodedPostings, which are written as-is.
+    Returns the file size in bytes.
+    """
+    writer = BinaryIndexWriter(output_path)
+    for word in sorted(index):
+        occurrences = index[word]
+        if not isinstance(occurrences, EncodedPostings):
+            occurrences = sorted(occurrences)
+        writer.add(word, occurrences)
+    return writer.finish(metadata)
+
+
+class ElsIndexReader:
+    """Memory-mapped reader for .elsx ELS index files"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buf = memoryview(self._mmap)
+
+        (magic, version, _, self.word_count, meta_len, self.total_occurrences,
+         word_offsets_at, posting_offsets_at, counts_at,
+         words_at, metadata_at, postings_at) = HEADER.unpack_from(self._buf, 0)
+
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not an ELSX index")
+        if version != VERSION:
+            raise ValueError(f"Unsupported ELSX version {version} in {self.path}")
+
+        n = self.word_count
+        self._word_offsets = self._buf[word_offsets_at:word_offsets_at + 4 * (n + 1)].cast('I')
+        self._posting_offsets = self._buf[posting_offsets_at:posting_offsets_at + 8 * (n + 1)].cast('Q')
+        self._counts = self._buf[counts_at:counts_at + 4 * n].cast('I')
+        self._words = self._buf[words_at:metadata_at]
+        self._metadata_raw = self._buf[metadata_at:metadata_at + meta_len]
+        self._postings = self._buf[postings_at:]
+        self._metadata = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Release the memory map"""
+        for view in (self._word_offsets, self._posting_offsets, self._counts,
+                     self._words, self._metadata_raw, self._postings, self._buf):
+            view.release()
+        self._mmap.close()
+        self._file.close()
+
+    def __len__(self):
+        return self.word_count
+
+    def __contains__(self, word):
+        return self.find(word) >= 0
+
+    @property
+    def metadata(self):
+        """Index metadata (torah_hash, skip_range, ...), decoded on first access"""
+        if self._metadata is None:
+            self._metadata = json.loads(bytes(self._metadata_raw).decode('utf-8'))
+        return self._metadata
+
+    def _word_bytes(self, i):
+        return bytes(self._words[self._word_offsets[i]:self._word_offsets[i + 1]])
+
+    def word(self, i):
+        """Return the i-th word in sorted order"""
+        return self._word_bytes(i).decode('utf-8')
+
+    def words(self):
+        """Iterate over all indexed words in sorted order (reads only the word table)"""
+        for i in range(self.word_count):
+            yield self.word(i)
+
+    def find(self, word):
+        """Binary-search the word table; return the word's row, or -1"""
+        target = word.encode('utf-8')
+        lo, hi = 0, self.word_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._word_bytes(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.word_count and self._word_bytes(lo) == target:
+            return lo
+        return -1
+
+    def count(self, word):
+        """Number of occurrences of a word (0 if not indexed)"""
+        i = self.find(word)
+        return self._counts[i] if i >= 0 else 0
+
+    def postings(self, i):
+        """Decode the (position, skip) list of the i-th word"""
+        start, end = self._posting_offsets[i], self._posting_offsets[i + 1]
+        return decode_postings(self._postings[start:end], self._counts[i])
+
+    def encoded_postings(self, i):
+        """Return the i-th word's postings undecoded, for copying into a new file"""
+        start, end = self._posting_offsets[i], self._posting_offsets[i + 1]
+        return EncodedPostings(self._counts[i], bytes(self._postings[start:end]))
+
+    def get(self, word, default=None):
+        """Return a word's (position, skip) occurrences, or default if not indexed"""
+        i = self.find(word)
+        if i < 0:
+            return default
+        return self.postings(i)
+
+    def items(self):
+        """Iterate over (word, occurrences) for every word, in sorted order"""
+        for i in range(self.word_count):
+            yield self.word(i), self.postings(i)
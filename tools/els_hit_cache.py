@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Persistent ELS Hit Cache
+
+Content-addressed store of ELS occurrences for the Python builders
+(build-els-index.py, build-date-els-index.py, wrr_engine.py). Entries are
+keyed by the SHA-256 of the exact text searched, so they are reused by
+later runs over the same text, not across texts: with their default
+inputs build-els-index.py searches the Torah with final letters kept,
+build-date-els-index.py the sofit-folded Torah and the WRR runners
+folded Genesis, so each of them has its own cache file and only speeds
+up its own reruns.
+
+Keys:
+    (SHA-256 of the exact text searched, normalized term, skip bounds)
+
+    Each text gets a base file, data/els-cache/<text sha256>.elsx, plus
+    the segments written since it was last compacted,
+    <text sha256>.<segment id>.elsx, all in the .elsx format of
+    els_binary_index.py. Their rows are keyed
+    "<term>:<min |skip|>:<max |skip|>" and hold every occurrence of the
+    term with min <= |skip| <= max as (position, signed skip), position
+    being the ELS's first letter; backward ELSs of palindromes are stored
+    too, so each builder can apply its own convention when reading. A
+    lookup is served by the exact bounds if present, otherwise by any
+    stored entry for the term with wider bounds, filtered.
+
+Writes:
+    flush() writes only the pending entries, as a new segment. Once a text
+    has more than MAX_SEGMENTS segments they are compacted into the base
+    file, streaming every row through once. Entries are never evicted:
+    once a text's files reach max_bytes (DEFAULT_MAX_BYTES, 1 GiB) new
+    entries are no longer written. Delete the directory to reset it.
+
+Terms are normalized by dropping whitespace and, for texts written without
+final letter forms (sofiot normalized), folding finals.
+
+Usage:
+    from els_hit_cache import ElsHitCache
+
+    with ElsHitCache(text) as cache:
+        occurrences = cache.get('כחשונ', 1, 200)     # None on a miss
+        if occurrences is None:
+            occurrences = search(...)
+            cache.put('כחשונ', 1, 200, occurrences)  # written on close/flush
+"""
+
+import hashlib
+import heapq
+import os
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+from els_binary_index import BinaryIndexWriter, ElsIndexReader, write_binary_index
+
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / 'data' / 'els-cache'
+FINAL_FORMS = 'ךםןףץ'
+SOFIT_MAP = str.maketrans(FINAL_FORMS, 'כמנפצ')
+
+# Segments per text before they are compacted into the base file
+MAX_SEGMENTS = 8
+# Size of a text's cache files past which new entries are not written
+DEFAULT_MAX_BYTES = 1 << 30
+
+
+def text_sha256(text):
+    """Hex SHA-256 of a text's UTF-8 bytes (the cache's content address)"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def mirror(occurrences, length):
+    """The same letters read in the other direction: (p, s) -> (p + (k-1)s, -s)"""
+    return [(pos + (length - 1) * skip, -skip) for pos, skip in occurrences]
+
+
+class ElsHitCache:
+    """Read-through ELS occurrence cache for one text"""
+
+    def __init__(self, text, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.text_hash = text_sha256(text)
+        self.fold_sofiot = not any(ch in text for ch in FINAL_FORMS)
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.path = self.cache_dir / f'{self.text_hash}.elsx'
+        self.max_bytes = max_bytes
+        self.pending = {}
+        self.hits = 0
+        self.misses = 0
+        self._files = []
+        self._open()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def segment_paths(self):
+        """This text's segment files, oldest first"""
+        return sorted(self.cache_dir.glob(f'{self.text_hash}.*.elsx'))
+
+    def _open(self):
+        """Open the base file and every segment as (reader, sorted keys)"""
+        for path in [self.path] + self.segment_paths():
+            if path.exists():
+                reader = ElsIndexReader(path)
+                self._files.append((reader, list(reader.words())))
+
+    def _release(self):
+        for reader, _ in self._files:
+            reader.close()
+        self._files = []
+
+    def close(self):
+        """Write pending entries and release the files"""
+        self.flush()
+        self._release()
+
+    def size(self):
+        """Bytes used by this text's cache files"""
+        return sum(path.stat().st_size for path in [self.path] + self.segment_paths() if path.exists())
+
+    def normalize(self, term):
+        """Cache form of a term: no whitespace, finals folded for sofit-free texts"""
+        term = ''.join(term.split())
+        return term.translate(SOFIT_MAP) if self.fold_sofiot else term
+
+    def _stored(self, term):
+        """(min, max, reader, row) of every stored entry for a term"""
+        prefix = term + ':'
+        entries = []
+        for reader, keys in self._files:
+            i = bisect_left(keys, prefix)
+            while i < len(keys) and keys[i].startswith(prefix):
+                lo, hi = keys[i][len(prefix):].split(':')
+                entries.append((int(lo), int(hi), reader, i))
+                i += 1
+        return entries
+
+    def get(self, term, min_skip, max_skip):
+        """Occurrences with min_skip <= |skip| <= max_skip sorted by (position, skip), or None"""
+        term = self.normalize(term)
+        key = (term, min_skip, max_skip)
+        if key in self.pending:
+            self.hits += 1
+            return self.pending[key]
+
+        best = None
+        for lo, hi, reader, row in self._stored(term):
+            if lo <= min_skip and hi >= max_skip and (best is None or hi - lo < best[1] - best[0]):
+                best = (lo, hi, reader, row)
+        if best is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        occurrences = best[2].postings(best[3])
+        if best[:2] != (min_skip, max_skip):
+            occurrences = [(p, s) for p, s in occurrences if min_skip <= abs(s) <= max_skip]
+        return occurrences
+
+    def put(self, term, min_skip, max_skip, occurrences):
+        """Queue a term's complete occurrence list for the given bounds (both directions)"""
+        self.pending[(self.normalize(term), min_skip, max_skip)] = sorted(occurrences)
+
+    def flush(self):
+        """Write pending entries as a new segment, compacting once there are too many"""
+        if not self.pending:
+            return
+        if self.size() >= self.max_bytes:
+            print(f"  ELS hit cache is at its {self.max_bytes:,}-byte limit; "
+                  f"{len(self.pending)} new entries not written")
+            self.pending = {}
+            return
+
+        entries = {f'{term}:{lo}:{hi}': occ for (term, lo, hi), occ in self.pending.items()}
+        segment = self.path.with_name(f'{self.text_hash}.{time.time_ns():020d}-{os.getpid()}.elsx')
+        tmp_path = segment.with_name(segment.name + '.tmp')
+        write_binary_index(entries, tmp_path, {
+            'kind': 'els-hit-cache',
+            'text_sha256': self.text_hash,
+            'entries': len(entries),
+        })
+        os.replace(tmp_path, segment)
+        self.pending = {}
+
+        self._release()
+        if len(self.segment_paths()) > MAX_SEGMENTS:
+            self.compact()
+        self._open()
+
+    def compact(self):
+        """Merge the base file and all segments into a new base file (atomic replace).
+
+        Rows are streamed in key order from every file; a key found in
+        several files is written once.
+        """
+        self._release()
+        segments = self.segment_paths()
+        paths = ([self.path] if self.path.exists() else []) + segments
+        readers = [ElsIndexReader(path) for path in paths]
+
+        def rows(n, reader):
+            for i, key in enumerate(reader.words()):
+                yield key, n, i
+
+        tmp_path = self.path.with_name(self.path.name + f'.{os.getpid()}.tmp')
+        writer = BinaryIndexWriter(tmp_path)
+        entries = 0
+        last = None
+        try:
+            for key, n, i in heapq.merge(*(rows(n, r) for n, r in enumerate(readers))):
+                if key != last:
+                    writer.add(key, readers[n].encoded_postings(i))
+                    entries += 1
+                    last = key
+            writer.finish({
+                'kind': 'els-hit-cache',
+                'text_sha256': self.text_hash,
+                'entries': entries,
+            })
+        finally:
+            for reader in readers:
+                reader.close()
+        os.replace(tmp_path, self.path)
+        # Only the segments merged here: another process may have added one since
+        for path in segments:
+            path.unlink(missing_ok=True)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Letter Frequencies and Expected ELS Counts
+
+Shared by the ELS builders to size each term's skip range by statistical
+need instead of one global --max-skip / --skip-range. With letter
+frequencies f(c) over a text of length L, a term w of k letters matches at
+a given start and skip with probability
+
+    P(w) = Π f(c)/L
+
+so the expected number of ELSs at skip d, in one direction, is
+
+    E(w, d) = (L - (k-1)·d) · P(w)
+
+The adaptive bound D(w) is the smallest D at which Σ E(w, d) over
+d = min_skip..D reaches a target (10 in the WRR experiment). Short, common
+terms reach it within a few skips; long or rare terms need far larger
+skips than a global limit would give them. This is wrrMaxSkip from
+engines/wrr.worker.js, with the same arithmetic, so D(w) values agree
+with the browser.
+
+Usage:
+    from els_letter_stats import LetterStats
+
+    stats = LetterStats.from_text(text)
+    stats.adaptive_max_skip('משה', target=10, cap=1000)   # -> D(w)
+    stats.expected_count('משה', 50)                        # E(w, 50)
+"""
+
+import math
+
+
+class LetterStats:
+    """Letter counts of one text, and the expected-count model built on them"""
+
+    def __init__(self, counts, length):
+        self.counts = counts
+        self.length = length
+
+    @classmethod
+    def from_text(cls, text):
+        """Count the letters of the exact text that will be searched"""
+        counts = {}
+        for ch in text:
+            counts[ch] = counts.get(ch, 0) + 1
+        return cls(counts, len(text))
+
+    def probability(self, term):
+        """P(w): chance that the term matches at one (start, skip); 0 if a letter never occurs"""
+        log_p = 0.0
+        for ch in term:
+            f = self.counts.get(ch)
+            if not f:
+                return 0.0
+            log_p += math.log(f / self.length)
+        return math.exp(log_p)
+
+    def expected_count(self, term, skip):
+        """E(w, d): expected ELSs at one skip, in one direction"""
+        valid_starts = self.length - (len(term) - 1) * abs(skip)
+        return max(valid_starts, 0) * self.probability(term)
+
+    def adaptive_max_skip(self, term, target=10, cap=1000, min_skip=1):
+        """D(w): smallest D with Σ_{d=min_skip..D} E(w, d) >= target, at most cap.
+
+        Terms containing a letter absent from the text get min_skip. If
+        the term stops fitting in the text before reaching the target, the
+        largest skip it still fits at is returned.
+        """
+        k = len(term)
+        p_match = self.probability(term)
+        if p_match == 0:
+            return min_skip
+
+        # Closed form of the whole sum: terms that never reach the target skip
+        # the loop (most long dictionary words). The margin keeps the shortcut
+        # from disagreeing with the sequential sum by rounding.
+        last = min(cap, (self.length - 1) // (k - 1)) if k > 1 else cap
+        if last >= min_skip:
+            n = last - min_skip + 1
+            total = p_match * (n * self.length - (k - 1) * (last + min_skip) * n / 2)
+            if total < target * (1 - 1e-9):
+                return last
+
+        expected = 0.0
+        for d in range(min_skip, cap + 1):
+            valid_starts = self.length - (k - 1) * d
+            if valid_starts <= 0:
+                return max(d - 1, min_skip)
+            expected += valid_starts * p_match
+            if expected >= target:
+                return d
+        return cap
+
+    def adaptive_limits(self, terms, target=10, cap=1000, min_skip=1):
+        """{ term: D(w) } for many terms"""
+        return {term: self.adaptive_max_skip(term, target, cap, min_skip) for term in terms}
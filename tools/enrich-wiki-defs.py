@@ -27,9 +27,14 @@ import sys
 import argparse
 from pathlib import Path
 
+from dict_binary import DictionaryReader, write_binary_dictionary
+from els_binary_index import ElsIndexReader
+
 
 DICT_PATH = Path('data/dictionaries/unified/hebrew-unified.json.gz')
+DICT_BINARY_PATH = DICT_PATH.with_name('hebrew-unified.dictx')
 ELS_INDEX_PATH = Path('data/els-index/els-index-50-min4.json.gz')
+ELS_BINARY_INDEX_PATH = ELS_INDEX_PATH.with_name('els-index-50-min4.elsx')
 WIKI_API = 'https://he.wikipedia.org/api/rest_v1/page/summary/'
 
 
@@ -50,6 +55,13 @@ def first_sentence(text):
 
 def load_els_words():
     """Load the set of words in the ELS index."""
+    if ELS_BINARY_INDEX_PATH.exists():
+        # Binary index: read only the word table, postings stay on disk
+        print(f'Loading ELS index words from {ELS_BINARY_INDEX_PATH}...')
+        with ElsIndexReader(ELS_BINARY_INDEX_PATH) as reader:
+            words = set(reader.words())
+        print(f'  ELS index contains {len(words)} words')
+        return words
     if not ELS_INDEX_PATH.exists():
         print(f'Warning: ELS index not found at {ELS_INDEX_PATH}')
         return None
@@ -78,6 +90,16 @@ def save_dict(data):
         json.dump(data, f, ensure_ascii=False)
     print('  Saved.')
 
+    if DICT_BINARY_PATH.exists():
+        # Keep the binary copy in step, with its source bit order
+        with DictionaryReader(DICT_BINARY_PATH) as reader:
+            source_names = reader.metadata['codes']['sources']
+        print(f'Saving binary dictionary to {DICT_BINARY_PATH}...')
+        write_binary_dictionary(data['entries'], DICT_BINARY_PATH,
+                                {'source': data.get('source'), 'version': data.get('version')},
+                                source_names=source_names)
+        print('  Saved.')
+
 
 def fetch_wiki_summary(term, delay_s=0.05):
     """Fetch Wikipedia summary for a Hebrew term."""
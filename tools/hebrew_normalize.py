@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Hebrew Word Normalization
+
+Shared by the dictionary and index builders. Every operation is a single
+str.translate call with a table built once at import, instead of a
+re.sub for niqqud followed by per-character generators or chained
+str.replace calls for final letters.
+
+    strip_niqqud   remove niqqud and cantillation (U+0591-U+05C7)
+    fold_finals    final letters to regular forms (ך ם ן ף ץ -> כ מ נ פ צ)
+    normalize      both, in one pass
+    letters_only   keep only the 27 Hebrew letters (finals kept)
+
+normalize_word is normalize behind an LRU cache, for builders that see
+the same words many times (every source of the unified dictionary, then
+the inflection map).
+
+Usage:
+    from hebrew_normalize import normalize_word, letters_only
+
+    normalize_word('שָׁלוֹם')   # -> 'שלומ'
+    letters_only('בְּרֵאשִׁית׃')  # -> 'בראשית'
+"""
+
+from functools import lru_cache
+
+
+HEBREW_LETTERS = 'אבגדהוזחטיכךלמםנןסעפףצץקרשת'
+FINAL_TO_REGULAR = {'ך': 'כ', 'ם': 'מ', 'ן': 'נ', 'ף': 'פ', 'ץ': 'צ'}
+
+# Niqqud, cantillation and the other marks the builders strip (U+0591-U+05C7)
+NIQQUD = range(0x0591, 0x05C8)
+
+NORMALIZE_CACHE_SIZE = 1 << 18
+
+STRIP_NIQQUD_TABLE = dict.fromkeys(NIQQUD)
+FOLD_FINALS_TABLE = {ord(final): regular for final, regular in FINAL_TO_REGULAR.items()}
+NORMALIZE_TABLE = {**STRIP_NIQQUD_TABLE, **FOLD_FINALS_TABLE}
+
+
+class _LettersOnlyTable(dict):
+    """Translate table deleting every character except Hebrew letters.
+
+    Filled lazily: str.translate looks each new code point up once, and
+    later lookups hit the dict directly.
+    """
+
+    def __missing__(self, codepoint):
+        value = codepoint if chr(codepoint) in HEBREW_LETTERS else None
+        self[codepoint] = value
+        return value
+
+
+LETTERS_ONLY_TABLE = _LettersOnlyTable()
+
+
+def strip_niqqud(text):
+    """Remove niqqud and cantillation marks"""
+    return text.translate(STRIP_NIQQUD_TABLE)
+
+
+def fold_finals(text):
+    """Replace final letter forms with their regular forms"""
+    return text.translate(FOLD_FINALS_TABLE)
+
+
+def normalize(text):
+    """Remove niqqud and fold final letters in one pass"""
+    return text.translate(NORMALIZE_TABLE)
+
+
+def letters_only(text):
+    """Keep only Hebrew letters (niqqud, punctuation and other scripts dropped; finals kept)"""
+    return text.translate(LETTERS_ONLY_TABLE)
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize_word(word):
+    """normalize(), memoized for words that recur across sources"""
+    return word.translate(NORMALIZE_TABLE)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Date ELS Index Test Script
+
+Runs build-date-els-index.py twice against a fresh hit cache: the first
+run searches every term and fills the cache (--update-cache), the second
+finds every term there and searches nothing. Both runs must succeed and
+store the same hits. Also checks that the automaton scan accepts an empty
+term list.
+
+Usage:
+    python3 tools/test-date-els-index.py
+"""
+
+import gzip
+import importlib.util
+import json
+import re
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+TOOLS = Path(__file__).resolve().parent
+BUILDER = TOOLS / 'build-date-els-index.py'
+
+
+def load_builder():
+    """Import build-date-els-index.py as a module"""
+    sys.path.insert(0, str(TOOLS))
+    spec = importlib.util.spec_from_file_location('build_date_els_index', BUILDER)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_builder(output, cache_dir, *extra):
+    """Run the builder with a small adaptive automaton search; returns the process"""
+    return subprocess.run([sys.executable, str(BUILDER), '--max-skip', '3', '--automaton',
+                           '--adaptive-skip', '--no-verses', '--cache-dir', str(cache_dir),
+                           '--output', str(output), *extra],
+                          capture_output=True, text=True)
+
+
+def load_hits(path):
+    """The index's term categories, without the run-dependent metadata"""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        data = json.load(f)
+    return {key: data[key] for key in ('dates', 'months', 'years')}
+
+
+def main():
+    failures = []
+
+    def check(name, ok, detail=''):
+        print(f"  {'PASS' if ok else 'FAIL'}  {name}{': ' + detail if detail and not ok else ''}")
+        if not ok:
+            failures.append(name)
+
+    builder = load_builder()
+    check('scan_all_terms with no terms', builder.scan_all_terms('אבג', [], 1, 3, 10, limits={'אב': 3}) == {})
+
+    with tempfile.TemporaryDirectory(prefix='date-els-test-') as tmp:
+        tmp = Path(tmp)
+        cache_dir = tmp / 'cache'
+
+        first = run_builder(tmp / 'first.json.gz', cache_dir, '--update-cache')
+        check('first run (fills the cache)', first.returncode == 0, first.stderr.strip()[-500:])
+
+        second = run_builder(tmp / 'second.json.gz', cache_dir)
+        check('second run (every term cached)', second.returncode == 0, second.stderr.strip()[-500:])
+        if first.returncode == 0 and second.returncode == 0:
+            cached = re.search(r'ELS hit cache: (\d+)/(\d+) terms cached', second.stdout)
+            check('all terms served by the cache', bool(cached) and cached[1] == cached[2])
+            check('cached run stores the same hits',
+                  load_hits(tmp / 'first.json.gz') == load_hits(tmp / 'second.json.gz'))
+
+    if failures:
+        print(f"\n{len(failures)} check(s) failed")
+        sys.exit(1)
+    print("\nAll checks passed")
+
+
+if __name__ == '__main__':
+    main()
@@ -9,14 +9,27 @@ Expected:
 - Proper final forms (ך ם ן ף ץ)
 - Ketiv (written) form
 - SHA-256: b65394d28c85ce76dca0d15af08810deebb2e85032d6575a9ae764643a193226
+
+Usage:
+    python3 tools/validate-text.py [data_dir]
+    python3 tools/validate-text.py --stream [data_dir]
+
+--stream reads each book in fixed-size chunks (the .cols letter column, or
+the JSON database decompressed and scanned incrementally) and computes the
+hash, counts, finals and Genesis 1:1 check in one pass with constant
+memory, reporting each book as it finishes.
 """
 
+import argparse
 import gzip
 import json
 import hashlib
 import os
+import re
 import sys
 
+from char_columns import CharColumnsReader, LETTER_DECODE
+
 # Expected counts per book (Koren/Rips edition)
 EXPECTED_COUNTS = {
     'genesis': 78064,
@@ -30,18 +43,66 @@ EXPECTED_COUNTS = {
 # SHA-256 hash of canonical Koren text
 CANONICAL_SHA256 = "b65394d28c85ce76dca0d15af08810deebb2e85032d6575a9ae764643a193226"
 
+TORAH_BOOKS = ['genesis', 'exodus', 'leviticus', 'numbers', 'deuteronomy']
+FINALS = 'ךםןףץ'
+EXPECTED_GEN1_1 = 'בראשיתבראאלהיםאתהשמיםואתהארץ'
+
+# Letters per chunk (--stream) and decompressed JSON bytes per read
+CHUNK_LETTERS = 1 << 16
+JSON_READ_SIZE = 1 << 20
+BASE_CHAR_RE = re.compile(r'"base_char":\s*"(.)"')
+
+
+def load_book_text(data_dir, book):
+    """One book's letters: from the columnar <book>-chars.cols if present, else the JSON database"""
+    cols_path = os.path.join(data_dir, f'{book}-chars.cols')
+    if os.path.exists(cols_path):
+        with CharColumnsReader(cols_path) as db:
+            return db.text()
+
+    filepath = os.path.join(data_dir, f'{book}-chars.json.gz')
+    with gzip.open(filepath, 'rt', encoding='utf-8') as f:
+        chars = json.load(f)
+    return ''.join(c['base_char'] for c in chars)
+
+
+def iter_book_chunks(data_dir, book):
+    """One book's letters in chunks, without holding the book in memory.
+
+    Reads the .cols letter column a slice at a time if present; otherwise
+    decompresses the JSON database incrementally and picks base_char out of
+    each complete record (the records are flat objects, so a record ends at
+    the first '}').
+    """
+    cols_path = os.path.join(data_dir, f'{book}-chars.cols')
+    if os.path.exists(cols_path):
+        with CharColumnsReader(cols_path) as db:
+            codes = db.column('base_char')
+            for start in range(0, len(codes), CHUNK_LETTERS):
+                yield codes[start:start + CHUNK_LETTERS].tobytes().decode('latin-1').translate(LETTER_DECODE)
+        return
+
+    filepath = os.path.join(data_dir, f'{book}-chars.json.gz')
+    with gzip.open(filepath, 'rt', encoding='utf-8') as f:
+        pending = ''
+        while True:
+            data = f.read(JSON_READ_SIZE)
+            if not data:
+                break
+            pending += data
+            end = pending.rfind('}') + 1
+            if end:
+                yield ''.join(BASE_CHAR_RE.findall(pending, 0, end))
+                pending = pending[end:]
+
 
 def load_torah_from_db(data_dir):
     """Load Torah text from character database files."""
-    torah_books = ['genesis', 'exodus', 'leviticus', 'numbers', 'deuteronomy']
     full_text = ''
     book_texts = {}
 
-    for book in torah_books:
-        filepath = os.path.join(data_dir, f'{book}-chars.json.gz')
-        with gzip.open(filepath, 'rt', encoding='utf-8') as f:
-            chars = json.load(f)
-        book_text = ''.join(c['base_char'] for c in chars)
+    for book in TORAH_BOOKS:
+        book_text = load_book_text(data_dir, book)
         book_texts[book] = book_text
         full_text += book_text
 
@@ -105,8 +166,7 @@ def validate_text(data_dir=None):
         results['warnings'].append("SHA-256 mismatch - text may have been modified")
 
     # Check final letters
-    finals = 'ךםןףץ'
-    finals_count = sum(1 for c in full_text if c in finals)
+    finals_count = sum(1 for c in full_text if c in FINALS)
     results['finals'] = {
         'total': finals_count,
         'expected_min': 20000,  # Approximately 20,106 in correct text
@@ -118,38 +178,130 @@ def validate_text(data_dir=None):
         results['warnings'].append("No final letters found - text may be corrupted")
 
     # Check first verse
-    expected_gen1_1 = 'בראשיתבראאלהיםאתהשמיםואתהארץ'
-    actual_gen1_1 = full_text[:28]
+    check_first_verse(results, full_text[:len(EXPECTED_GEN1_1)])
+
+    return results, full_text
+
+
+def check_first_verse(results, actual_gen1_1):
+    """Record the Genesis 1:1 check in results"""
     results['first_verse'] = {
         'actual': actual_gen1_1,
-        'expected': expected_gen1_1,
-        'matches': actual_gen1_1 == expected_gen1_1
+        'expected': EXPECTED_GEN1_1,
+        'matches': actual_gen1_1 == EXPECTED_GEN1_1
     }
 
-    if actual_gen1_1 != expected_gen1_1:
+    if actual_gen1_1 != EXPECTED_GEN1_1:
         results['valid'] = False
         results['warnings'].append("Genesis 1:1 mismatch")
 
-    return results, full_text
 
+def validate_text_stream(data_dir=None, on_book=None):
+    """validate_text in one constant-memory pass over the books.
 
-def print_report(results):
-    """Print validation report."""
-    print("=" * 70)
-    print("TORAH TEXT VALIDATION REPORT")
-    print("=" * 70)
-    print(f"Source: {results['source']}")
-    print(f"Overall Valid: {'✓ YES' if results['valid'] else '✗ NO'}")
-    print()
+    Each chunk updates the hash, letter and finals counts and the Genesis
+    1:1 prefix together; nothing is kept per letter. on_book(book, data)
+    is called as each book finishes. Returns the results only (no text).
+    """
+    if data_dir is None:
+        data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
+
+    results = {
+        'valid': True,
+        'source': 'Koren Edition (Rips et al., 1994)',
+        'books': {},
+        'total': {},
+        'hash': {},
+        'finals': {},
+        'warnings': []
+    }
+
+    hasher = hashlib.sha256()
+    total = 0
+    finals_count = 0
+    prefix = ''
+
+    for book in TORAH_BOOKS:
+        actual = 0
+        for chunk in iter_book_chunks(data_dir, book):
+            hasher.update(chunk.encode('utf-8'))
+            actual += len(chunk)
+            finals_count += sum(chunk.count(c) for c in FINALS)
+            if len(prefix) < len(EXPECTED_GEN1_1):
+                prefix += chunk[:len(EXPECTED_GEN1_1) - len(prefix)]
+
+        expected = EXPECTED_COUNTS[book]
+        results['books'][book] = {
+            'actual': actual,
+            'expected': expected,
+            'matches': actual == expected,
+        }
+        if actual != expected:
+            results['valid'] = False
+            results['warnings'].append(f"{book}: count mismatch (expected {expected}, got {actual})")
+        total += actual
+        if on_book:
+            on_book(book, results['books'][book])
+
+    results['total'] = {
+        'actual': total,
+        'expected': EXPECTED_COUNTS['total'],
+        'matches': total == EXPECTED_COUNTS['total'],
+    }
+    if total != EXPECTED_COUNTS['total']:
+        results['valid'] = False
+
+    sha256 = hasher.hexdigest()
+    results['hash'] = {
+        'actual': sha256,
+        'expected': CANONICAL_SHA256,
+        'matches': sha256 == CANONICAL_SHA256
+    }
+    if sha256 != CANONICAL_SHA256:
+        results['valid'] = False
+        results['warnings'].append("SHA-256 mismatch - text may have been modified")
 
+    results['finals'] = {
+        'total': finals_count,
+        'expected_min': 20000,  # Approximately 20,106 in correct text
+        'has_finals': finals_count > 0
+    }
+    if finals_count == 0:
+        results['valid'] = False
+        results['warnings'].append("No final letters found - text may be corrupted")
+
+    check_first_verse(results, prefix)
+
+    return results
+
+
+def print_book_header():
+    """Print the heading of the book-by-book table."""
     print("Book-by-Book Analysis:")
     print("-" * 70)
     print(f"{'Book':<15} {'Actual':>10} {'Expected':>10} {'Status':<10}")
     print("-" * 70)
 
-    for book, data in results['books'].items():
-        status = "✓" if data['matches'] else "✗"
-        print(f"{book.title():<15} {data['actual']:>10,} {data['expected']:>10,} {status}")
+
+def print_book_line(book, data):
+    """Print one book's row of the book-by-book table."""
+    status = "✓" if data['matches'] else "✗"
+    print(f"{book.title():<15} {data['actual']:>10,} {data['expected']:>10,} {status}", flush=True)
+
+
+def print_report(results, books=True):
+    """Print validation report (books=False when the book rows were already printed)."""
+    if books:
+        print("=" * 70)
+        print("TORAH TEXT VALIDATION REPORT")
+        print("=" * 70)
+        print(f"Source: {results['source']}")
+        print(f"Overall Valid: {'✓ YES' if results['valid'] else '✗ NO'}")
+        print()
+
+        print_book_header()
+        for book, data in results['books'].items():
+            print_book_line(book, data)
 
     print("-" * 70)
     t = results['total']
@@ -177,6 +329,10 @@ def print_report(results):
     print(f"SHA-256: {h['actual']}")
     print(f"Status:  {'✓ Matches canonical' if h['matches'] else '✗ MISMATCH!'}")
 
+    if not books:
+        print()
+        print(f"Overall Valid: {'✓ YES' if results['valid'] else '✗ NO'}")
+
     if results['warnings']:
         print()
         print("Warnings:")
@@ -187,9 +343,24 @@ def print_report(results):
 
 
 def main():
-    data_dir = sys.argv[1] if len(sys.argv) > 1 else None
-    results, text = validate_text(data_dir)
-    print_report(results)
+    parser = argparse.ArgumentParser(description='Validate the Torah text against the Koren edition')
+    parser.add_argument('data_dir', nargs='?', default=None, help='Data directory (default: data/)')
+    parser.add_argument('--stream', action='store_true',
+                        help='One constant-memory pass over the books, reporting each as it finishes')
+    args = parser.parse_args()
+
+    if args.stream:
+        print("=" * 70)
+        print("TORAH TEXT VALIDATION REPORT (streaming)")
+        print("=" * 70)
+        print("Source: Koren Edition (Rips et al., 1994)")
+        print()
+        print_book_header()
+        results = validate_text_stream(args.data_dir, on_book=print_book_line)
+        print_report(results, books=False)
+    else:
+        results, text = validate_text(args.data_dir)
+        print_report(results)
 
     # Exit with error if invalid
     sys.exit(0 if results['valid'] else 1)
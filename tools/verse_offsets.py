@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Verse Offset Table
+
+Maps global letter positions in a flat, space-free text (tanakhNoSpaces.txt,
+torahNoSpaces.txt) to book/chapter/verse with a binary search, so builders
+scanning the flat text can cite references without loading the per-letter
+*-chars.json.gz records.
+
+Stored as a .cols file (see char_columns.py) with one row per verse:
+
+    start    u32  position of the verse's first letter (sorted)
+    book     u8   book number (1-39)
+    chapter  u16
+    verse    u16
+
+The metadata records the text it indexes (text, text_length, text_sha256)
+and the book names. Book and chapter boundaries are the first verse of
+each book or chapter.
+
+An ELS hit (position p, skip s, k letters) covers letters p, p+s, ...,
+p+(k-1)s; span() gives the first and last verse rows it touches with two
+binary searches, which is how the ELS index builders annotate their hits.
+
+Tables are written by build-database.py (tanakh-verses.cols), the Koren
+builders build-chardb.py and build-koren-database.py (torah-verses.cols),
+and build-verse-index.py from existing character databases.
+
+Usage:
+    from verse_offsets import VerseOffsets
+
+    with VerseOffsets.load('data/tanakh-verses.cols') as verses:
+        verses.locate(123456)      # -> (book, chapter, verse)
+        verses.book_ranges()[27]   # -> (start, end) of Psalms
+        verses.span(1000, -50, 4)  # -> (first_row, last_row) of an ELS
+"""
+
+import hashlib
+from array import array
+from bisect import bisect_right
+
+from char_columns import CharColumnsReader, write_columns
+
+
+class VerseOffsets:
+    """Sorted verse start positions with parallel book/chapter/verse arrays"""
+
+    def __init__(self, starts, books, chapters, verses, text_length, metadata=None, reader=None):
+        self.starts = starts
+        self.books = books
+        self.chapters = chapters
+        self.verses = verses
+        self.text_length = text_length
+        self.metadata = metadata or {}
+        self._reader = reader
+        self.path = reader.path if reader else None
+
+    @classmethod
+    def from_rows(cls, rows, text_length, metadata=None):
+        """Build from (start, book, chapter, verse) rows in text order"""
+        starts, books, chapters, verses = array('I'), array('B'), array('H'), array('H')
+        for start, book, chapter, verse in rows:
+            if starts and start < starts[-1]:
+                raise ValueError(f"Verse starts must be sorted ({start} after {starts[-1]})")
+            starts.append(start)
+            books.append(book)
+            chapters.append(chapter)
+            verses.append(verse)
+        return cls(starts, books, chapters, verses, text_length, metadata)
+
+    @classmethod
+    def from_text_rows(cls, rows, text, text_name, **metadata):
+        """from_rows for a text, recording its file name and SHA-256 for load_for_text"""
+        return cls.from_rows(rows, len(text), dict(metadata, text=text_name, text_sha256=text_sha256(text)))
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map a saved table; columns are read on demand, never copied"""
+        reader = CharColumnsReader(path)
+        metadata = reader.metadata
+        return cls(reader.column('start'), reader.column('book'), reader.column('chapter'),
+                   reader.column('verse'), metadata['text_length'], metadata, reader)
+
+    @classmethod
+    def load_for_text(cls, path, text):
+        """load(), raising ValueError unless the table was built for exactly this text"""
+        table = cls.load(path)
+        if table.text_length != len(text) or table.metadata.get('text_sha256') != text_sha256(text):
+            table.close()
+            raise ValueError(f"{path} indexes a different text ({table.metadata.get('text', 'unknown')})")
+        return table
+
+    def save(self, path, metadata=None):
+        """Write the table as a .cols file. Returns the file size."""
+        metadata = dict(self.metadata, **(metadata or {}), text_length=self.text_length)
+        return write_columns([('start', array('I', self.starts)), ('book', array('B', self.books)),
+                              ('chapter', array('H', self.chapters)), ('verse', array('H', self.verses))],
+                             path, metadata)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Release the memory map of a loaded table"""
+        if self._reader:
+            self.starts = self.books = self.chapters = self.verses = None
+            self._reader.close()
+            self._reader = None
+
+    def __len__(self):
+        return len(self.starts)
+
+    def index(self, pos):
+        """Row of the verse containing letter position pos (O(log n))"""
+        if not 0 <= pos < self.text_length:
+            raise IndexError(f"Position {pos} outside the text (length {self.text_length})")
+        return bisect_right(self.starts, pos) - 1
+
+    def locate(self, pos):
+        """(book, chapter, verse) of letter position pos"""
+        return self.reference(self.index(pos))
+
+    def span(self, pos, skip, length):
+        """(first, last) rows of the verses covered by an ELS of length letters"""
+        end = pos + (length - 1) * skip
+        if end < pos:
+            pos, end = end, pos
+        return self.index(pos), self.index(end)
+
+    def reference(self, i):
+        """(book, chapter, verse) of row i"""
+        return self.books[i], self.chapters[i], self.verses[i]
+
+    def verse_range(self, i):
+        """(start, end) letter positions of row i, end exclusive"""
+        end = self.starts[i + 1] if i + 1 < len(self.starts) else self.text_length
+        return self.starts[i], end
+
+    def book_ranges(self):
+        """{ book: (start, end) } letter ranges, end exclusive"""
+        ranges = {}
+        for i, book in enumerate(self.books):
+            if book not in ranges:
+                ranges[book] = [self.starts[i], self.text_length]
+                if i:
+                    ranges[self.books[i - 1]][1] = self.starts[i]
+        return {book: tuple(span) for book, span in ranges.items()}
+
+
+def verse_rows(letters):
+    """(start, book, chapter, verse) table rows from per-letter (position, book, chapter, verse) in text order"""
+    rows = []
+    previous = None
+    for pos, book, chapter, verse in letters:
+        if (book, chapter, verse) != previous:
+            previous = (book, chapter, verse)
+            rows.append((pos, book, chapter, verse))
+    return rows
+
+
+def text_sha256(text):
+    """SHA-256 of a text's UTF-8 encoding, as recorded in table metadata"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
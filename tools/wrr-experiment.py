@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+WRR 1994 Experiment — batch runner (Python/NumPy)
+
+Runs the full WRR1 replication from engines/wrr.worker.js ('run-wrr-full')
+outside the browser: ELS search with the dynamic skip bound D(w), the
+c(w,w') perturbation rank over 125 (x, y, z) perturbations using the paper's
+σ proximity measure, and the P₁–P₄ statistics with P = 4·min(P₁..P₄).
+
+Input:
+  A rabbi list written by tools/convert-wrr-data.py (format_as_json), e.g.
+  data/wrr-list2.json, and the Koren text data/torahNoSpaces.txt. As in the
+  browser, only Genesis (the first 78,064 letters) is searched by default.
+
+Usage:
+    python3 tools/wrr-experiment.py
+    python3 tools/wrr-experiment.py --rabbis data/wrr-list1.json --skip-cap 200
+    python3 tools/wrr-experiment.py --output results/wrr-list2.json
+
+Options:
+    --rabbis PATH       Rabbi list JSON (default: data/wrr-list2.json)
+    --text PATH         Text file (default: data/torahNoSpaces.txt)
+    --text-length N     Letters of the text to search (default: 78064 = Genesis, 0 = all)
+    --skip-cap N        Upper bound on D(w) (default: 1000, the browser's default)
+    --no-58filter       Use all appellation/date lengths, not only 5–8 letter pairs
+    --cache-dir PATH    ELS hit cache directory (default: data/els-cache)
+    --no-cache          Search every term, bypassing the ELS hit cache
+    --output PATH       Write per-rabbi c values and P statistics as JSON
+
+Dependencies:
+    pip install numpy
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from els_hit_cache import ElsHitCache
+from wrr_engine import GENESIS_LENGTH, WrrText, load_rabbis, load_text, require_numpy, run_experiment
+
+
+def print_summary(summary):
+    """Print P statistics and sorted per-rabbi c values"""
+    print("\n========== WRR RESULTS ==========")
+    print(f"Matched rabbis: {summary['matched_count']} / {summary['total_rabbis']}")
+    print(f"Matched (no רבי): {summary['matched_count_no_rabbi']}")
+    print(f"Word pairs: {summary['pairs_considered']} (filtered: {summary['pairs_filtered']})")
+    print(f"P₁ (Bin 0.2):       {summary['p1']:.4e}")
+    print(f"P₂ (Gamma):         {summary['p2']:.4e}")
+    print(f"P₃ (Bin, no רבי):   {summary['p3']:.4e}")
+    print(f"P₄ (Gamma, no רבי): {summary['p4']:.4e}")
+    print(f"P = 4·min(P₁–P₄):   {summary['overall_p']:.4e}")
+    print("=================================\n")
+
+    print("Per-rabbi c values (sorted):")
+    for r in sorted((r for r in summary['rabbi_results'] if r['c'] is not None), key=lambda r: r['c']):
+        print(f"  {r['c']:.4f}  {r['en']}  [{r['name']} × {r['date']}]")
+
+    c_values = summary['c_values']
+    below_02 = sum(1 for c in c_values if c < 0.2)
+    below_01 = sum(1 for c in c_values if c < 0.1)
+    print(f"\nc < 0.2: {below_02}/{len(c_values)}   c < 0.1: {below_01}/{len(c_values)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run the WRR 1994 experiment (c(w,w\') and P₁–P₄) with NumPy',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--rabbis', type=str, default='data/wrr-list2.json',
+                        help='Rabbi list from convert-wrr-data.py (default: data/wrr-list2.json)')
+    parser.add_argument('--text', type=str, default='data/torahNoSpaces.txt',
+                        help='Text file (default: data/torahNoSpaces.txt)')
+    parser.add_argument('--text-length', type=int, default=GENESIS_LENGTH,
+                        help=f'Letters to search (default: {GENESIS_LENGTH} = Genesis, 0 = whole file)')
+    parser.add_argument('--skip-cap', type=int, default=1000,
+                        help='Upper bound on the dynamic skip range D(w) (default: 1000)')
+    parser.add_argument('--no-58filter', action='store_true',
+                        help='Do not restrict word pairs to 5-8 letters')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                        help='ELS hit cache directory (default: data/els-cache)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not read or write the ELS hit cache')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Write results as JSON to this path')
+    args = parser.parse_args()
+
+    require_numpy()
+
+    text_path = Path(args.text)
+    rabbis_path = Path(args.rabbis)
+    for path in (text_path, rabbis_path):
+        if not path.exists():
+            print(f"Error: {path} not found")
+            sys.exit(1)
+
+    text = load_text(text_path, args.text_length)
+    hit_cache = None if args.no_cache else ElsHitCache(text, args.cache_dir)
+    wrr_text = WrrText(text, hit_cache)
+    rabbis = load_rabbis(rabbis_path)
+    use_58_filter = not args.no_58filter
+
+    print("\nWRR Full Experiment — Python Runner")
+    print(f"Text: {wrr_text.length:,} letters, Skip cap: {args.skip_cap}")
+    print(f"Rabbis: {len(rabbis)} ({sum(1 for r in rabbis if r['dates'])} with dates)")
+    print(f"Total appellations: {sum(len(r['names']) for r in rabbis)}")
+    print(f"5-8 char filter: {'ON' if use_58_filter else 'OFF'}\n")
+
+    start = time.time()
+    summary, _ = run_experiment(wrr_text, rabbis, args.skip_cap, use_58_filter)
+    if hit_cache:
+        hit_cache.close()
+        print(f"ELS hit cache: {hit_cache.hits} hits, {hit_cache.misses} misses ({hit_cache.path})")
+    print_summary(summary)
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        summary = {
+            'rabbis_file': str(rabbis_path),
+            'text_length': wrr_text.length,
+            'skip_cap': args.skip_cap,
+            'use_58_filter': use_58_filter,
+            **summary,
+        }
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"\nResults written to {output_path}")
+
+    print(f"\nTotal time: {time.time() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
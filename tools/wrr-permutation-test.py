@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+WRR 1994 Permutation Test — multicore batch runner (Python/NumPy)
+
+Runs the 'runWRRPermTestFull' test from engines/wrr.worker.js at scale:
+rabbis' date sets are shuffled, P = 4·min(P₁..P₄) is recomputed for each
+permutation, and the p-value is the share of permutations scoring at
+least as well (P ≤ actual P) as the true assignment.
+
+How it scales:
+  - Every distinct (appellation, date) pair's c(w,w') is computed once (in
+    parallel), then assembled into the N × N best-c matrices the worker
+    builds, so each permutation is only table lookups.
+  - Permutations are split into fixed-size blocks. Block b draws from its
+    own PCG64 stream seeded by SeedSequence(seed, spawn_key=(b,)), so the
+    result depends only on --seed and --block-size, never on --workers or
+    the order blocks finish in.
+  - With --checkpoint, the c matrices and each finished block's count are
+    saved periodically; rerunning the same command resumes where it left
+    off.
+
+Input:
+  A rabbi list written by tools/convert-wrr-data.py (format_as_json) and
+  data/torahNoSpaces.txt (Genesis by default, as in the browser).
+
+Usage:
+    python3 tools/wrr-permutation-test.py --permutations 100000
+    python3 tools/wrr-permutation-test.py --permutations 1000000 --workers 0 \\
+        --checkpoint results/wrr-perm-list2.ckpt.json --output results/wrr-perm-list2.json
+
+Options:
+    --rabbis PATH          Rabbi list JSON (default: data/wrr-list2.json)
+    --text PATH            Text file (default: data/torahNoSpaces.txt)
+    --text-length N        Letters to search (default: 78064 = Genesis, 0 = all)
+    --skip-cap N           Upper bound on D(w) (default: 1000)
+    --no-58filter          Use all appellation/date lengths
+    --cache-dir PATH       ELS hit cache directory (default: data/els-cache)
+    --no-cache             Search every term, bypassing the ELS hit cache
+    --permutations N       Number of permutations (default: 10000)
+    --seed N               Base RNG seed (default: 1994)
+    --block-size N         Permutations per block (default: 10000)
+    --workers N            Worker processes (default: 1, 0 = all cores)
+    --checkpoint PATH      Save/resume progress in this file
+    --checkpoint-every S   Seconds between checkpoint writes (default: 60)
+    --output PATH          Write the final result as JSON
+
+Dependencies:
+    pip install numpy
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+from pathlib import Path
+
+from els_hit_cache import ElsHitCache
+from wrr_engine import (GENESIS_LENGTH, PermutationScorer, WrrText, c_matrices, compute_c,
+                        load_rabbis, load_text, matrix_pairs, prepare_rabbis, require_numpy)
+
+
+CHECKPOINT_VERSION = 1
+
+_WORKER_STATE = {}
+
+
+def _init_worker(text_length):
+    """Pool initializer: remember the text length for compute_c"""
+    _WORKER_STATE['text_length'] = text_length
+
+
+def _pair_c(pair):
+    """Pool task: c for one (name hits, date hits) pair"""
+    name_hits, date_hits = pair
+    return (name_hits.term, date_hits.term), compute_c(name_hits, date_hits, _WORKER_STATE['text_length'])
+
+
+def _run_block(task):
+    """Pool task: count permutations in one block with P <= the actual P"""
+    import numpy as np
+
+    index, size, seed, scorer, actual_p = task
+    rng = np.random.Generator(np.random.PCG64(np.random.SeedSequence(seed, spawn_key=(index,))))
+    perms = rng.permuted(np.tile(np.arange(scorer.n), (size, 1)), axis=1)
+    return index, int(np.count_nonzero(scorer.score(perms) <= actual_p))
+
+
+def _pool(workers, text_length):
+    if 'fork' in mp.get_all_start_methods():
+        ctx = mp.get_context('fork')
+    else:
+        ctx = mp.get_context()
+    return ctx.Pool(workers, initializer=_init_worker, initargs=(text_length,))
+
+
+def config_fingerprint(text, rabbis, skip_cap, use_58_filter):
+    """Hash of everything the c matrices depend on"""
+    h = hashlib.sha256()
+    h.update(text.encode('utf-8'))
+    h.update(json.dumps(rabbis, ensure_ascii=False, sort_keys=True).encode('utf-8'))
+    h.update(f"{skip_cap}:{use_58_filter}".encode('ascii'))
+    return h.hexdigest()
+
+
+def load_checkpoint(path, run_config):
+    """Load a checkpoint for this exact run, or None if there isn't one"""
+    if not path or not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        state = json.load(f)
+    if state.get('version') != CHECKPOINT_VERSION or state.get('config') != run_config:
+        print(f"Error: {path} was written for a different run configuration")
+        print("  (rabbi list, text, skip cap, filter, seed, block size and permutation count must match)")
+        sys.exit(1)
+    state['blocks'] = {int(k): v for k, v in state['blocks'].items()}
+    return state
+
+
+def save_checkpoint(path, state):
+    """Atomically write the checkpoint (temp file + rename)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def precompute_matrices(wrr_text, rabbis, skip_cap, use_58_filter, workers):
+    """ELS search, per-pair c values, and the two N × N best-c matrices"""
+    print("Finding ELS occurrences (forward + backward)...")
+    processed = prepare_rabbis(wrr_text, rabbis, skip_cap)
+
+    pairs = matrix_pairs(processed, use_58_filter)
+    print(f"Computing c(w,w') for {len(pairs):,} distinct appellation × date pairs "
+          f"({len(processed)} × {len(processed)} rabbi pairings)...")
+
+    pair_c = {}
+    step = max(1, len(pairs) // 20)
+    if workers > 1:
+        with _pool(workers, wrr_text.length) as pool:
+            for done, (key, c) in enumerate(pool.imap_unordered(_pair_c, pairs, chunksize=4), 1):
+                pair_c[key] = c
+                if done % step == 0 or done == len(pairs):
+                    print(f"  {done:,}/{len(pairs):,} pairs")
+    else:
+        _init_worker(wrr_text.length)
+        for done, pair in enumerate(pairs, 1):
+            key, c = _pair_c(pair)
+            pair_c[key] = c
+            if done % step == 0 or done == len(pairs):
+                print(f"  {done:,}/{len(pairs):,} pairs")
+
+    return processed, c_matrices(processed, pair_c, use_58_filter)
+
+
+def run_permutations(state, scorer, workers, checkpoint_path, checkpoint_every):
+    """Run every block not yet in state['blocks'], checkpointing as they finish"""
+    config = state['config']
+    total, block_size, seed = config['permutations'], config['block_size'], config['seed']
+    num_blocks = (total + block_size - 1) // block_size
+    actual_p = state['actual_p']
+
+    tasks = [(b, min(block_size, total - b * block_size), seed, scorer, actual_p)
+             for b in range(num_blocks) if b not in state['blocks']]
+    if len(tasks) < num_blocks:
+        print(f"Resuming: {num_blocks - len(tasks)}/{num_blocks} blocks already done")
+
+    def record(index, better):
+        state['blocks'][index] = better
+        done = sum(min(block_size, total - b * block_size) for b in state['blocks'])
+        better_total = sum(state['blocks'].values())
+        print(f"  Perm {done:,}/{total:,}  better: {better_total:,}  est.P: {better_total / done:.6f}")
+
+    last_save = time.time()
+    try:
+        if workers > 1 and len(tasks) > 1:
+            with _pool(workers, 0) as pool:
+                for index, better in pool.imap_unordered(_run_block, tasks):
+                    record(index, better)
+                    if checkpoint_path and time.time() - last_save >= checkpoint_every:
+                        save_checkpoint(checkpoint_path, state)
+                        last_save = time.time()
+        else:
+            for task in tasks:
+                record(*_run_block(task))
+                if checkpoint_path and time.time() - last_save >= checkpoint_every:
+                    save_checkpoint(checkpoint_path, state)
+                    last_save = time.time()
+    except KeyboardInterrupt:
+        if checkpoint_path:
+            save_checkpoint(checkpoint_path, state)
+            print(f"\nInterrupted — progress saved to {checkpoint_path}")
+        sys.exit(1)
+
+    if checkpoint_path:
+        save_checkpoint(checkpoint_path, state)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Multicore, resumable WRR permutation test',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--rabbis', type=str, default='data/wrr-list2.json',
+                        help='Rabbi list from convert-wrr-data.py (default: data/wrr-list2.json)')
+    parser.add_argument('--text', type=str, default='data/torahNoSpaces.txt',
+                        help='Text file (default: data/torahNoSpaces.txt)')
+    parser.add_argument('--text-length', type=int, default=GENESIS_LENGTH,
+                        help=f'Letters to search (default: {GENESIS_LENGTH} = Genesis, 0 = whole file)')
+    parser.add_argument('--skip-cap', type=int, default=1000,
+                        help='Upper bound on the dynamic skip range D(w) (default: 1000)')
+    parser.add_argument('--no-58filter', action='store_true',
+                        help='Do not restrict word pairs to 5-8 letters')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                        help='ELS hit cache directory (default: data/els-cache)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not read or write the ELS hit cache')
+    parser.add_argument('--permutations', type=int, default=10000,
+                        help='Number of permutations (default: 10000)')
+    parser.add_argument('--seed', type=int, default=1994,
+                        help='Base RNG seed (default: 1994)')
+    parser.add_argument('--block-size', type=int, default=10000,
+                        help='Permutations per independently seeded block (default: 10000)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes (default: 1, 0 = all cores)')
+    parser.add_argument('--checkpoint', type=str, default=None,
+                        help='Save progress here and resume from it if it exists')
+    parser.add_argument('--checkpoint-every', type=float, default=60,
+                        help='Seconds between checkpoint writes (default: 60)')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Write the result as JSON to this path')
+    args = parser.parse_args()
+
+    require_numpy()
+
+    if args.permutations < 1 or args.block_size < 1:
+        print("Error: --permutations and --block-size must be positive")
+        sys.exit(1)
+
+    text_path = Path(args.text)
+    rabbis_path = Path(args.rabbis)
+    for path in (text_path, rabbis_path):
+        if not path.exists():
+            print(f"Error: {path} not found")
+            sys.exit(1)
+
+    workers = args.workers or os.cpu_count() or 1
+    use_58_filter = not args.no_58filter
+    text = load_text(text_path, args.text_length)
+    rabbis = load_rabbis(rabbis_path)
+
+    run_config = {
+        'fingerprint': config_fingerprint(text, rabbis, args.skip_cap, use_58_filter),
+        'rabbis_file': str(rabbis_path),
+        'text_length': len(text),
+        'skip_cap': args.skip_cap,
+        'use_58_filter': use_58_filter,
+        'permutations': args.permutations,
+        'seed': args.seed,
+        'block_size': args.block_size,
+    }
+    checkpoint_path = Path(args.checkpoint) if args.checkpoint else None
+
+    print("\nWRR Permutation Test — Python Runner")
+    print(f"Text: {len(text):,} letters, Skip cap: {args.skip_cap}, "
+          f"5-8 char filter: {'ON' if use_58_filter else 'OFF'}")
+    print(f"Permutations: {args.permutations:,} (seed {args.seed}, blocks of {args.block_size:,}), "
+          f"Workers: {workers}\n")
+
+    start = time.time()
+    state = load_checkpoint(checkpoint_path, run_config)
+    if state is None:
+        hit_cache = None if args.no_cache else ElsHitCache(text, args.cache_dir)
+        _, (matrix, matrix_no_rabbi) = precompute_matrices(
+            WrrText(text, hit_cache), rabbis, args.skip_cap, use_58_filter, workers)
+        if hit_cache:
+            hit_cache.close()
+        scorer = PermutationScorer(matrix, matrix_no_rabbi)
+        state = {
+            'version': CHECKPOINT_VERSION,
+            'config': run_config,
+            'c_matrix': matrix,
+            'c_matrix_no_rabbi': matrix_no_rabbi,
+            'actual_p': scorer.actual(),
+            'blocks': {},
+        }
+        if checkpoint_path:
+            save_checkpoint(checkpoint_path, state)
+    else:
+        print(f"Loaded c matrices from {checkpoint_path}")
+        scorer = PermutationScorer(state['c_matrix'], state['c_matrix_no_rabbi'])
+
+    print(f"\nActual P = 4·min(P₁–P₄): {state['actual_p']:.4e}")
+    print(f"Running {args.permutations:,} permutations...")
+    run_permutations(state, scorer, workers, checkpoint_path, args.checkpoint_every)
+
+    better = sum(state['blocks'].values())
+    p_value = better / args.permutations
+    print(f"\nPermutation test: P = {p_value:.6f} "
+          f"({better:,}/{args.permutations:,} ≤ {state['actual_p']:.4e})")
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        result = {
+            **run_config,
+            'actual_p': state['actual_p'],
+            'better_count': better,
+            'p_value': p_value,
+            'c_matrix': state['c_matrix'],
+            'c_matrix_no_rabbi': state['c_matrix_no_rabbi'],
+        }
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"Results written to {output_path}")
+
+    print(f"\nTotal time: {time.time() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+"""
+WRR 1994 Experiment Engine — NumPy port of engines/wrr.worker.js
+
+Shared by tools/wrr-experiment.py (and any other batch runner) so the full
+WRR1 replication can run on a server instead of in a browser tab. The
+functions mirror the worker one-to-one:
+
+    wrrMaxSkip          -> max_skip
+    wrrFindELSBoth      -> find_els_both
+    computeC            -> compute_c   (125 perturbations, paper's σ measure)
+    computeP1/P2        -> compute_p1 / compute_p2
+    runWRRFull          -> run_experiment
+
+Within compute_c the σ sums over every (name ELS, date ELS, h) triple and
+all 125 perturbations are evaluated as array operations. Sums are
+accumulated in the worker's order (h terms sequentially, then pairs
+name-major), so c values — including exact ties — come out the same as in
+the browser.
+
+Input rabbi lists are the JSON written by tools/convert-wrr-data.py
+(data/wrr-list1.json, data/wrr-list2.json).
+"""
+
+import json
+import math
+import sys
+from pathlib import Path
+
+from els_letter_stats import LetterStats
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Same prefix the browser uses (WRR_GENESIS_LEN): Genesis in the Koren text
+GENESIS_LENGTH = 78064
+SOFIT_MAP = str.maketrans('ךםןףץ', 'כמנפצ')
+RABBI_PREFIX = 'רבי'
+PERTURBATIONS = [(x, y, z) for x in range(-2, 3) for y in range(-2, 3) for z in range(-2, 3)]
+MIN_PERTURBATIONS = 10
+H_DIVISORS = range(1, 11)
+# Upper bound on perturbations × pairs × letter pairs evaluated per array op
+EPSILON_CHUNK_ELEMENTS = 1 << 22
+
+
+def require_numpy():
+    """Exit with an install hint if numpy is missing"""
+    if np is None:
+        print("Error: 'numpy' package not installed. Run: pip install numpy")
+        sys.exit(1)
+
+
+def normalize_sofiot(s):
+    """Replace final letter forms with their regular forms"""
+    return s.translate(SOFIT_MAP)
+
+
+def normalize_term(raw):
+    """Normalize an appellation or date as the worker does (drop spaces, fold sofiot)"""
+    return normalize_sofiot(''.join(raw.split()))
+
+
+def load_text(path, length=GENESIS_LENGTH):
+    """Load torahNoSpaces.txt, normalized; length=0 keeps the whole Torah"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read().strip()
+    if length:
+        text = text[:length]
+    return normalize_sofiot(text)
+
+
+def load_rabbis(path):
+    """Load a rabbi list produced by convert-wrr-data.py"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def max_skip(term, stats, cap):
+    """D(w): smallest D such that the expected number of ELSs with skip 2..D is >= 10"""
+    return stats.adaptive_max_skip(term, target=10, cap=cap, min_skip=2)
+
+
+class ElsHits:
+    """ELS occurrences of one term: start positions and skips, in discovery order"""
+    __slots__ = ['term', 'starts', 'skips']
+
+    def __init__(self, term, starts, skips):
+        self.term = term
+        self.starts = starts
+        self.skips = skips
+
+    def __len__(self):
+        return len(self.starts)
+
+    def positions(self):
+        """(hits, k) array of letter positions"""
+        return self.starts[:, None] + self.skips[:, None] * np.arange(len(self.term))
+
+
+class WrrText:
+    """Normalized text plus the per-letter lookups the ELS search needs.
+
+    hit_cache, an els_hit_cache.ElsHitCache for this text, is consulted
+    before searching and filled on a miss.
+    """
+
+    def __init__(self, text, hit_cache=None):
+        self.text = text
+        self.hit_cache = hit_cache
+        self.length = len(text)
+        self.stats = LetterStats.from_text(text)
+        self.codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+        self._first_letter = {}
+        self._cache = {}
+
+    def letter_positions(self, ch):
+        """Sorted positions of one letter"""
+        pos = self._first_letter.get(ch)
+        if pos is None:
+            pos = np.flatnonzero(self.codes == ord(ch)).astype(np.int64)
+            self._first_letter[ch] = pos
+        return pos
+
+    def find_els(self, term, max_skip_value):
+        """Forward ELSs with skip 2..max_skip_value, ordered by skip then start"""
+        k = len(term)
+        first = self.letter_positions(term[0])
+        second = self.letter_positions(term[1])
+
+        # Candidate (start, skip) pairs come from pairing each first letter with
+        # every second letter 2..max_skip_value ahead, so only ~1/22 of the
+        # start × skip grid is ever tested against the remaining letters
+        lo = np.searchsorted(second, first + 2)
+        hi = np.searchsorted(second, first + max_skip_value, side='right')
+        counts = hi - lo
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        s = np.repeat(first, counts)
+        d = second[np.repeat(lo, counts) + offsets] - s
+
+        keep = s < self.length - (k - 1) * d
+        s, d = s[keep], d[keep]
+        for i in range(2, k):
+            keep = self.codes[s + i * d] == ord(term[i])
+            s, d = s[keep], d[keep]
+
+        order = np.lexsort((s, d))
+        return s[order], d[order]
+
+    def find_els_both(self, term, max_skip_value):
+        """Forward and backward ELSs (backward = reversed term, positive skip), cached"""
+        key = (term, max_skip_value)
+        hits = self._cache.get(key)
+        if hits is None:
+            stored = self.hit_cache.get(term, 2, max_skip_value) if self.hit_cache else None
+            if stored is not None:
+                hits = hits_from_occurrences(term, stored)
+            else:
+                starts, skips = self.find_els(term, max_skip_value)
+                forward = len(starts)
+                rev = term[::-1]
+                if rev != term:
+                    back_starts, back_skips = self.find_els(rev, max_skip_value)
+                    starts = np.concatenate([starts, back_starts])
+                    skips = np.concatenate([skips, back_skips])
+                hits = ElsHits(term, starts, skips)
+                if self.hit_cache:
+                    self.hit_cache.put(term, 2, max_skip_value, occurrences_from_hits(hits, forward))
+            self._cache[key] = hits
+        return hits
+
+
+def occurrences_from_hits(hits, forward):
+    """Signed (first letter, skip) occurrences of ElsHits whose first `forward` hits are forward.
+
+    Backward hits are reversed-term matches; a palindrome's backward
+    occurrences are the mirror images of its forward ones.
+    """
+    k = len(hits.term)
+    starts, skips = hits.starts.tolist(), hits.skips.tolist()
+    occurrences = list(zip(starts[:forward], skips[:forward]))
+    backward = list(zip(starts[forward:], skips[forward:]))
+    if hits.term[::-1] == hits.term:
+        backward = occurrences
+    return occurrences + [(s + (k - 1) * d, -d) for s, d in backward]
+
+
+def hits_from_occurrences(term, occurrences):
+    """Inverse of occurrences_from_hits, in find_els_both's order"""
+    k = len(term)
+    forward = sorted((d, p) for p, d in occurrences if d > 0)
+    backward = []
+    if term[::-1] != term:
+        backward = sorted((-d, p + (k - 1) * d) for p, d in occurrences if d < 0)
+    ordered = forward + backward
+    starts = np.array([p for _, p in ordered], dtype=np.int64)
+    skips = np.array([d for d, _ in ordered], dtype=np.int64)
+    return ElsHits(term, starts, skips)
+
+
+def _cyl_dist(a, b, h):
+    """2D distance between text positions on a cylinder of width h (sqrt, as the worker)"""
+    dr = a // h - b // h
+    dc = np.abs(a % h - b % h)
+    dc = np.minimum(dc, h - dc)
+    return np.sqrt((dr * dr + dc * dc).astype(np.float64))
+
+
+def perturbed_positions(positions, text_length):
+    """Apply all 125 (x, y, z) perturbations to every name ELS.
+
+    Returns a (valid, hits, k) array holding only the perturbations that
+    keep every ELS inside the text, in the worker's x, y, z loop order.
+    """
+    k = positions.shape[1]
+    shifts = np.zeros((len(PERTURBATIONS), k), dtype=np.int64)
+    for p, (x, y, z) in enumerate(PERTURBATIONS):
+        tail = [x, x + y, x + y + z][:k]
+        shifts[p, k - len(tail):] = tail
+    perturbed = positions[None, :, :] + shifts[:, None, :]
+    valid = ((perturbed >= 0) & (perturbed < text_length)).all(axis=(1, 2))
+    return perturbed[valid]
+
+
+def epsilon(name_pos, name_skips, date_pos, date_skips):
+    """ε(w,w') = Σ σ(e,e') over all name × date ELS pairs.
+
+    name_pos is (P, n, k1) — one slice per perturbation — and date_pos is
+    (m, k2). Returns one ε per perturbation. Perturbations only move the
+    last three letters, so the letters before them are measured once.
+    """
+    fixed = max(name_pos.shape[2] - 3, 0)
+    name_pos = name_pos[:, :, None, :, None]
+    fixed_pos, moving_pos = name_pos[:1, ..., :fixed, :], name_pos[..., fixed:, :]
+    date_pos = date_pos[None, None, :, None, :]
+    sigma = np.zeros((name_pos.shape[0], name_pos.shape[1], date_pos.shape[2]), dtype=np.float64)
+
+    # σ(e,e') = Σ_i μ_{h_i} + Σ_i μ_{h'_i}, h_i = round(|d|/i), μ = 1/(f² + f'² + t²)
+    for skips in (np.abs(name_skips)[:, None], np.abs(date_skips)[None, :]):
+        for i in H_DIVISORS:
+            h = np.floor(skips / i + 0.5).astype(np.int64)
+            h = np.broadcast_to(h, sigma.shape[1:])
+            usable = h >= 2
+            h = np.where(usable, h, 2)[None, :, :, None, None]
+
+            f = _cyl_dist(name_pos[..., 0:1, :], name_pos[..., 1:2, :], h)[..., 0, 0]
+            f_prime = _cyl_dist(date_pos[..., 0:1], date_pos[..., 1:2], h)[..., 0, 0]
+            t_sq = _cyl_dist_sq_min(moving_pos, date_pos, h)
+            if fixed:
+                t_sq = np.minimum(t_sq, _cyl_dist_sq_min(fixed_pos, date_pos, h))
+            t = np.sqrt(t_sq)
+            delta = f * f + f_prime * f_prime + t * t
+
+            add = usable[None, :, :] & (delta > 0)
+            sigma += np.where(add, 1.0 / np.where(add, delta, 1.0), 0.0)
+
+    flat = sigma.reshape(sigma.shape[0], -1)
+    if not flat.shape[1]:
+        return np.zeros(flat.shape[0])
+    return np.cumsum(flat, axis=1)[:, -1]
+
+
+def _cyl_dist_sq_min(name_pos, date_pos, h):
+    """Minimum squared cylinder distance between any letter of e and any letter of e'"""
+    # Rows and columns are taken per ELS first, so only the cheap differences
+    # run over the full letter × letter grid; int32 holds the squared
+    # distances while positions stay below 2^16 (Genesis), int64 beyond
+    dtype = np.int32 if max(name_pos.max(), date_pos.max()) < 1 << 16 else np.int64
+    dr = (name_pos // h).astype(dtype) - (date_pos // h).astype(dtype)
+    dc = np.abs((name_pos % h).astype(dtype) - (date_pos % h).astype(dtype))
+    dc = np.minimum(dc, h.astype(dtype) - dc)
+    dr *= dr
+    dc *= dc
+    dr += dc
+    return dr.min(axis=(3, 4)).astype(np.float64)
+
+
+def compute_c(name_hits, date_hits, text_length):
+    """c(w,w'): rank of the actual ε among its 125 perturbations (None if m < 10).
+
+    Small c means the actual proximity is unusually good. Ties count half,
+    as in the paper; c is 1.0 when the actual ε is 0.
+    """
+    name_pos = name_hits.positions()
+    date_pos = date_hits.positions()
+
+    actual = epsilon(name_pos[None], name_hits.skips, date_pos, date_hits.skips)[0]
+    if actual == 0:
+        return 1.0
+
+    perturbed = perturbed_positions(name_pos, text_length)
+    m = len(perturbed)
+    if m < MIN_PERTURBATIONS:
+        return None
+
+    per_perturbation = name_pos.size * date_pos.size
+    chunk = max(1, EPSILON_CHUNK_ELEMENTS // max(per_perturbation, 1))
+    eps = np.concatenate([
+        epsilon(perturbed[i:i + chunk], name_hits.skips, date_pos, date_hits.skips)
+        for i in range(0, m, chunk)
+    ])
+    v = np.count_nonzero(eps > actual) + np.count_nonzero(eps == actual) / 2
+    return float(v / m)
+
+
+def binomial_tail(n, p, k):
+    """P(Bin(n, p) >= k)"""
+    if k == 0:
+        return 1.0
+    if k > n:
+        return 0.0
+    log_p, log_1p = math.log(p), math.log(1 - p)
+    tail = 0.0
+    for j in range(k, n + 1):
+        log_prob = 0.0
+        for i in range(j):
+            log_prob += math.log(n - i) - math.log(i + 1)
+        log_prob += j * log_p + (n - j) * log_1p
+        tail += math.exp(log_prob)
+    return min(tail, 1.0)
+
+
+def gamma_tail(c_values):
+    """e^{-t} · Σ_{j<N} t^j/j! with t = -Σ ln c"""
+    n = len(c_values)
+    if n == 0:
+        return 1.0
+    t = 0.0
+    for c in c_values:
+        t -= math.log(max(c, 1e-10))
+    if t <= 0:
+        return 1.0
+    total, term = 0.0, 1.0
+    for j in range(n):
+        total += term
+        term *= t / (j + 1)
+    return min(max(math.exp(-t) * total, 0.0), 1.0)
+
+
+def compute_p1(c_values):
+    """P₁: P(Bin(N, 0.2) >= #{c <= 0.2})"""
+    if not c_values:
+        return 1.0
+    return binomial_tail(len(c_values), 0.2, sum(1 for c in c_values if c <= 0.2))
+
+
+def compute_p2(c_values):
+    """P₂: Gamma tail over all c values"""
+    return gamma_tail(c_values)
+
+
+def p_statistics(c_values, c_values_no_rabbi):
+    """P₁–P₄ and the Bonferroni-corrected overall P = 4·min(P₁..P₄)"""
+    p1 = compute_p1(c_values)
+    p2 = compute_p2(c_values)
+    p3 = compute_p1(c_values_no_rabbi) if c_values_no_rabbi else 1.0
+    p4 = compute_p2(c_values_no_rabbi) if c_values_no_rabbi else 1.0
+    return {'p1': p1, 'p2': p2, 'p3': p3, 'p4': p4, 'overall_p': 4 * min(p1, p2, p3, p4)}
+
+
+def in_length_window(term, use_58_filter):
+    """WRR word-pair filter: both words must be 5–8 letters"""
+    return not use_58_filter or 5 <= len(term) <= 8
+
+
+def prepare_rabbis(wrr_text, rabbis, skip_cap):
+    """Find ELS hits for every appellation and date of the rabbis that have dates"""
+    processed = []
+    for rabbi in rabbis:
+        if not rabbi['dates']:
+            continue
+        entry = {'id': rabbi['id'], 'en': rabbi['en'], 'names': [], 'dates': []}
+        for field in ('names', 'dates'):
+            for raw in rabbi[field]:
+                term = normalize_term(raw)
+                if len(term) < 2:
+                    continue
+                d = max_skip(term, wrr_text.stats, skip_cap)
+                entry[field].append((raw, wrr_text.find_els_both(term, d)))
+        processed.append(entry)
+    return processed
+
+
+def best_c(names, dates, text_length, use_58_filter=True, stats=None):
+    """Best (smallest) c over all appellation × date pairs.
+
+    Returns (c, c_no_rabbi, name_index, date_index); c_no_rabbi only uses
+    appellations that don't start with רבי (for P₃/P₄). stats, if given,
+    counts pairs considered and filtered.
+    """
+    best = best_no_rabbi = None
+    best_ni = best_di = -1
+
+    for ni, (_, name_hits) in enumerate(names):
+        if not len(name_hits):
+            continue
+        if not in_length_window(name_hits.term, use_58_filter):
+            if stats is not None:
+                stats['pairs_filtered'] += 1
+            continue
+        is_rabbi = name_hits.term.startswith(RABBI_PREFIX)
+
+        for di, (_, date_hits) in enumerate(dates):
+            if not len(date_hits):
+                continue
+            if not in_length_window(date_hits.term, use_58_filter):
+                if stats is not None:
+                    stats['pairs_filtered'] += 1
+                continue
+            if stats is not None:
+                stats['pairs_considered'] += 1
+
+            c = compute_c(name_hits, date_hits, text_length)
+            if c is None:
+                continue
+            if best is None or c < best:
+                best, best_ni, best_di = c, ni, di
+            if not is_rabbi and (best_no_rabbi is None or c < best_no_rabbi):
+                best_no_rabbi = c
+
+    return best, best_no_rabbi, best_ni, best_di
+
+
+def run_experiment(wrr_text, rabbis, skip_cap, use_58_filter=True, progress=True):
+    """Full WRR1 experiment: per-rabbi best c, then P₁–P₄ over c < 1"""
+    processed = prepare_rabbis(wrr_text, rabbis, skip_cap)
+    stats = {'pairs_considered': 0, 'pairs_filtered': 0}
+
+    results = []
+    for i, r in enumerate(processed, 1):
+        c, c_no_rabbi, ni, di = best_c(r['names'], r['dates'], wrr_text.length, use_58_filter, stats)
+        result = {
+            'id': r['id'],
+            'en': r['en'],
+            'c': c,
+            'c_no_rabbi': c_no_rabbi,
+            'name': r['names'][ni][0] if ni >= 0 else None,
+            'date': r['dates'][di][0] if di >= 0 else None,
+            'name_hit_count': len(r['names'][ni][1]) if ni >= 0 else 0,
+            'date_hit_count': len(r['dates'][di][1]) if di >= 0 else 0,
+        }
+        results.append(result)
+        if progress:
+            shown = f"c={c:.4f}" if c is not None else "c=null"
+            if c_no_rabbi is not None:
+                shown += f" c_nr={c_no_rabbi:.4f}"
+            print(f"  {i}/{len(processed)} {r['en']}: {shown}")
+
+    c_values = [r['c'] for r in results if r['c'] is not None and r['c'] < 1.0]
+    c_values_no_rabbi = [r['c_no_rabbi'] for r in results
+                         if r['c_no_rabbi'] is not None and r['c_no_rabbi'] < 1.0]
+
+    summary = {
+        'rabbi_results': results,
+        'c_values': c_values,
+        'c_values_no_rabbi': c_values_no_rabbi,
+        'matched_count': len(c_values),
+        'matched_count_no_rabbi': len(c_values_no_rabbi),
+        'total_rabbis': len(processed),
+        **stats,
+        **p_statistics(c_values, c_values_no_rabbi),
+    }
+    return summary, processed
+
+
+def matrix_pairs(processed, use_58_filter=True):
+    """Distinct (name ELS, date ELS) pairs needed for the all-rabbis c matrix.
+
+    Appellations and dates repeat across rabbis (רבייעקב, ל ניסנ, ...), so
+    each pair's c is computed once and shared by every matrix cell using it.
+    Returns a list of (name_hits, date_hits) in first-seen order.
+    """
+    def usable(entries):
+        return [hits for _, hits in entries if len(hits) and in_length_window(hits.term, use_58_filter)]
+
+    names = [usable(r['names']) for r in processed]
+    dates = [usable(r['dates']) for r in processed]
+    pairs = {}
+    for name_list in names:
+        for date_list in dates:
+            for name_hits in name_list:
+                for date_hits in date_list:
+                    pairs.setdefault((name_hits.term, date_hits.term), (name_hits, date_hits))
+    return list(pairs.values())
+
+
+def c_matrices(processed, pair_c, use_58_filter=True):
+    """N × N best-c matrices (rabbi i's appellations × rabbi j's dates).
+
+    pair_c maps (name term, date term) -> c. Returns (all appellations,
+    non-רבי appellations), with None where no pair has a defined c.
+    """
+    n = len(processed)
+    matrix = [[None] * n for _ in range(n)]
+    matrix_no_rabbi = [[None] * n for _ in range(n)]
+    for i, r in enumerate(processed):
+        for j, other in enumerate(processed):
+            best = best_no_rabbi = None
+            for _, name_hits in r['names']:
+                if not len(name_hits) or not in_length_window(name_hits.term, use_58_filter):
+                    continue
+                is_rabbi = name_hits.term.startswith(RABBI_PREFIX)
+                for _, date_hits in other['dates']:
+                    if not len(date_hits) or not in_length_window(date_hits.term, use_58_filter):
+                        continue
+                    c = pair_c[(name_hits.term, date_hits.term)]
+                    if c is None:
+                        continue
+                    if best is None or c < best:
+                        best = c
+                    if not is_rabbi and (best_no_rabbi is None or c < best_no_rabbi):
+                        best_no_rabbi = c
+            matrix[i][j] = best
+            matrix_no_rabbi[i][j] = best_no_rabbi
+    return matrix, matrix_no_rabbi
+
+
+class PermutationScorer:
+    """Overall P = 4·min(P₁..P₄) for many date permutations at once.
+
+    Built from the two c matrices; score(perms) takes a (B, N) array where
+    row b assigns date set perms[b, i] to rabbi i. Binomial tails come from
+    a table filled by binomial_tail(), logs are taken once per matrix cell,
+    and sums run in rabbi order, so every row scores the same no matter
+    which batch it is evaluated in.
+    """
+
+    def __init__(self, matrix, matrix_no_rabbi):
+        self.n = len(matrix)
+        self.tables = [self._cell_arrays(m) for m in (matrix, matrix_no_rabbi)]
+        self.binomial = np.ones((self.n + 1, self.n + 1))
+        for total in range(1, self.n + 1):
+            for k in range(total + 1):
+                self.binomial[total, k] = binomial_tail(total, 0.2, k)
+
+    def _cell_arrays(self, matrix):
+        """Per-cell (counts toward P, c <= 0.2, log max(c, 1e-10)) arrays"""
+        valid = np.zeros((self.n, self.n), dtype=bool)
+        low = np.zeros((self.n, self.n), dtype=bool)
+        logs = np.zeros((self.n, self.n))
+        for i, row in enumerate(matrix):
+            for j, c in enumerate(row):
+                if c is not None and c < 1.0:
+                    valid[i, j] = True
+                    low[i, j] = c <= 0.2
+                    logs[i, j] = math.log(max(c, 1e-10))
+        return valid, low, logs
+
+    def _binomial_and_gamma(self, table, perms):
+        valid, low, logs = table
+        rows = np.arange(self.n)[None, :]
+        v = valid[rows, perms]
+        count = v.sum(axis=1)
+        p_bin = self.binomial[count, (low[rows, perms] & v).sum(axis=1)]
+
+        t = -np.cumsum(np.where(v, logs[rows, perms], 0.0), axis=1)[:, -1]
+        total = np.zeros(len(perms))
+        term = np.ones(len(perms))
+        for j in range(self.n):
+            total += np.where(j < count, term, 0.0)
+            term *= t / (j + 1)
+        p_gamma = np.minimum(np.maximum(np.exp(-t) * total, 0.0), 1.0)
+        p_gamma[(count == 0) | (t <= 0)] = 1.0
+        return p_bin, p_gamma
+
+    def score(self, perms):
+        """Overall P for each permutation row"""
+        p1, p2 = self._binomial_and_gamma(self.tables[0], perms)
+        p3, p4 = self._binomial_and_gamma(self.tables[1], perms)
+        return 4 * np.minimum(np.minimum(p1, p2), np.minimum(p3, p4))
+
+    def actual(self):
+        """Overall P of the true assignment (rabbi i with its own dates)"""
+        return float(self.score(np.arange(self.n)[None, :])[0])
+
+
+def text_path_default():
+    """Default torahNoSpaces.txt location relative to the repo"""
+    return Path(__file__).resolve().parent.parent / 'data' / 'torahNoSpaces.txt'